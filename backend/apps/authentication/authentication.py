@@ -1,16 +1,13 @@
 from django.conf import settings
 from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
 
 
 class CustomJWTAuthentication(JWTAuthentication):
     def authenticate(self, request):
         try:
-            header = self.get_header(request)
-
-            if header is None:
-                raw_token = request.COOKIES.get(settings.AUTH_COOKIE)
-            else:
-                raw_token = self.get_raw_token(header)
+            raw_token = self.get_request_token(request)
 
             if raw_token is None:
                 return None
@@ -19,4 +16,31 @@ class CustomJWTAuthentication(JWTAuthentication):
 
             return self.get_user(validated_token), validated_token
         except:
-            return None
\ No newline at end of file
+            return None
+
+    async def aauthenticate(self, request):
+        # Same as authenticate() for plain async views; only the user lookup touches the database
+        try:
+            raw_token = self.get_request_token(request)
+
+            if raw_token is None:
+                return None
+
+            validated_token = self.get_validated_token(raw_token)
+
+            return await self.aget_user(validated_token), validated_token
+        except:
+            return None
+
+    def get_request_token(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return request.COOKIES.get(settings.AUTH_COOKIE)
+        return self.get_raw_token(header)
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token[api_settings.USER_ID_CLAIM]
+        user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+        if not user.is_active:
+            raise AuthenticationFailed("User is inactive", code="user_inactive")
+        return user
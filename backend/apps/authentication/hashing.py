@@ -0,0 +1,59 @@
+# backend/authentication/hashing.py
+#
+# Password hashing for bulk user creation, spread over a process pool so a
+# few thousand PBKDF2 hashes do not run one after another in the request's
+# worker. Kept free of model imports: pool processes only unpickle the
+# configured hasher and this module, and never need Django set up. Workers
+# are started by a forkserver (spawn where unavailable), never forked from
+# the web worker with its threads, locks and open connections.
+
+import atexit
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher, make_password
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _encode_all(hasher, passwords):
+    return [hasher.encode(password, hasher.salt()) for password in passwords]
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS, mp_context=multiprocessing.get_context(method)
+            )
+            atexit.register(_pool.shutdown, wait=False, cancel_futures=True)
+        return _pool
+
+
+def hash_passwords(passwords):
+    """
+    ``make_password`` for every item of ``passwords``, in order. None gives an
+    unusable password. Large batches are hashed in the process pool, smaller
+    ones here.
+    """
+    passwords = list(passwords)
+    usable = [index for index, password in enumerate(passwords) if password is not None]
+    hashed = [make_password(None) if password is None else None for password in passwords]
+    if len(usable) < settings.PASSWORD_HASH_POOL_THRESHOLD or settings.PASSWORD_HASH_WORKERS < 2:
+        for index in usable:
+            hashed[index] = make_password(passwords[index])
+        return hashed
+
+    hasher = get_hasher()
+    chunk_size = -(-len(usable) // (settings.PASSWORD_HASH_WORKERS * 4))
+    chunks = [usable[start:start + chunk_size] for start in range(0, len(usable), chunk_size)]
+    results = _get_pool().map(_encode_all, [hasher] * len(chunks), [[passwords[i] for i in chunk] for chunk in chunks])
+    for chunk, encoded in zip(chunks, results):
+        for index, value in zip(chunk, encoded):
+            hashed[index] = value
+    return hashed
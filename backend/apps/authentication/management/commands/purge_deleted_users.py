@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from apps.authentication.purge import purge_deleted_users
+
+
+class Command(BaseCommand):
+    help = "Hard-delete or anonymize users soft-deleted longer than the grace period ago."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help="Override the configured grace period.")
+        parser.add_argument('--batch-size', type=int, help="Users purged per transaction.")
+        parser.add_argument('--max-batches', type=int, help="Stop after this many batches.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count eligible users.")
+
+    def handle(self, *args, **options):
+        results = purge_deleted_users(
+            grace_days=options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            dry_run=options['dry_run'],
+        )
+        for name, count in results.items():
+            self.stdout.write(self.style.SUCCESS(f"{name}: {count} users"))
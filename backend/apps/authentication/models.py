@@ -3,7 +3,8 @@ from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.db import models
 from django.db.models import Q
 from django.core.validators import RegexValidator
-from apps.general import GeolocationService
+from django.utils.timezone import now
+from apps.general import AddressTrackingMixin
 # User Management and Authentication
 class UserManager(BaseUserManager):
     def get_queryset(self):
@@ -38,6 +39,9 @@ class User(AbstractBaseUser):
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
     is_deleted = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    # Set once a deleted user's personal data has been purged (see authentication/purge.py)
+    purged_at = models.DateTimeField(null=True, blank=True)
     role = models.CharField(
         max_length=10,
         choices=[("patient", "Patient"), ("doctor", "Doctor"), ("clinic", "Clinic")],
@@ -47,6 +51,8 @@ class User(AbstractBaseUser):
     last_login = models.DateTimeField(null=True, blank=True)
 
     objects = UserManager()
+    # Includes soft-deleted users
+    all_objects = models.Manager()
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
@@ -59,9 +65,19 @@ class User(AbstractBaseUser):
                 name="unique_active_email",
             )
         ]
+        # Every lookup through User.objects filters on is_deleted=False
+        indexes = [
+            models.Index(fields=["role"], condition=Q(is_deleted=False), name="idx_users_active_role"),
+            models.Index(fields=["date_joined"], condition=Q(is_deleted=False), name="idx_users_active_date_joined"),
+            models.Index(fields=["last_login"], condition=Q(is_deleted=False), name="idx_users_active_last_login"),
+            models.Index(
+                fields=["deleted_at"], condition=Q(is_deleted=True, purged_at__isnull=True), name="idx_users_pending_purge"
+            ),
+        ]
 
     def delete(self, *args, **kwargs):
         self.is_deleted = True
+        self.deleted_at = now()
         self.save()
 
     def get_full_name(self):
@@ -76,10 +92,11 @@ class User(AbstractBaseUser):
     def has_module_perms(self, app_label):
         return self.is_superuser
 
-class UserProfile(models.Model):
+class UserProfile(AddressTrackingMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.OneToOneField(User, on_delete=models.CASCADE)
     avatar = models.ImageField(upload_to="avatars/", null=True, blank=True, default="avatars/default.png")
+    avatar_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     bio = models.TextField(blank=True, null=True)
     address = models.CharField(max_length=255, blank=True, null=True)
     latitude = models.FloatField(blank=True, null=True)
@@ -93,12 +110,7 @@ class UserProfile(models.Model):
     html_content = models.TextField(blank=True, null=True)
     json_content = models.JSONField(blank=True, null=True)
     gander = models.CharField(max_length=10, choices=[("male", "Male"), ("female", "Female"), ("other", "Other")], blank=True, null=True)
-    # geolocation = models.CharField(max_length=255, blank=True, null=True)
-
-    # def save(self, *args, **kwargs):
-    #     if self.address and not self.geolocation:
-    #         self.geolocation = GeolocationService.fetch_coordinates(self.address)
-    #     super().save(*args, **kwargs)
+    # latitude/longitude are filled in after save by apps.geocoding
 
     def __str__(self):
         return f"Profile of {self.user.get_full_name()}"
@@ -127,6 +139,7 @@ class Doctor(models.Model):
     license_number = models.CharField(max_length=255, blank=True, null=True)
     license_expiry_date = models.DateField(blank=True, null=True)
     license_image = models.ImageField(upload_to="license_images/", blank=True, null=True)
+    license_image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     active = models.BooleanField(default=False)
     privacy = models.BooleanField(default=False)
     reservation_open = models.BooleanField(default=True)
@@ -0,0 +1,173 @@
+# backend/authentication/purge.py
+#
+# Soft-deleted users (User.delete() only sets is_deleted) are purged once
+# USER_PURGE_GRACE_DAYS have passed since deletion, a bounded batch at a
+# time. Their personal rows (profile, likes, comments, notifications) are
+# always removed, except comments other people replied to, which only lose
+# their text. A user with nothing else is then deleted outright. A user still
+# referenced by records other people depend on (clinics, reservations,
+# reviews, posts, payments, subscriptions, replied-to comments) keeps an
+# anonymized row, so that history stays intact. Avatars, license scans and
+# their derivatives are deleted from storage once the batch commits.
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import CharField, Exists, OuterRef, Q, Value
+from django.db.models.functions import Cast, Concat
+from django.utils.timezone import now
+
+from apps.authentication.models import User, UserProfile, Patient, Doctor
+from apps.booking_app.archival import _throttle
+from apps.booking_app.clinic_cache import bump_clinic_cache_version
+from apps.booking_app.models import (
+    Clinic, Reservation, Review, Post, Comment, Like, Notification, Payment, Subscription
+)
+from apps.images.derivatives import _delete_files, derivatives_field
+
+logger = logging.getLogger(__name__)
+
+PURGE_LOCK_KEY = 'painfx_purge_deleted_users'
+ANONYMIZED_EMAIL_DOMAIN = 'deleted.invalid'
+ANONYMIZED_COMMENT_TEXT = '[deleted]'
+
+
+def _has_replies():
+    """True for comments other comments hang off; deleting them would cascade to those."""
+    comment = OuterRef('pk')
+    return Exists(Comment.objects.filter(Q(parent_comment=comment) | Q(reply_to=comment)))
+
+
+def _has_history():
+    """True for users referenced by rows that must outlive them."""
+    user = OuterRef('pk')
+    return (
+        Exists(Clinic.objects.filter(owner=user))
+        | Exists(Reservation.objects.filter(Q(patient_id=user) | Q(doctor_id=user)))
+        | Exists(Review.objects.filter(patient_id=user))
+        | Exists(Post.objects.filter(doctor_id=user))
+        | Exists(Payment.objects.filter(user=user))
+        | Exists(Subscription.objects.filter(user=user))
+        | Exists(Comment.objects.filter(user=user).filter(_has_replies()))
+    )
+
+
+def _stored_files(model, field_name, user_ids):
+    """(storage, originals, derivatives) held by ``field_name`` for these users' rows."""
+    field = model._meta.get_field(field_name)
+    originals, derivatives = [], []
+    rows = model.objects.filter(user_id__in=user_ids).values_list(field_name, derivatives_field(field_name))
+    for name, stored in rows:
+        # The shared default image (e.g. the default avatar) belongs to everyone
+        if name and name != field.get_default():
+            originals.append(name)
+        if stored:
+            derivatives.append(stored)
+    return field.storage, originals, derivatives
+
+
+def _delete_stored_files(storage, originals, derivatives):
+    for name in originals:
+        try:
+            storage.delete(name)
+        except OSError as e:
+            logger.warning(f"Could not delete purged user file {name}: {str(e)}")
+    for stored in derivatives:
+        _delete_files(storage, stored)
+
+
+def purgeable_users(cutoff):
+    return User.all_objects.filter(is_deleted=True, purged_at__isnull=True, deleted_at__lte=cutoff)
+
+
+def purge_batch(cutoff, batch_size):
+    """Purge one batch; returns (hard-deleted, anonymized) counts."""
+    with transaction.atomic():
+        rows = list(
+            purgeable_users(cutoff)
+            .annotate(has_history=_has_history())
+            .order_by('deleted_at')
+            .select_for_update(skip_locked=True, of=('self',))
+            .values_list('pk', 'has_history')[:batch_size]
+        )
+        if not rows:
+            return 0, 0
+        ids = [pk for pk, _ in rows]
+        keep = [pk for pk, has_history in rows if has_history]
+        remove = [pk for pk, has_history in rows if not has_history]
+
+        # Collected before the rows go; the files only go once the batch commits
+        for stored in (_stored_files(UserProfile, 'avatar', ids), _stored_files(Doctor, 'license_image', ids)):
+            transaction.on_commit(lambda stored=stored: _delete_stored_files(*stored))
+
+        for model in (Notification, Like, UserProfile):
+            model.objects.filter(user_id__in=ids).delete()
+        comments = Comment.objects.filter(user_id__in=ids)
+        # Anonymize first: deleting the user's own replies may leave a parent without any
+        comments.filter(_has_replies()).update(comment_text=ANONYMIZED_COMMENT_TEXT)
+        comments.filter(~_has_replies()).delete()
+
+        if remove:
+            User.all_objects.filter(pk__in=remove).delete()
+        if keep:
+            Patient.objects.filter(user_id__in=keep).update(medical_history=None)
+            Doctor.objects.filter(user_id__in=keep).update(
+                license_number=None, license_expiry_date=None, license_image=None, license_image_derivatives={}
+            )
+            User.all_objects.filter(pk__in=keep).update(
+                email=Concat(Value('deleted-'), Cast('pk', CharField()), Value(f'@{ANONYMIZED_EMAIL_DOMAIN}')),
+                first_name=None,
+                last_name=None,
+                password='!',
+                is_active=False,
+                is_staff=False,
+                is_superuser=False,
+                last_login=None,
+                purged_at=now(),
+            )
+            # Anonymized owners and doctors still show up in cached clinic responses
+            transaction.on_commit(bump_clinic_cache_version)
+    return len(remove), len(keep)
+
+
+def purge_deleted_users(grace_days=None, batch_size=None, max_batches=None, dry_run=False):
+    """
+    Purge users soft-deleted more than ``grace_days`` ago. Every batch commits
+    on its own and batches are spaced out like archival, so an interrupted run
+    continues with the remaining users next time.
+    """
+    grace_days = settings.USER_PURGE_GRACE_DAYS if grace_days is None else grace_days
+    batch_size = batch_size or settings.USER_PURGE_BATCH_SIZE
+    cutoff = now() - timedelta(days=grace_days)
+    results = {'deleted': 0, 'anonymized': 0}
+
+    if dry_run:
+        results['eligible'] = purgeable_users(cutoff).count()
+        return results
+
+    # Users deleted before deleted_at existed start their grace period now
+    User.all_objects.filter(is_deleted=True, deleted_at__isnull=True).update(deleted_at=now())
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", [PURGE_LOCK_KEY])
+        if not cursor.fetchone()[0]:
+            logger.warning("Another user purge is in progress, skipping.")
+            return results
+
+    try:
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            deleted, anonymized = purge_batch(cutoff, batch_size)
+            batches += 1
+            results['deleted'] += deleted
+            results['anonymized'] += anonymized
+            logger.info(f"Purged {deleted} deleted users and anonymized {anonymized} (totals {results}).")
+            if deleted + anonymized < batch_size:
+                break
+            _throttle(settings.ARCHIVE_BATCH_PAUSE, settings.ARCHIVE_MAX_REPLICATION_LAG)
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", [PURGE_LOCK_KEY])
+    return results
@@ -1,12 +1,20 @@
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
+from core.dynamic_fields import DynamicFieldsMixin
+from apps.images.fields import DerivativeImageField
 from apps.authentication.models import User, Patient, Doctor, UserProfile, Specialization
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    avatar = DerivativeImageField(required=False, allow_null=True)
+
     class Meta:
         model = UserProfile
         fields = ['id', 'phone_number','address','gander', 'html_content', 'json_content', 'avatar', 'longitude','latitude']
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     profile = UserProfileSerializer(source='userprofile', read_only=True)
 
     class Meta:
@@ -15,7 +23,7 @@ class UserSerializer(serializers.ModelSerializer):
                   'date_joined', 'last_login', 'profile']
 
 # Patient Serializer
-class PatientSerializer(serializers.ModelSerializer):
+class PatientSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer()
 
     class Meta:
@@ -38,12 +46,12 @@ class PatientSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
 
-class SpecializationSerializer(serializers.ModelSerializer):
+class SpecializationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Specialization
         fields = ['id', 'name']
         
-class DoctorSerializer(serializers.ModelSerializer):
+class DoctorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer()
     specialization = SpecializationSerializer()
 
@@ -77,3 +85,39 @@ class DoctorSerializer(serializers.ModelSerializer):
         instance.reservation_open = validated_data.get("reservation_open", instance.reservation_open)
         instance.save()
         return instance
+
+
+# Staff-only bulk registration (see services.bulk_create_users)
+class BulkUserSerializer(serializers.Serializer):
+    email = serializers.EmailField(max_length=255)
+    password = serializers.CharField(write_only=True, required=False, allow_null=True, trim_whitespace=False)
+    first_name = serializers.CharField(max_length=30, required=False, allow_null=True, allow_blank=True)
+    last_name = serializers.CharField(max_length=30, required=False, allow_null=True, allow_blank=True)
+    role = serializers.ChoiceField(choices=User._meta.get_field('role').choices, default='patient')
+
+    def validate_email(self, value):
+        return User.objects.normalize_email(value)
+
+    def validate_password(self, value):
+        if value is not None:
+            validate_password(value)
+        return value
+
+
+class BulkUserCreateSerializer(serializers.Serializer):
+    users = BulkUserSerializer(many=True, allow_empty=False, max_length=settings.BULK_USER_MAX_BATCH)
+
+    def validate_users(self, value):
+        emails = [user['email'] for user in value]
+        duplicates = [email for email, count in Counter(emails).items() if count > 1]
+        if duplicates:
+            raise serializers.ValidationError(f"Duplicate emails: {', '.join(sorted(duplicates))}.")
+        limit = settings.BULK_USER_MAX_PASSWORDS
+        if sum(user.get('password') is not None for user in value) > limit:
+            raise serializers.ValidationError(
+                f"At most {limit} users with passwords per request; send the rest separately."
+            )
+        existing = list(User.objects.filter(email__in=emails).values_list('email', flat=True)[:20])
+        if existing:
+            raise serializers.ValidationError(f"Users already exist: {', '.join(sorted(existing))}.")
+        return value
@@ -0,0 +1,31 @@
+from django.db import transaction
+from apps.authentication.hashing import hash_passwords
+from apps.authentication.models import User, UserProfile, Patient
+from apps.general import copy_instances
+
+
+def bulk_create_users(users_data, batch_size=1000):
+    """
+    Create many users at once together with the rows the post_save signal
+    would add (UserProfile for everyone, Patient for patients), using one bulk
+    statement per table. ``users_data`` items are dicts of User fields; a
+    ``password`` key is hashed, without one the password is unusable.
+    Passwords are hashed (in a process pool for large batches) before the
+    transaction starts.
+    """
+    users_data = [dict(data) for data in users_data]
+    passwords = hash_passwords(data.pop('password', None) for data in users_data)
+    users = [
+        User(email=User.objects.normalize_email(data.pop('email')), password=password, **data)
+        for data, password in zip(users_data, passwords)
+    ]
+
+    with transaction.atomic():
+        User.objects.bulk_create(users, batch_size=batch_size)
+        copy_instances(UserProfile, (UserProfile(user=user) for user in users), batch_size=batch_size)
+        copy_instances(
+            Patient,
+            (Patient(user=user) for user in users if user.role == 'patient'),
+            batch_size=batch_size,
+        )
+    return users
@@ -0,0 +1,13 @@
+# backend/authentication/tasks.py
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def purge_deleted_users(max_batches=None):
+    import logging
+    from apps.authentication.purge import purge_deleted_users as purge
+    logger = logging.getLogger(__name__)
+    results = purge(max_batches=max_batches)
+    logger.info(f"User purge run finished: {results}")
+    return results
@@ -2,7 +2,10 @@ from django.conf import settings
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser
 from djoser.social.views import ProviderAuthView
+from apps.authentication.serializers import BulkUserCreateSerializer
+from apps.authentication.services import bulk_create_users
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -71,3 +74,20 @@ class LogoutView(APIView):
         response.delete_cookie("access")
         response.delete_cookie("refresh")
         return response
+
+
+# Staff-only bulk registration, e.g. for clinic invitation campaigns
+class BulkUserCreateView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        serializer = BulkUserCreateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        users = bulk_create_users(serializer.validated_data['users'])
+        return Response(
+            {
+                'created': len(users),
+                'users': [{'id': user.id, 'email': user.email, 'role': user.role} for user in users],
+            },
+            status=status.HTTP_201_CREATED,
+        )
@@ -6,7 +6,8 @@ from apps.booking_app.models import (
     Review, Post,
     Comment, Like, Category, Subscription, PaymentMethod,
     Payment, Notification, EventSchedule, AdvertisingCampaign,
-    UsersAudit
+    UsersAudit, ArchivedReservation, ArchivedNotification, ArchivedPayment,
+    ClinicDailyStats, DoctorDailyStats, RollupCheckpoint, VideoUpload
 )
 admin.site.register(Clinic)
 admin.site.register(ClinicDoctor)
@@ -23,4 +24,10 @@ admin.site.register(Notification)
 admin.site.register(EventSchedule)
 admin.site.register(AdvertisingCampaign)
 admin.site.register(UsersAudit)
-
+admin.site.register(ArchivedReservation)
+admin.site.register(ArchivedNotification)
+admin.site.register(ArchivedPayment)
+admin.site.register(ClinicDailyStats)
+admin.site.register(DoctorDailyStats)
+admin.site.register(RollupCheckpoint)
+admin.site.register(VideoUpload)
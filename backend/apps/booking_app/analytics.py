@@ -0,0 +1,255 @@
+# backend/booking_app/analytics.py
+
+import logging
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils.timezone import localdate, now
+
+from apps.authentication.models import Doctor
+from apps.booking_app.models import (
+    Clinic, Reservation, ReservationStatus, Payment, PaymentStatus, Review,
+    ClinicDailyStats, DoctorDailyStats, RollupCheckpoint, RollupStaleBucket
+)
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_CHECKPOINT = 'daily_stats'
+ROLLUP_LOCK_KEY = 'analytics:rollups:lock'
+ROLLUP_CHUNK_SIZE = 500
+
+RESERVATION_COUNTERS = {
+    'bookings': Count('id'),
+    'approved': Count('id', filter=Q(status=ReservationStatus.APPROVED)),
+    'rejected': Count('id', filter=Q(status=ReservationStatus.REJECTED)),
+    'cancelled': Count('id', filter=Q(status=ReservationStatus.CANCELLED)),
+}
+PAYMENT_COUNTERS = {
+    'payments': Count('id'),
+    'revenue': Sum('amount'),
+}
+REVIEW_COUNTERS = {
+    'reviews': Count('id'),
+    'rating_sum': Sum('rating'),
+}
+CLINIC_FIELDS = ['bookings', 'approved', 'rejected', 'cancelled', 'payments', 'revenue', 'reviews', 'rating_sum']
+DOCTOR_FIELDS = ['bookings', 'approved', 'rejected', 'cancelled', 'payments', 'revenue']
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def _completed_payments():
+    return Payment.objects.filter(payment_status=PaymentStatus.COMPLETED, related_object__isnull=False)
+
+
+def _changed_keys(start, end):
+    """Collect the (clinic, day) and (clinic, doctor, day) buckets touched by rows updated in [start, end)."""
+    window = Q(updated_at__gte=start, updated_at__lt=end)
+    clinic_keys, doctor_keys = set(), set()
+
+    def add(clinic_id, doctor_id, day):
+        if clinic_id is None:
+            return
+        clinic_keys.add((clinic_id, day))
+        if doctor_id is not None:
+            doctor_keys.add((clinic_id, doctor_id, day))
+
+    reservations = Reservation.objects.filter(window).annotate(day=TruncDate('created_at'))
+    for row in reservations.values_list('clinic_id', 'doctor_id', 'day').distinct().iterator():
+        add(*row)
+
+    # Payments are picked up whatever their status: a payment leaving "completed" changes revenue too
+    payments = Payment.objects.filter(window, related_object__isnull=False).annotate(day=TruncDate('created_at'))
+    for row in payments.values_list(
+        'related_object__clinic_id', 'related_object__doctor_id', 'day'
+    ).distinct().iterator():
+        add(*row)
+
+    reviews = Review.objects.filter(window).annotate(day=TruncDate('created_at'))
+    for clinic_id, day in reviews.values_list('clinic_id', 'day').distinct().iterator():
+        add(clinic_id, None, day)
+
+    return clinic_keys, doctor_keys
+
+
+def mark_stale(clinic_id, doctor_id, created):
+    """Queue the buckets of (clinic, doctor) on the days of ``created`` for the next run."""
+    if clinic_id is None:
+        return
+    days = {localdate(value) for value in created}
+    RollupStaleBucket.objects.bulk_create(
+        [RollupStaleBucket(clinic_id=clinic_id, doctor_id=doctor_id, date=day) for day in days]
+    )
+
+
+def mark_reservation_stale(reservation, clinic_id, doctor_id):
+    """Queue the buckets ``reservation`` and its payments count in under (clinic, doctor)."""
+    payments = Payment.objects.filter(related_object=reservation).values_list('created_at', flat=True)
+    mark_stale(clinic_id, doctor_id, [reservation.created_at, *payments])
+
+
+def _stale_keys():
+    """Pending stale buckets as (row ids, clinic keys, doctor keys)."""
+    ids, clinic_keys, doctor_keys = [], set(), set()
+    for pk, clinic_id, doctor_id, day in RollupStaleBucket.objects.values_list('id', 'clinic_id', 'doctor_id', 'date'):
+        ids.append(pk)
+        clinic_keys.add((clinic_id, day))
+        if doctor_id is not None:
+            doctor_keys.add((clinic_id, doctor_id, day))
+    return ids, clinic_keys, doctor_keys
+
+
+def _live_keys(clinic_keys, doctor_keys, end):
+    """
+    Drop buckets whose clinic or doctor is gone, and buckets from before the
+    archive retention window. Archived rows are no longer in the source tables,
+    so recomputing those buckets would lose them; they keep their last values.
+    Bookings are made ahead of their date, so a bucket (by creation day) is
+    never newer than rows archival has moved out of it.
+    """
+    retention = min(settings.ARCHIVE_RETENTION_DAYS['reservation'], settings.ARCHIVE_RETENTION_DAYS['payment'])
+    frozen_before = localdate(end) - timedelta(days=retention)
+    clinics = set(Clinic.objects.filter(id__in={key[0] for key in clinic_keys}).values_list('id', flat=True))
+    doctors = set(Doctor.objects.filter(user_id__in={key[1] for key in doctor_keys}).values_list('user_id', flat=True))
+    return (
+        {key for key in clinic_keys if key[-1] >= frozen_before and key[0] in clinics},
+        {key for key in doctor_keys if key[-1] >= frozen_before and key[0] in clinics and key[1] in doctors},
+    )
+
+
+def _aggregate(queryset, group_fields, counters, keys, totals):
+    """GROUP BY (``group_fields``, created day) over the given buckets only and merge into ``totals``."""
+    days = [key[-1] for key in keys]
+    filters = {f'{field}__in': {key[index] for key in keys} for index, field in enumerate(group_fields)}
+    rows = (
+        queryset
+        .annotate(day=TruncDate('created_at'))
+        .filter(day__range=(min(days), max(days)), **filters)
+        .values(*group_fields, 'day')
+        .annotate(**counters)
+    )
+    for row in rows:
+        key = tuple(row[field] for field in group_fields) + (row['day'],)
+        if key in totals:
+            totals[key].update({name: row[name] or 0 for name in counters})
+
+
+def _recompute(model, key_fields, fields, keys, sources):
+    """Recompute the given buckets from scratch and upsert them in one statement."""
+    totals = {key: {field: Decimal('0') if field == 'revenue' else 0 for field in fields} for key in keys}
+    for queryset, group_fields, counters in sources:
+        _aggregate(queryset, group_fields, counters, keys, totals)
+
+    model.objects.bulk_create(
+        [
+            model(**{f'{field}_id': value for field, value in zip(key_fields, key)}, date=key[-1], **values)
+            for key, values in totals.items()
+        ],
+        update_conflicts=True,
+        unique_fields=key_fields + ['date'],
+        update_fields=fields + ['updated_at'],
+    )
+
+
+def _chunks(keys):
+    keys = sorted(keys, key=lambda key: tuple(map(str, key)))
+    for index in range(0, len(keys), ROLLUP_CHUNK_SIZE):
+        yield keys[index:index + ROLLUP_CHUNK_SIZE]
+
+
+def update_rollups(full=False):
+    """
+    Refresh the daily clinic and doctor rollups for every bucket touched since
+    the last run. Only rows whose ``updated_at`` is past the checkpoint are read,
+    plus the buckets deleted or moved rows left (RollupStaleBucket), and each
+    touched bucket is recomputed in full, so reruns are idempotent. Rows
+    updated within ``ANALYTICS_ROLLUP_LAG`` seconds are left for the next run
+    to avoid skipping transactions that commit late. Buckets old enough to have
+    lost rows to archival are never recomputed.
+    """
+    if not cache.add(ROLLUP_LOCK_KEY, 1, settings.ANALYTICS_ROLLUP_LOCK_TIMEOUT):
+        logger.info("Analytics rollups are already running; skipping this run.")
+        return None
+
+    try:
+        checkpoint, _ = RollupCheckpoint.objects.get_or_create(
+            name=ROLLUP_CHECKPOINT, defaults={'high_water_mark': EPOCH}
+        )
+        start = EPOCH if full else checkpoint.high_water_mark
+        end = now() - timedelta(seconds=settings.ANALYTICS_ROLLUP_LAG)
+        if end <= start:
+            return {'clinic_buckets': 0, 'doctor_buckets': 0}
+
+        stale_ids, stale_clinic_keys, stale_doctor_keys = _stale_keys()
+        clinic_keys, doctor_keys = _changed_keys(start, end)
+        clinic_keys, doctor_keys = _live_keys(clinic_keys | stale_clinic_keys, doctor_keys | stale_doctor_keys, end)
+
+        clinic_sources = [
+            (Reservation.objects.all(), ['clinic_id'], RESERVATION_COUNTERS),
+            (_completed_payments(), ['related_object__clinic_id'], PAYMENT_COUNTERS),
+            (Review.objects.all(), ['clinic_id'], REVIEW_COUNTERS),
+        ]
+        doctor_sources = [
+            (Reservation.objects.all(), ['clinic_id', 'doctor_id'], RESERVATION_COUNTERS),
+            (_completed_payments(), ['related_object__clinic_id', 'related_object__doctor_id'], PAYMENT_COUNTERS),
+        ]
+        for chunk in _chunks(clinic_keys):
+            with transaction.atomic():
+                _recompute(ClinicDailyStats, ['clinic'], CLINIC_FIELDS, chunk, clinic_sources)
+        for chunk in _chunks(doctor_keys):
+            with transaction.atomic():
+                _recompute(DoctorDailyStats, ['clinic', 'doctor'], DOCTOR_FIELDS, chunk, doctor_sources)
+
+        checkpoint.high_water_mark = end
+        checkpoint.save(update_fields=['high_water_mark'])
+        RollupStaleBucket.objects.filter(id__in=stale_ids).delete()
+        return {'clinic_buckets': len(clinic_keys), 'doctor_buckets': len(doctor_keys)}
+    finally:
+        cache.delete(ROLLUP_LOCK_KEY)
+
+
+def _rates(values):
+    bookings = values['bookings'] or 0
+    reviews = values.get('reviews') or 0
+    return {
+        'approval_rate': round(values['approved'] / bookings, 4) if bookings else None,
+        'rejection_rate': round(values['rejected'] / bookings, 4) if bookings else None,
+        'cancellation_rate': round(values['cancelled'] / bookings, 4) if bookings else None,
+        'average_rating': round(values['rating_sum'] / reviews, 2) if reviews else None,
+    }
+
+
+def clinic_dashboard(clinic, date_from, date_to):
+    """Build the dashboard payload for ``clinic`` from the rollup tables only."""
+    daily = list(
+        ClinicDailyStats.objects
+        .filter(clinic=clinic, date__range=(date_from, date_to))
+        .order_by('date')
+        .values('date', *CLINIC_FIELDS)
+    )
+    totals = {field: sum(row[field] for row in daily) for field in CLINIC_FIELDS}
+    totals['revenue'] = Decimal(totals['revenue'])
+    totals.update(_rates(totals))
+    for row in daily:
+        row.update(_rates(row))
+
+    doctors = list(
+        DoctorDailyStats.objects
+        .filter(clinic=clinic, date__range=(date_from, date_to))
+        .values('doctor_id')
+        .annotate(**{field: Sum(field) for field in DOCTOR_FIELDS})
+        .order_by('-bookings')
+    )
+    return {
+        'clinic': clinic.id,
+        'date_from': date_from,
+        'date_to': date_to,
+        'totals': totals,
+        'daily': daily,
+        'doctors': doctors,
+    }
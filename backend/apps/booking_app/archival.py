@@ -0,0 +1,197 @@
+# backend/booking_app/archival.py
+
+import logging
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from apps.booking_app.models import (
+    Reservation, ReservationDoctor, ReservationStatus, Payment, PaymentStatus,
+    Subscription, Notification, ArchivedReservation, ArchivedPayment, ArchivedNotification
+)
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_LOCK_KEY = 'painfx_archive_records'
+
+
+@dataclass
+class ArchivePolicy:
+    name: str
+    model: type
+    archive_model: type
+    date_column: str
+    # Extra archive columns mapped to the source column they are copied from.
+    columns: dict
+    # Extra SQL predicates; must keep rows that are still referenced out of the batch.
+    conditions: tuple = ()
+    # Tables whose rows pointing at the batch are deleted together with it.
+    dependents: tuple = ()
+
+
+def _table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _column(model, field_name):
+    return connection.ops.quote_name(model._meta.get_field(field_name).column)
+
+
+def get_policies():
+    # Payments go first so the reservations they point at become eligible in the same run.
+    return [
+        ArchivePolicy(
+            name='payment',
+            model=Payment,
+            archive_model=ArchivedPayment,
+            date_column=_column(Payment, 'created_at'),
+            columns={
+                'user_id': _column(Payment, 'user'),
+                'reservation_id': _column(Payment, 'related_object'),
+            },
+            conditions=(
+                f"{_column(Payment, 'payment_status')} IN ('{PaymentStatus.COMPLETED}', '{PaymentStatus.FAILED}')",
+                f"NOT EXISTS (SELECT 1 FROM {_table(Subscription)} s "
+                f"WHERE s.{_column(Subscription, 'payment')} = src.{_column(Payment, 'id')})",
+            ),
+        ),
+        ArchivePolicy(
+            name='reservation',
+            model=Reservation,
+            archive_model=ArchivedReservation,
+            date_column=_column(Reservation, 'reservation_date'),
+            columns={
+                'patient_id': _column(Reservation, 'patient'),
+                'clinic_id': _column(Reservation, 'clinic'),
+                'doctor_id': _column(Reservation, 'doctor'),
+                'reservation_date': _column(Reservation, 'reservation_date'),
+            },
+            conditions=(
+                f"{_column(Reservation, 'status')} <> '{ReservationStatus.PENDING}'",
+                f"NOT EXISTS (SELECT 1 FROM {_table(Payment)} p "
+                f"WHERE p.{_column(Payment, 'related_object')} = src.{_column(Reservation, 'id')})",
+            ),
+            dependents=((ReservationDoctor, _column(ReservationDoctor, 'reservation')),),
+        ),
+        ArchivePolicy(
+            name='notification',
+            model=Notification,
+            archive_model=ArchivedNotification,
+            date_column=_column(Notification, 'created_at'),
+            columns={'user_id': _column(Notification, 'user')},
+        ),
+    ]
+
+
+def _build_move_sql(policy):
+    """
+    One statement per batch: lock a bounded slice of old rows, delete them with
+    RETURNING and insert the returned rows into the archive table.
+    """
+    pk = _column(policy.model, 'id')
+    where = ' AND '.join((f"src.{policy.date_column} < %s",) + policy.conditions)
+    dependents = ''.join(
+        f", del_{index} AS (DELETE FROM {_table(model)} WHERE {column} IN (SELECT {pk} FROM batch))"
+        for index, (model, column) in enumerate(policy.dependents)
+    )
+    archive_columns = ['id', 'created_at', 'archived_at', 'data'] + list(policy.columns)
+    select_columns = [
+        f"moved.{pk}", f"moved.{_column(policy.model, 'created_at')}", 'now()', 'to_jsonb(moved)'
+    ] + [f"moved.{column}" for column in policy.columns.values()]
+    return (
+        f"WITH batch AS ("
+        f"SELECT src.{pk} FROM {_table(policy.model)} src WHERE {where} "
+        f"ORDER BY src.{policy.date_column} LIMIT %s FOR UPDATE SKIP LOCKED)"
+        f"{dependents}, "
+        f"moved AS (DELETE FROM {_table(policy.model)} WHERE {pk} IN (SELECT {pk} FROM batch) RETURNING *) "
+        f"INSERT INTO {_table(policy.archive_model)} "
+        f"({', '.join(connection.ops.quote_name(c) for c in archive_columns)}) "
+        f"SELECT {', '.join(select_columns)} FROM moved "
+        f"ON CONFLICT DO NOTHING"
+    )
+
+
+def get_replication_lag():
+    """Worst replay lag in seconds across attached replicas, 0 when unknown."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COALESCE(MAX(EXTRACT(EPOCH FROM replay_lag)), 0) FROM pg_stat_replication"
+            )
+            return float(cursor.fetchone()[0] or 0)
+    except Exception as e:
+        logger.warning(f"Could not read replication lag: {str(e)}")
+        return 0.0
+
+
+def _throttle(pause, max_lag):
+    time.sleep(pause)
+    while max_lag and get_replication_lag() > max_lag:
+        logger.info(f"Replication lag above {max_lag}s, pausing archival.")
+        time.sleep(max(pause, 1))
+
+
+def archive_policy(policy, cutoff, batch_size, pause=0, max_lag=0, max_batches=None, dry_run=False):
+    """
+    Move rows older than ``cutoff`` in batches. Every batch commits on its own,
+    so an interrupted run simply continues from the remaining rows next time.
+    """
+    if dry_run:
+        where = ' AND '.join((f"src.{policy.date_column} < %s",) + policy.conditions)
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COUNT(*) FROM {_table(policy.model)} src WHERE {where}", [cutoff])
+            return cursor.fetchone()[0]
+
+    sql = _build_move_sql(policy)
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [cutoff, batch_size])
+                count = cursor.rowcount
+        batches += 1
+        moved += count
+        logger.info(f"Archived {count} {policy.name} rows (total {moved}).")
+        if count < batch_size:
+            break
+        _throttle(pause, max_lag)
+    return moved
+
+
+def archive_records(names=None, retention_days=None, batch_size=None, max_batches=None, dry_run=False):
+    """
+    Run every configured archive policy. Returns a mapping of policy name to the
+    number of rows moved (or eligible, for a dry run).
+    """
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    pause = settings.ARCHIVE_BATCH_PAUSE
+    max_lag = settings.ARCHIVE_MAX_REPLICATION_LAG
+    results = {}
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(hashtext(%s))", [ARCHIVE_LOCK_KEY])
+        if not cursor.fetchone()[0]:
+            logger.warning("Another archival run is in progress, skipping.")
+            return results
+
+    try:
+        for policy in get_policies():
+            if names and policy.name not in names:
+                continue
+            days = retention_days or settings.ARCHIVE_RETENTION_DAYS[policy.name]
+            cutoff = now() - timedelta(days=days)
+            if policy.model is Reservation:
+                cutoff = cutoff.date()
+            results[policy.name] = archive_policy(
+                policy, cutoff, batch_size,
+                pause=pause, max_lag=max_lag, max_batches=max_batches, dry_run=dry_run
+            )
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(hashtext(%s))", [ARCHIVE_LOCK_KEY])
+    return results
@@ -0,0 +1,156 @@
+# backend/booking_app/async_views.py
+#
+# Async variants of the busiest read endpoints, for ASGI deployments. They
+# return the same payloads as the DRF viewsets (same serializers and page
+# format, including ?fields=/?expand=) but load rows with the async ORM and
+# read the cache asynchronously. Related rows are fetched up front, so
+# serializing never queries the database from the event loop.
+
+import math
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from apps.authentication.authentication import CustomJWTAuthentication
+from apps.authentication.models import Doctor
+from apps.authentication.serializers import DoctorSerializer
+from apps.booking_app.clinic_cache import aclinic_cache_key
+from apps.booking_app.models import Clinic, Reservation, Notification
+from apps.booking_app.serializers import ClinicSerializer, ReservationSerializer, NotificationSerializer
+from apps.booking_app.views import GlPagination, with_doctor_summary
+from apps.monitoring.metrics import record_cache_access
+from core.dynamic_fields import eager_load
+from core.fast_serializers import serialize
+from core.renderers import ORJSONRenderer
+
+
+def json_response(data, status=200):
+    return HttpResponse(ORJSONRenderer().render(data), status=status, content_type=ORJSONRenderer.media_type)
+
+
+def async_login_required(view):
+    """JWT (header or cookie) authentication for async views, like CustomJWTAuthentication."""
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        result = await CustomJWTAuthentication().aauthenticate(request)
+        if result is None:
+            return json_response({'detail': 'Authentication credentials were not provided.'}, status=401)
+        request.user = result[0]
+        return await view(request, *args, **kwargs)
+    return wrapper
+
+
+def _page_params(request):
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        page = 0
+    try:
+        page_size = int(request.GET.get(GlPagination.page_size_query_param, GlPagination.page_size))
+    except ValueError:
+        page_size = GlPagination.page_size
+    if page_size < 1:
+        page_size = GlPagination.page_size
+    return page, min(page_size, GlPagination.max_page_size)
+
+
+async def paginate(request, queryset, serializer_class):
+    """One GlPagination-style page of ``queryset``, or None when the page does not exist."""
+    page, page_size = _page_params(request)
+    queryset = eager_load(queryset, serializer_class(context={'request': request}))
+    count = await queryset.acount()
+    if page < 1 or page > max(1, math.ceil(count / page_size)):
+        return None
+
+    offset = (page - 1) * page_size
+    rows = [obj async for obj in queryset[offset:offset + page_size]]
+    url = request.build_absolute_uri()
+    if page == 1:
+        previous_url = None
+    elif page == 2:
+        previous_url = remove_query_param(url, 'page')
+    else:
+        previous_url = replace_query_param(url, 'page', page - 1)
+    return {
+        'count': count,
+        'next': replace_query_param(url, 'page', page + 1) if offset + page_size < count else None,
+        'previous': previous_url,
+        'results': serialize(serializer_class, rows, request),
+    }
+
+
+def invalid_page():
+    return json_response({'detail': 'Invalid page.'}, status=404)
+
+
+@require_GET
+@async_login_required
+async def clinic_list(request):
+    key = await aclinic_cache_key('list', request.get_host(), request.GET.urlencode())
+    data = await cache.aget(key)
+    record_cache_access('async_clinic_list', hit=data is not None)
+    if data is None:
+        queryset = with_doctor_summary(Clinic.objects.order_by('created_at', 'id'), ClinicSerializer(context={'request': request}))
+        data = await paginate(request, queryset, ClinicSerializer)
+        if data is None:
+            return invalid_page()
+        await cache.aset(key, data, settings.ASYNC_CLINIC_CACHE_TIMEOUT)
+    return json_response(data)
+
+
+@require_GET
+@async_login_required
+async def clinic_detail(request, clinic_id):
+    key = await aclinic_cache_key('detail', request.get_host(), clinic_id, request.GET.urlencode())
+    data = await cache.aget(key)
+    record_cache_access('async_clinic_detail', hit=data is not None)
+    if data is None:
+        try:
+            serializer = ClinicSerializer(context={'request': request})
+            queryset = eager_load(with_doctor_summary(Clinic.objects.all(), serializer), serializer)
+            clinic = await queryset.aget(id=clinic_id)
+        except Clinic.DoesNotExist:
+            return json_response({'detail': 'No Clinic matches the given query.'}, status=404)
+        data = serialize(ClinicSerializer, clinic, request, many=False)
+        await cache.aset(key, data, settings.ASYNC_CLINIC_CACHE_TIMEOUT)
+    return json_response(data)
+
+
+@require_GET
+@async_login_required
+async def doctor_list(request):
+    queryset = Doctor.objects.order_by('user_id')
+    data = await paginate(request, queryset, DoctorSerializer)
+    return invalid_page() if data is None else json_response(data)
+
+
+@require_GET
+@async_login_required
+async def notification_list(request):
+    queryset = Notification.objects.filter(user=request.user)
+    if request.GET.get('unread') in ('1', 'true'):
+        queryset = queryset.filter(is_read=False)
+    data = await paginate(request, queryset.order_by('-created_at'), NotificationSerializer)
+    return invalid_page() if data is None else json_response(data)
+
+
+@require_GET
+@async_login_required
+async def reservation_list(request):
+    # Same scoping as ReservationViewSet, decided from the role so no profile lookups are needed
+    user = request.user
+    if user.role == 'clinic':
+        queryset = Reservation.objects.filter(clinic__owner=user)
+    elif user.role == 'doctor':
+        queryset = Reservation.objects.filter(doctor_id=user.id)
+    elif user.role == 'patient':
+        queryset = Reservation.objects.filter(patient_id=user.id)
+    else:
+        queryset = Reservation.objects.none()
+    queryset = queryset.order_by('-reservation_date', '-reservation_time')
+    data = await paginate(request, queryset, ReservationSerializer)
+    return invalid_page() if data is None else json_response(data)
@@ -0,0 +1,19 @@
+# backend/booking_app/clinic_cache.py
+
+from django.core.cache import cache
+
+# Cached clinic responses carry this version in their keys, so one increment
+# retires every cached page and detail at once
+CLINIC_CACHE_VERSION_KEY = 'clinics:version'
+
+
+def bump_clinic_cache_version():
+    try:
+        cache.incr(CLINIC_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(CLINIC_CACHE_VERSION_KEY, 1, timeout=None)
+
+
+async def aclinic_cache_key(*parts):
+    version = await cache.aget(CLINIC_CACHE_VERSION_KEY, 0)
+    return ':'.join(['clinics', str(version), *map(str, parts)])
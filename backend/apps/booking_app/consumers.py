@@ -0,0 +1,30 @@
+# backend/booking_app/consumers.py
+
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from apps.booking_app.notifications import get_unread_count
+from apps.booking_app.realtime import user_group_name
+
+
+# Per-user event stream: new notifications and reservation status changes
+class UserEventsConsumer(AsyncJsonWebsocketConsumer):
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+
+        self.group_name = user_group_name(user.id)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        unread_count = await database_sync_to_async(get_unread_count)(user.id)
+        await self.send_json({'type': 'unread_count', 'unread_count': unread_count})
+
+    async def disconnect(self, code):
+        if hasattr(self, 'group_name'):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def user_event(self, event):
+        await self.send_json(event['payload'])
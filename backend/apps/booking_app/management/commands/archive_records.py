@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from apps.booking_app.archival import archive_records, get_policies
+
+
+class Command(BaseCommand):
+    help = "Move reservations, payments and notifications past their retention horizon into archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--only', action='append', choices=[policy.name for policy in get_policies()],
+            help="Archive only this table (can be repeated)."
+        )
+        parser.add_argument('--days', type=int, help="Override the configured retention horizon.")
+        parser.add_argument('--batch-size', type=int, help="Rows moved per transaction.")
+        parser.add_argument('--max-batches', type=int, help="Stop after this many batches per table.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count eligible rows.")
+
+    def handle(self, *args, **options):
+        results = archive_records(
+            names=options['only'],
+            retention_days=options['days'],
+            batch_size=options['batch_size'],
+            max_batches=options['max_batches'],
+            dry_run=options['dry_run'],
+        )
+        verb = 'eligible' if options['dry_run'] else 'archived'
+        for name, count in results.items():
+            self.stdout.write(self.style.SUCCESS(f"{name}: {count} rows {verb}"))
@@ -0,0 +1,318 @@
+import datetime
+import itertools
+import random
+import time
+import uuid
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.authentication.models import User, UserProfile, Patient, Doctor, Specialization
+from apps.booking_app.models import (
+    Tag, Clinic, ClinicDoctor, Reservation, ReservationStatus, Review, Post, Comment, Like,
+    Notification, Payment, PaymentMethod, PaymentStatus
+)
+from apps.general import copy_instances
+
+SEED_DOMAIN = 'seed.painfx.local'
+SEED_PASSWORD = 'painfx-seed'
+
+SPECIALIZATIONS = [
+    'Physiotherapy', 'Orthopedics', 'Neurology', 'Rheumatology', 'Sports Medicine',
+    'Pain Management', 'Chiropractic', 'Osteopathy', 'Rehabilitation', 'Occupational Therapy',
+]
+FIRST_NAMES = ['Sara', 'Omar', 'Lina', 'Youssef', 'Maya', 'Adam', 'Nour', 'Karim', 'Hana', 'Ziad', 'Laila', 'Sami']
+LAST_NAMES = ['Haddad', 'Khalil', 'Mansour', 'Nasser', 'Saleh', 'Fares', 'Aziz', 'Hamdan', 'Rahman', 'Darwish']
+STATUS_WEIGHTS = [
+    (ReservationStatus.APPROVED, 60), (ReservationStatus.PENDING, 15),
+    (ReservationStatus.REJECTED, 10), (ReservationStatus.CANCELLED, 15),
+]
+
+
+def zipf_weights(count, exponent):
+    """Cumulative weights where item i is picked proportionally to 1 / (i + 1) ** exponent."""
+    return list(itertools.accumulate(1 / (rank + 1) ** exponent for rank in range(count)))
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a large, deterministic synthetic data set (users, doctors, clinics, reservations, "
+        "posts, likes, comments, reviews, notifications) for benchmarking. Run on an empty database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--patients', type=int, default=10000)
+        parser.add_argument('--doctors', type=int, default=1000)
+        parser.add_argument('--clinics', type=int, default=200)
+        parser.add_argument('--reservations', type=int, default=200000)
+        parser.add_argument('--posts', type=int, default=20000)
+        parser.add_argument('--likes', type=int, default=500000)
+        parser.add_argument('--comments', type=int, default=100000)
+        parser.add_argument('--reviews', type=int, default=20000)
+        parser.add_argument('--notifications', type=int, default=300000)
+        parser.add_argument('--days', type=int, default=365, help="Spread reservations over this many past days.")
+        parser.add_argument('--skew', type=float, default=1.1, help="Zipf exponent for hot clinics and viral posts.")
+
+    def handle(self, *args, **options):
+        if User.objects.filter(email__endswith=f'@{SEED_DOMAIN}').exists():
+            raise CommandError("Seed data already present; run seed_painfx on an empty database.")
+
+        self.rng = random.Random(options['seed'])
+        # Anchor every timestamp to midnight so the same seed gives the same data all day
+        self.now = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        self.options = options
+        self.password = make_password(SEED_PASSWORD)
+
+        with transaction.atomic():
+            self.step('reference data', self.seed_reference_data)
+            self.step('users', self.seed_users)
+            self.step('clinics', self.seed_clinics)
+            self.step('reservations and payments', self.seed_reservations)
+            self.step('reviews', self.seed_reviews)
+            self.step('posts', self.seed_posts)
+            self.step('likes and comments', self.seed_engagement)
+            self.step('notifications', self.seed_notifications)
+
+    def step(self, label, func):
+        start = time.monotonic()
+        count = func()
+        self.stdout.write(self.style.SUCCESS(f"{label}: {count} rows in {time.monotonic() - start:.1f}s"))
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def past(self, days):
+        return self.now - datetime.timedelta(seconds=self.rng.randrange(max(days, 1) * 86400))
+
+    # -----------------------------------------
+    # Steps
+    # -----------------------------------------
+    def seed_reference_data(self):
+        self.specializations = [Specialization(id=self.uuid(), name=name) for name in SPECIALIZATIONS]
+        Specialization.objects.bulk_create(self.specializations, ignore_conflicts=True)
+        self.specializations = list(Specialization.objects.filter(name__in=SPECIALIZATIONS).order_by('name'))
+        Tag.objects.bulk_create([Tag(name=f'seed-{index}') for index in range(50)], ignore_conflicts=True)
+        self.tags = list(Tag.objects.filter(name__startswith='seed-').order_by('name'))
+        PaymentMethod.objects.bulk_create(
+            [PaymentMethod(id=self.uuid(), method_name=name) for name in ('card', 'cash', 'insurance')],
+            ignore_conflicts=True,
+        )
+        self.payment_methods = list(PaymentMethod.objects.order_by('method_name').values_list('id', flat=True))
+        return len(self.specializations) + len(self.tags) + len(self.payment_methods)
+
+    def make_user(self, role, index):
+        joined = self.past(self.options['days'] * 2)
+        return User(
+            id=self.uuid(),
+            email=f'{role}{index}@{SEED_DOMAIN}',
+            password=self.password,
+            first_name=self.rng.choice(FIRST_NAMES),
+            last_name=self.rng.choice(LAST_NAMES),
+            role=role,
+            date_joined=joined,
+            last_login=joined + datetime.timedelta(days=self.rng.randrange(30)),
+        )
+
+    def seed_users(self):
+        options = self.options
+        self.patient_ids = []
+        self.doctor_ids = []
+        self.owner_ids = []
+        users = (
+            [self.make_user('patient', index) for index in range(options['patients'])]
+            + [self.make_user('doctor', index) for index in range(options['doctors'])]
+            + [self.make_user('clinic', index) for index in range(options['clinics'])]
+        )
+        copy_instances(User, users, keep_timestamps=True)
+
+        # Rows the post_save signal would create for every user
+        copy_instances(UserProfile, (UserProfile(id=self.uuid(), user_id=user.id) for user in users))
+        copy_instances(
+            Patient,
+            (Patient(user_id=user.id) for user in users if user.role == 'patient'),
+        )
+        doctors = []
+        for user in users:
+            if user.role == 'patient':
+                self.patient_ids.append(user.id)
+            elif user.role == 'doctor':
+                self.doctor_ids.append(user.id)
+                doctors.append(Doctor(
+                    user_id=user.id,
+                    specialization_id=self.rng.choice(self.specializations).id,
+                    license_number=f'LIC-{self.rng.randrange(10 ** 8):08d}',
+                    active=True,
+                    reservation_open=self.rng.random() < 0.9,
+                ))
+            else:
+                self.owner_ids.append(user.id)
+        copy_instances(Doctor, doctors)
+        return len(users) * 2 + len(self.patient_ids) + len(doctors)
+
+    def seed_clinics(self):
+        clinics = [
+            Clinic(
+                id=self.uuid(),
+                name=f'{self.rng.choice(LAST_NAMES)} {self.rng.choice(SPECIALIZATIONS)} Clinic {index}',
+                address=f'{self.rng.randrange(1, 999)} Seed Street',
+                owner_id=owner_id,
+                specialization_id=self.rng.choice(self.specializations).id,
+                active=True,
+                reservation_open=self.rng.random() < 0.95,
+            )
+            for index, owner_id in enumerate(self.owner_ids)
+        ]
+        copy_instances(Clinic, clinics)
+        self.clinic_ids = [clinic.id for clinic in clinics]
+        self.clinic_owner = {clinic.id: clinic.owner_id for clinic in clinics}
+        self.clinic_weights = zipf_weights(len(clinics), self.options['skew'])
+
+        # Hot clinics employ more doctors: each doctor joins one or two clinics picked by popularity
+        self.clinic_doctors = {clinic_id: [] for clinic_id in self.clinic_ids}
+        links = set()
+        for doctor_id in self.doctor_ids:
+            for clinic_id in self.rng.choices(self.clinic_ids, cum_weights=self.clinic_weights, k=self.rng.choice((1, 1, 2))):
+                if (clinic_id, doctor_id) not in links:
+                    links.add((clinic_id, doctor_id))
+                    self.clinic_doctors[clinic_id].append(doctor_id)
+        copy_instances(
+            ClinicDoctor,
+            (ClinicDoctor(id=self.uuid(), clinic_id=clinic_id, doctor_id=doctor_id) for clinic_id, doctor_id in links),
+        )
+        tag_links = [
+            Clinic.tags.through(clinic_id=clinic_id, tag_id=tag.id)
+            for clinic_id in self.clinic_ids
+            for tag in self.rng.sample(self.tags, 3)
+        ]
+        Clinic.tags.through.objects.bulk_create(tag_links, batch_size=5000)
+        return len(clinics) + len(links) + len(tag_links)
+
+    def seed_reservations(self):
+        options = self.options
+        statuses, weights = zip(*STATUS_WEIGHTS)
+        self.approved_pairs = []
+        payments = []
+
+        def reservations():
+            clinic_picks = self.rng.choices(self.clinic_ids, cum_weights=self.clinic_weights, k=options['reservations'])
+            for clinic_id in clinic_picks:
+                created_at = self.past(options['days'])
+                status = self.rng.choices(statuses, weights)[0]
+                doctors = self.clinic_doctors[clinic_id]
+                patient_id = self.rng.choice(self.patient_ids)
+                reservation = Reservation(
+                    id=self.uuid(),
+                    clinic_id=clinic_id,
+                    patient_id=patient_id,
+                    doctor_id=self.rng.choice(doctors) if doctors and status == ReservationStatus.APPROVED else None,
+                    status=status,
+                    reason_for_cancellation='Schedule conflict' if status == ReservationStatus.CANCELLED else None,
+                    reservation_date=(created_at + datetime.timedelta(days=self.rng.randrange(1, 30))).date(),
+                    reservation_time=datetime.time(self.rng.randrange(8, 18), self.rng.choice((0, 30))),
+                    created_at=created_at,
+                    updated_at=created_at + datetime.timedelta(hours=self.rng.randrange(1, 48)),
+                )
+                if status == ReservationStatus.APPROVED:
+                    self.approved_pairs.append((clinic_id, patient_id))
+                    payments.append(Payment(
+                        id=self.uuid(),
+                        user_id=patient_id,
+                        amount=Decimal(self.rng.randrange(3000, 25000)) / 100,
+                        method_id=self.rng.choice(self.payment_methods),
+                        payment_status=PaymentStatus.COMPLETED if self.rng.random() < 0.95 else PaymentStatus.FAILED,
+                        related_object_id=reservation.id,
+                        created_at=reservation.updated_at,
+                        updated_at=reservation.updated_at,
+                    ))
+                yield reservation
+
+        copy_instances(Reservation, reservations(), keep_timestamps=True)
+        copy_instances(Payment, payments, keep_timestamps=True)
+        return options['reservations'] + len(payments)
+
+    def seed_reviews(self):
+        pairs = list(dict.fromkeys(self.approved_pairs))
+        self.rng.shuffle(pairs)
+        reviews = []
+        for clinic_id, patient_id in pairs[:self.options['reviews']]:
+            created_at = self.past(self.options['days'])
+            reviews.append(Review(
+                id=self.uuid(),
+                clinic_id=clinic_id,
+                patient_id=patient_id,
+                rating=self.rng.choices((1, 2, 3, 4, 5), (5, 5, 15, 35, 40))[0],
+                review_text='Great care and attention.' if self.rng.random() < 0.5 else None,
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+        copy_instances(Review, reviews, keep_timestamps=True)
+        return len(reviews)
+
+    def seed_posts(self):
+        author_weights = zipf_weights(len(self.doctor_ids), self.options['skew'])
+        authors = self.rng.choices(self.doctor_ids, cum_weights=author_weights, k=self.options['posts'])
+        posts = []
+        for index, doctor_id in enumerate(authors):
+            created_at = self.past(self.options['days'])
+            posts.append(Post(
+                id=self.uuid(),
+                doctor_id=doctor_id,
+                title=f'Exercise tip #{index}',
+                content='Daily mobility routine for lower back pain.',
+                video_url=f'https://videos.{SEED_DOMAIN}/{index}.mp4' if self.rng.random() < 0.3 else None,
+                created_at=created_at,
+                updated_at=created_at,
+            ))
+        copy_instances(Post, posts, keep_timestamps=True)
+        self.post_ids = [post.id for post in posts]
+        self.post_weights = zipf_weights(len(posts), self.options['skew'])
+        return len(posts)
+
+    def seed_engagement(self):
+        options = self.options
+        user_ids = self.patient_ids + self.doctor_ids
+
+        # A few viral posts collect most likes; (post, user) pairs must stay unique
+        pairs = set()
+        attempts = 0
+        while len(pairs) < options['likes'] and attempts < 5:
+            missing = options['likes'] - len(pairs)
+            posts = self.rng.choices(self.post_ids, cum_weights=self.post_weights, k=missing)
+            pairs.update(zip(posts, self.rng.choices(user_ids, k=missing)))
+            attempts += 1
+
+        def likes():
+            for post_id, user_id in pairs:
+                created_at = self.past(options['days'])
+                yield Like(id=self.uuid(), post_id=post_id, user_id=user_id, created_at=created_at, updated_at=created_at)
+
+        def comments():
+            posts = self.rng.choices(self.post_ids, cum_weights=self.post_weights, k=options['comments'])
+            for post_id in posts:
+                created_at = self.past(options['days'])
+                yield Comment(
+                    id=self.uuid(), post_id=post_id, user_id=self.rng.choice(user_ids),
+                    comment_text='Thank you, doctor!', created_at=created_at, updated_at=created_at,
+                )
+
+        copy_instances(Like, likes(), keep_timestamps=True)
+        copy_instances(Comment, comments(), keep_timestamps=True)
+        return len(pairs) + options['comments']
+
+    def seed_notifications(self):
+        options = self.options
+
+        def notifications():
+            for user_id in self.rng.choices(self.patient_ids, k=options['notifications']):
+                created_at = self.past(options['days'])
+                yield Notification(
+                    id=self.uuid(), user_id=user_id, message='Your reservation has been approved.',
+                    is_read=self.rng.random() < 0.7, created_at=created_at, updated_at=created_at,
+                )
+
+        copy_instances(Notification, notifications(), keep_timestamps=True)
+        return options['notifications']
@@ -3,6 +3,7 @@ from django.db import models
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from apps.authentication.models import Specialization, User, Doctor, Patient
+from apps.general import AddressTrackingMixin
 
 # Abstract Base Model
 class BaseModel(models.Model):
@@ -38,6 +39,12 @@ class CampaignStatus(models.TextChoices):
     PAUSED = 'paused', 'Paused'
     COMPLETED = 'completed', 'Completed'
 
+class VideoUploadStatus(models.TextChoices):
+    UPLOADING = 'uploading', 'Uploading'
+    ASSEMBLING = 'assembling', 'Assembling'
+    COMPLETE = 'complete', 'Complete'
+    FAILED = 'failed', 'Failed'
+
 # ---------------------------------------------
 # Tags
 # ---------------------------------------------
@@ -57,7 +64,7 @@ class Tag(models.Model):
 # ---------------------------------------------
 # Clinics, Branches, and their Doctors
 # ---------------------------------------------
-class Clinic(BaseModel):
+class Clinic(AddressTrackingMixin, BaseModel):
     name = models.CharField(max_length=255)
     address = models.CharField(max_length=255, blank=True)
     latitude = models.FloatField(blank=True, null=True)
@@ -67,9 +74,11 @@ class Clinic(BaseModel):
     license_number = models.CharField(max_length=255, blank=True, null=True)
     license_expiry_date = models.DateField(blank=True, null=True)
     license_image = models.ImageField(upload_to='license_images/', blank=True, null=True)
+    license_image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owned_clinics')
     description = models.TextField(blank=True, null=True)
     icon = models.ImageField(upload_to='clinic_icons/', blank=True, null=True)
+    icon_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     privacy = models.BooleanField(default=False)
     reservation_open = models.BooleanField(default=True)
     active = models.BooleanField(default=False)
@@ -84,10 +93,7 @@ class Clinic(BaseModel):
         verbose_name = "Clinic"
         verbose_name_plural = "Clinics"
 
-    # def save(self, *args, **kwargs):
-    #     if self.address and not self.geolocation:
-    #         self.geolocation = GeolocationService.fetch_coordinates(self.address)
-    #     super().save(*args, **kwargs)
+    # latitude/longitude are filled in after save by apps.geocoding
     def __str__(self):
         return f"Clinic: {self.name} ({self.owner})"
 
@@ -99,6 +105,10 @@ class ClinicDoctor(BaseModel):
 
     class Meta:
         unique_together = ('clinic', 'doctor')
+        indexes = [
+            # Keyset pagination of a clinic's doctors by join date
+            models.Index(fields=['clinic', 'joined_at', 'id'], name='idx_clinic_doctors_joined_at'),
+        ]
         verbose_name = "Clinic-Doctor Relationship"
         verbose_name_plural = "Clinic-Doctor Relationships"
 
@@ -108,7 +118,7 @@ class ClinicDoctor(BaseModel):
 # ---------------------------------------------
 # Branches for Clinics
 # ---------------------------------------------
-class Branch(models.Model):
+class Branch(AddressTrackingMixin, models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     clinic = models.ForeignKey(Clinic, on_delete=models.CASCADE, related_name='branches')
     name = models.CharField(max_length=255)
@@ -119,11 +129,7 @@ class Branch(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    # Uncomment if you'd like automatic geolocation fetch:
-    # def save(self, *args, **kwargs):
-    #     if self.address and not self.geolocation:
-    #         self.geolocation = GeolocationService.fetch_coordinates(self.address)
-    #     super().save(*args, **kwargs)
+    # geolocation is filled in after save by apps.geocoding
 
     class Meta:
         indexes = [
@@ -168,10 +174,21 @@ class Reservation(BaseModel):
             models.Index(fields=['patient'], name='idx_reservations_patient_id'),
             models.Index(fields=['clinic'], name='idx_reservations_clinic_id'),
             models.Index(fields=['doctor'], name='idx_reservations_doctor_id'),
+            models.Index(fields=['reservation_date'], name='idx_reservations_date'),
+            models.Index(fields=['updated_at'], name='idx_reservations_updated_at'),
         ]
         verbose_name = "Reservation"
         verbose_name_plural = "Reservations"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so status transitions can be detected on save
+        instance._loaded_status = instance.__dict__.get('status')
+        # And the stored owners, so analytics can recompute the buckets a moved reservation left
+        instance._loaded_owners = (instance.__dict__.get('clinic_id'), instance.__dict__.get('doctor_id'))
+        return instance
+
     def save(self, *args, **kwargs):
         if not self.clinic and not self.doctor:
             raise ValidationError('A reservation must be linked to either a clinic or a doctor.')
@@ -212,6 +229,7 @@ class Review(BaseModel):
 
     class Meta:
         unique_together = ('clinic', 'patient')
+        indexes = [models.Index(fields=['updated_at'], name='idx_reviews_updated_at')]
         verbose_name = "Review"
         verbose_name_plural = "Reviews"
 
@@ -247,6 +265,54 @@ class Post(BaseModel):
     def __str__(self):
         return f"Post '{self.title}' by {self.doctor.user.get_full_name()}"
 
+# Resumable chunked uploads of post videos (see booking_app/video_uploads.py)
+class VideoUpload(BaseModel):
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='video_uploads')
+    post = models.ForeignKey(Post, on_delete=models.SET_NULL, null=True, blank=True, related_name='video_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    chunk_size = models.PositiveIntegerField()
+    # Storage name of the assembled video
+    file_name = models.CharField(max_length=255)
+    status = models.CharField(max_length=10, choices=VideoUploadStatus.choices, default=VideoUploadStatus.UPLOADING)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='idx_video_uploads_status'),
+        ]
+        verbose_name = "Video Upload"
+        verbose_name_plural = "Video Uploads"
+
+    @property
+    def total_chunks(self):
+        return max(1, -(-self.size // self.chunk_size))
+
+    def chunk_length(self, index):
+        return min(self.chunk_size, self.size - index * self.chunk_size)
+
+    def __str__(self):
+        return f"Upload of '{self.filename}' ({self.status})"
+
+
+class VideoUploadChunk(models.Model):
+    upload = models.ForeignKey(VideoUpload, on_delete=models.CASCADE, related_name='chunks')
+    index = models.PositiveIntegerField()
+    checksum = models.CharField(max_length=80)
+    # Storage object holding the chunk; empty when written into the final file
+    name = models.CharField(max_length=255, blank=True)
+    received_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['upload', 'index'], name='unique_video_upload_chunk'),
+        ]
+        verbose_name = "Video Upload Chunk"
+        verbose_name_plural = "Video Upload Chunks"
+
+    def __str__(self):
+        return f"Chunk {self.index} of {self.upload_id}"
+
 # class Video(BaseModel):
 #     post = models.OneToOneField(Post, on_delete=models.CASCADE)
 #     video_file = models.FileField(upload_to='videos/',blank=True, null=True)
@@ -326,6 +392,8 @@ class Payment(BaseModel):
     class Meta:
         indexes = [
             models.Index(fields=['user'], name='idx_payments_user_id'),
+            models.Index(fields=['created_at'], name='idx_payments_created_at'),
+            models.Index(fields=['updated_at'], name='idx_payments_updated_at'),
         ]
 
     def clean(self):
@@ -354,6 +422,16 @@ class Notification(BaseModel):
     message = models.TextField()
     is_read = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='idx_notifications_created_at'),
+            models.Index(
+                fields=['user', 'created_at'],
+                condition=models.Q(is_read=False),
+                name='idx_notifications_unread',
+            ),
+        ]
+
     def __str__(self):
         return f"Notification for {self.user}"
 
@@ -403,4 +481,138 @@ class UsersAudit(BaseModel):
     changed_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"Audit for {self.user} at {self.changed_at}"
\ No newline at end of file
+        return f"Audit for {self.user} at {self.changed_at}"
+
+
+# ---------------------------------------------
+# Archives
+# ---------------------------------------------
+class ArchiveBaseModel(models.Model):
+    # Archived rows keep their original primary key and a full JSON snapshot.
+    # Ownership columns are plain UUIDs so archives never hold FKs into hot tables.
+    id = models.UUIDField(primary_key=True, editable=False)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    data = models.JSONField()
+
+    class Meta:
+        abstract = True
+
+
+class ArchivedReservation(ArchiveBaseModel):
+    patient_id = models.UUIDField(null=True, blank=True)
+    clinic_id = models.UUIDField(null=True, blank=True)
+    doctor_id = models.UUIDField(null=True, blank=True)
+    reservation_date = models.DateField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['patient_id', 'created_at'], name='idx_arch_res_patient'),
+            models.Index(fields=['clinic_id', 'created_at'], name='idx_arch_res_clinic'),
+            models.Index(fields=['doctor_id', 'created_at'], name='idx_arch_res_doctor'),
+        ]
+        verbose_name = "Archived Reservation"
+        verbose_name_plural = "Archived Reservations"
+
+    def __str__(self):
+        return f"Archived reservation {self.id} on {self.reservation_date}"
+
+
+class ArchivedNotification(ArchiveBaseModel):
+    user_id = models.UUIDField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user_id', 'created_at'], name='idx_arch_notif_user'),
+        ]
+        verbose_name = "Archived Notification"
+        verbose_name_plural = "Archived Notifications"
+
+    def __str__(self):
+        return f"Archived notification {self.id}"
+
+
+class ArchivedPayment(ArchiveBaseModel):
+    user_id = models.UUIDField()
+    reservation_id = models.UUIDField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user_id', 'created_at'], name='idx_arch_pay_user'),
+            models.Index(fields=['reservation_id'], name='idx_arch_pay_reservation'),
+        ]
+        verbose_name = "Archived Payment"
+        verbose_name_plural = "Archived Payments"
+
+    def __str__(self):
+        return f"Archived payment {self.id}"
+
+
+# ---------------------------------------------
+# Analytics Rollups
+# ---------------------------------------------
+class ClinicDailyStats(models.Model):
+    clinic = models.ForeignKey(Clinic, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    bookings = models.PositiveIntegerField(default=0)
+    approved = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+    payments = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    reviews = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['clinic', 'date'], name='unique_clinic_daily_stats'),
+        ]
+        verbose_name = "Clinic Daily Stats"
+        verbose_name_plural = "Clinic Daily Stats"
+
+    def __str__(self):
+        return f"Stats for {self.clinic_id} on {self.date}"
+
+
+class DoctorDailyStats(models.Model):
+    clinic = models.ForeignKey(Clinic, on_delete=models.CASCADE, related_name='doctor_daily_stats')
+    doctor = models.ForeignKey(Doctor, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    bookings = models.PositiveIntegerField(default=0)
+    approved = models.PositiveIntegerField(default=0)
+    rejected = models.PositiveIntegerField(default=0)
+    cancelled = models.PositiveIntegerField(default=0)
+    payments = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['clinic', 'doctor', 'date'], name='unique_doctor_daily_stats'),
+        ]
+        verbose_name = "Doctor Daily Stats"
+        verbose_name_plural = "Doctor Daily Stats"
+
+    def __str__(self):
+        return f"Stats for {self.doctor_id} at {self.clinic_id} on {self.date}"
+
+
+class RollupCheckpoint(models.Model):
+    # High-water mark on source ``updated_at``; only rows changed after it are re-read
+    name = models.CharField(max_length=50, primary_key=True)
+    high_water_mark = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.high_water_mark}"
+
+
+class RollupStaleBucket(models.Model):
+    # Bucket that rows left (deleted or moved away), so updated_at cannot reveal it.
+    # Plain ids: the clinic or doctor may be deleted in the same transaction.
+    clinic_id = models.UUIDField()
+    doctor_id = models.UUIDField(null=True, blank=True)
+    date = models.DateField()
+
+    def __str__(self):
+        return f"Stale stats for {self.clinic_id} on {self.date}"
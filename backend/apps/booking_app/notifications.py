@@ -0,0 +1,58 @@
+# backend/booking_app/notifications.py
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import now
+
+from apps.booking_app.models import Notification
+from apps.monitoring.metrics import record_cache_access
+
+UNREAD_COUNT_KEY = 'notifications:unread:{user_id}'
+
+
+def _unread_key(user_id):
+    return UNREAD_COUNT_KEY.format(user_id=user_id)
+
+
+def reconcile_unread_count(user_id):
+    """Recount unread notifications from the database and refresh the cached counter."""
+    count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+    cache.set(_unread_key(user_id), count, settings.NOTIFICATION_UNREAD_COUNT_TIMEOUT)
+    return count
+
+
+def get_unread_count(user_id):
+    count = cache.get(_unread_key(user_id))
+    if count is None or count < 0:
+        record_cache_access('notification_unread_count', hit=False)
+        return reconcile_unread_count(user_id)
+    record_cache_access('notification_unread_count', hit=True)
+    return count
+
+
+def adjust_unread_count(user_id, delta):
+    # The counter expires on its own, so any drift is bounded by the timeout.
+    # A missing key is left alone and rebuilt from the database on the next read.
+    if not delta:
+        return
+    try:
+        cache.incr(_unread_key(user_id), delta)
+    except ValueError:
+        pass
+
+
+def invalidate_unread_count(user_id):
+    cache.delete(_unread_key(user_id))
+
+
+def mark_as_read(user, ids=None):
+    """
+    Mark all (or only the given) unread notifications of ``user`` as read with
+    a single UPDATE and return the number of rows changed.
+    """
+    queryset = Notification.objects.filter(user=user, is_read=False)
+    if ids is not None:
+        queryset = queryset.filter(id__in=ids)
+    updated = queryset.update(is_read=True, updated_at=now())
+    adjust_unread_count(user.id, -updated)
+    return updated
@@ -0,0 +1,273 @@
+# backend/booking_app/onboarding.py
+
+import csv
+import io
+import itertools
+import logging
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from openpyxl import load_workbook
+
+from apps.authentication.models import User, Doctor, Specialization
+from apps.authentication.services import bulk_create_users
+from apps.booking_app.clinic_cache import bump_clinic_cache_version
+from apps.booking_app.models import Tag, Clinic, ClinicDoctor, Branch, BranchDoctor
+from apps.geocoding.service import request_geocoding_bulk
+
+logger = logging.getLogger(__name__)
+
+ONBOARDING_CHUNK_SIZE = 500
+
+ONBOARDING_COLUMNS = [
+    'clinic_name', 'clinic_address', 'clinic_specialization', 'clinic_tags',
+    'branch_name', 'branch_address',
+    'doctor_email', 'doctor_first_name', 'doctor_last_name', 'doctor_specialization', 'doctor_license_number',
+]
+REQUIRED_COLUMNS = ['clinic_name', 'doctor_email']
+LOAD_COUNTERS = ['users', 'doctors', 'clinics', 'branches', 'clinic_doctor_links', 'branch_doctor_links']
+
+
+class OnboardingFileError(Exception):
+    pass
+
+
+def read_rows(upload):
+    """Yield one dict per data row of a CSV or XLSX upload without loading it all."""
+    name = (upload.name or '').lower()
+    if name.endswith('.xlsx'):
+        sheet = load_workbook(upload, read_only=True, data_only=True).active
+        rows = sheet.iter_rows(values_only=True)
+        header = [str(cell or '').strip() for cell in next(rows, [])]
+        records = (dict(zip(header, row)) for row in rows)
+    else:
+        records = csv.DictReader(io.TextIOWrapper(upload.file, encoding='utf-8-sig'))
+        header = records.fieldnames or []
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise OnboardingFileError(f"Missing required columns: {', '.join(missing)}.")
+
+    for record in records:
+        yield {column: str(record.get(column) or '').strip() for column in ONBOARDING_COLUMNS}
+
+
+def validate_row(row):
+    errors = {}
+    for column in REQUIRED_COLUMNS:
+        if not row[column]:
+            errors[column] = 'This field is required.'
+    if row['doctor_email']:
+        try:
+            validate_email(row['doctor_email'])
+        except ValidationError:
+            errors['doctor_email'] = 'Enter a valid email address.'
+        row['doctor_email'] = User.objects.normalize_email(row['doctor_email'])
+    if row['branch_address'] and not row['branch_name']:
+        errors['branch_name'] = 'A branch address needs a branch name.'
+    return errors
+
+
+def _get_or_create_by_name(model, names, field='name'):
+    """Resolve a batch of names to instances with two queries and one bulk insert."""
+    names = {name for name in names if name}
+    if not names:
+        return {}
+    existing = {getattr(obj, field): obj for obj in model.objects.filter(**{f'{field}__in': names})}
+    missing = names - existing.keys()
+    if missing:
+        model.objects.bulk_create([model(**{field: name}) for name in missing], ignore_conflicts=True)
+        existing.update((getattr(obj, field), obj) for obj in model.objects.filter(**{f'{field}__in': missing}))
+    return existing
+
+
+def load_chunk(rows, owner):
+    """Load one validated chunk of rows; every step is a single bulk statement."""
+    counts = dict.fromkeys(LOAD_COUNTERS, 0)
+
+    specializations = _get_or_create_by_name(
+        Specialization, itertools.chain.from_iterable((row['clinic_specialization'], row['doctor_specialization']) for row in rows)
+    )
+    tags = _get_or_create_by_name(
+        Tag, (tag.strip() for row in rows for tag in row['clinic_tags'].split(';'))
+    )
+
+    # Doctor users, with their profile rows created in bulk. Rows naming other
+    # accounts were rejected already, so the doctors found here work at the
+    # clinic; if another account appeared since, its insert fails.
+    users = {
+        user.email: user
+        for user in User.objects.filter(email__in={row['doctor_email'] for row in rows}, role='doctor')
+    }
+    new_users = {}
+    for row in rows:
+        if row['doctor_email'] not in users and row['doctor_email'] not in new_users:
+            new_users[row['doctor_email']] = {
+                'email': row['doctor_email'],
+                'first_name': row['doctor_first_name'][:30] or None,
+                'last_name': row['doctor_last_name'][:30] or None,
+                'role': 'doctor',
+            }
+    for user in bulk_create_users(new_users.values()):
+        users[user.email] = user
+    counts['users'] = len(new_users)
+
+    doctors = {doctor.user_id: doctor for doctor in Doctor.objects.filter(user__in=users.values())}
+    new_doctors = {}
+    for row in rows:
+        user = users[row['doctor_email']]
+        if user.id not in doctors and user.id not in new_doctors:
+            specialization = specializations.get(row['doctor_specialization'])
+            new_doctors[user.id] = Doctor(
+                user=user, specialization=specialization, license_number=row['doctor_license_number'] or None
+            )
+    Doctor.objects.bulk_create(new_doctors.values())
+    doctors.update(new_doctors)
+    counts['doctors'] = len(new_doctors)
+
+    clinics = {clinic.name: clinic for clinic in Clinic.objects.filter(owner=owner, name__in={row['clinic_name'] for row in rows})}
+    new_clinics = {}
+    for row in rows:
+        if row['clinic_name'] not in clinics and row['clinic_name'] not in new_clinics:
+            new_clinics[row['clinic_name']] = Clinic(
+                name=row['clinic_name'], address=row['clinic_address'], owner=owner,
+                specialization=specializations.get(row['clinic_specialization']),
+            )
+    # bulk_create skips ClinicViewSet.perform_create, so check its rule here
+    if new_clinics and (len(new_clinics) > 1 or Clinic.objects.filter(owner=owner).exists()):
+        raise OnboardingFileError("You already own a clinic.")
+    Clinic.objects.bulk_create(new_clinics.values())
+    clinics.update(new_clinics)
+    counts['clinics'] = len(new_clinics)
+
+    clinic_tag_pairs = {
+        (clinics[row['clinic_name']].id, tags[tag.strip()].id)
+        for row in rows for tag in row['clinic_tags'].split(';') if tag.strip()
+    }
+    Clinic.tags.through.objects.bulk_create(
+        [Clinic.tags.through(clinic_id=clinic_id, tag_id=tag_id) for clinic_id, tag_id in clinic_tag_pairs],
+        ignore_conflicts=True,
+    )
+
+    clinic_doctor_pairs = {(clinics[row['clinic_name']].id, users[row['doctor_email']].id) for row in rows}
+    ClinicDoctor.objects.bulk_create(
+        [ClinicDoctor(clinic_id=clinic_id, doctor_id=doctor_id) for clinic_id, doctor_id in clinic_doctor_pairs],
+        ignore_conflicts=True,
+    )
+    counts['clinic_doctor_links'] = len(clinic_doctor_pairs)
+
+    branch_keys = {(clinics[row['clinic_name']].id, row['branch_name']) for row in rows if row['branch_name']}
+    branches = {
+        (branch.clinic_id, branch.name): branch
+        for branch in Branch.objects.filter(
+            clinic_id__in={clinic_id for clinic_id, _ in branch_keys}, name__in={name for _, name in branch_keys}
+        )
+    }
+    new_branches = {}
+    for row in rows:
+        key = (clinics[row['clinic_name']].id, row['branch_name'])
+        if row['branch_name'] and key not in branches and key not in new_branches:
+            new_branches[key] = Branch(clinic_id=key[0], name=row['branch_name'], address=row['branch_address'])
+    Branch.objects.bulk_create(new_branches.values())
+    branches.update(new_branches)
+    counts['branches'] = len(new_branches)
+
+    branch_doctor_pairs = {
+        (branches[(clinics[row['clinic_name']].id, row['branch_name'])].id, users[row['doctor_email']].id)
+        for row in rows if row['branch_name']
+    }
+    BranchDoctor.objects.bulk_create(
+        [BranchDoctor(branch_id=branch_id, doctor_id=doctor_id) for branch_id, doctor_id in branch_doctor_pairs],
+        ignore_conflicts=True,
+    )
+    counts['branch_doctor_links'] = len(branch_doctor_pairs)
+
+    # bulk_create sends no post_save, so queue the new addresses for geocoding
+    # and retire cached clinic responses here
+    if settings.GEOCODING_ENABLED:
+        request_geocoding_bulk([*new_clinics.values(), *new_branches.values()])
+    transaction.on_commit(bump_clinic_cache_version)
+    return counts
+
+
+def check_accounts(chunk, report, owner):
+    """
+    Drop rows whose email belongs to an existing account, unless it is a
+    doctor already working at the owner's clinic. An import must not attach
+    someone else's doctor account to a clinic without their consent.
+    """
+    emails = {row['doctor_email'] for _, row in chunk}
+    roles = dict(User.objects.filter(email__in=emails).values_list('email', 'role'))
+    linked = set(
+        ClinicDoctor.objects.filter(clinic__owner=owner, doctor__user__email__in=emails)
+        .values_list('doctor__user__email', flat=True)
+    )
+    accepted = []
+    for number, row in chunk:
+        role = roles.get(row['doctor_email'])
+        if role is not None and role != 'doctor':
+            report['errors'].append(
+                {'row': number, 'errors': {'doctor_email': 'This email belongs to an account that is not a doctor.'}}
+            )
+            continue
+        if role == 'doctor' and row['doctor_email'] not in linked:
+            report['errors'].append(
+                {'row': number, 'errors': {'doctor_email': 'This email belongs to an existing doctor account.'}}
+            )
+            continue
+        accepted.append((number, row))
+    return accepted
+
+
+def import_onboarding_file(upload, owner, dry_run=False):
+    """
+    Validate the upload row by row and load valid rows in chunks, one
+    transaction per chunk. Returns counts and per-row errors (1-based
+    data rows).
+    """
+    report = {
+        'rows': 0,
+        'valid': 0,
+        'imported': 0,
+        'counts': dict.fromkeys(LOAD_COUNTERS, 0),
+        'errors': [],
+    }
+    # An owner has one clinic: the one they own already, or else the first one named
+    owned = set(Clinic.objects.filter(owner=owner).values_list('name', flat=True))
+
+    def flush(chunk):
+        chunk = check_accounts(chunk, report, owner) if chunk else chunk
+        report['valid'] += len(chunk)
+        if not chunk or dry_run:
+            return
+        try:
+            with transaction.atomic():
+                counts = load_chunk([row for _, row in chunk], owner)
+        except Exception as e:
+            logger.error(f"Onboarding chunk starting at row {chunk[0][0]} failed: {str(e)}")
+            report['errors'].extend({'row': number, 'errors': {'non_field_errors': str(e)}} for number, _ in chunk)
+            return
+        report['imported'] += len(chunk)
+        for key, value in counts.items():
+            report['counts'][key] += value
+
+    chunk = []
+    for number, row in enumerate(read_rows(upload), start=1):
+        report['rows'] += 1
+        errors = validate_row(row)
+        if not errors and row['clinic_name'] not in owned:
+            if owned:
+                errors['clinic_name'] = 'You already own a clinic.'
+            else:
+                owned.add(row['clinic_name'])
+        if errors:
+            report['errors'].append({'row': number, 'errors': errors})
+            continue
+        chunk.append((number, row))
+        if len(chunk) >= ONBOARDING_CHUNK_SIZE:
+            flush(chunk)
+            chunk = []
+    flush(chunk)
+    return report
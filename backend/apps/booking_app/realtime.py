@@ -0,0 +1,59 @@
+# backend/booking_app/realtime.py
+
+import logging
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def user_group_name(user_id):
+    return f"user.{user_id}"
+
+
+def publish_to_user(user_id, payload):
+    """Push ``payload`` to every open connection of ``user_id`` once the transaction commits."""
+    def send():
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(
+                user_group_name(user_id), {'type': 'user.event', 'payload': payload}
+            )
+        except Exception as e:
+            logger.error(f"Error publishing event to User {user_id}: {str(e)}")
+
+    transaction.on_commit(send)
+
+
+def notification_payload(notification):
+    return {
+        'type': 'notification',
+        'id': str(notification.id),
+        'message': notification.message,
+        'is_read': notification.is_read,
+        'created_at': notification.created_at.isoformat(),
+    }
+
+
+def reservation_status_payload(reservation, previous_status):
+    return {
+        'type': 'reservation.status',
+        'id': str(reservation.id),
+        'status': reservation.status,
+        'previous_status': previous_status,
+        'reservation_date': str(reservation.reservation_date),
+        'reservation_time': str(reservation.reservation_time),
+    }
+
+
+def reservation_recipients(reservation):
+    # Patient and Doctor rows use the user id as their primary key
+    recipients = {reservation.patient_id, reservation.doctor_id}
+    if reservation.clinic_id:
+        recipients.add(reservation.clinic.owner_id)
+    recipients.discard(None)
+    return recipients
@@ -0,0 +1,9 @@
+# backend/booking_app/routing.py
+
+from django.urls import path
+
+from apps.booking_app.consumers import UserEventsConsumer
+
+websocket_urlpatterns = [
+    path('ws/events/', UserEventsConsumer.as_asgi()),
+]
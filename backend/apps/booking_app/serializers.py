@@ -1,35 +1,61 @@
 # backend/booking_app/serializers.py
 
+from django.conf import settings
 from rest_framework import serializers
+from core.dynamic_fields import DynamicFieldsMixin
+from apps.images.fields import DerivativeImageField
+from core.media import SignedFileField
 from apps.booking_app.models import (
-    Clinic,
+    Clinic, ClinicDoctor,
     Reservation,
     ReservationStatus, Review, Post,
     Comment, Like, Category, Subscription, PaymentMethod,
     Payment, Notification, EventSchedule, AdvertisingCampaign,
-    UsersAudit,Tag
+    UsersAudit,Tag, ArchivedReservation, ArchivedNotification, ArchivedPayment,
+    VideoUpload
 )
 
 from apps.authentication.serializers import DoctorSerializer, UserSerializer,PatientSerializer,SpecializationSerializer
 
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Tag
         fields = ['name']
         read_only_fields = ['id', 'created_at']
 
+# A few doctors shown on the clinic itself; the full list is /clinics/<id>/doctors/
+class DoctorPreviewSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    id = serializers.ReadOnlyField(source='doctor_id')
+    first_name = serializers.CharField(source='doctor.user.first_name', read_only=True)
+    last_name = serializers.CharField(source='doctor.user.last_name', read_only=True)
+    specialization = serializers.CharField(source='doctor.specialization.name', read_only=True, default=None)
+
+    class Meta:
+        model = ClinicDoctor
+        fields = ['id', 'first_name', 'last_name', 'specialization', 'joined_at']
+
 # Clinic Serializer
-class ClinicSerializer(serializers.ModelSerializer):
+class ClinicSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     owner = UserSerializer()
-    doctors = DoctorSerializer(many=True)
+    doctor_count = serializers.IntegerField(read_only=True)
+    doctors_preview = DoctorPreviewSerializer(many=True, read_only=True, source='doctor_preview')
     specialization = SpecializationSerializer()
+    icon = DerivativeImageField(required=False, allow_null=True)
     class Meta:
         model = Clinic
-        fields = ['id','name', 'address','doctors','icon','owner','specialization', 'description','reservation_open','privacy','active','license_number','license_expiry_date','created_at', 'updated_at']
-        write_only_fields= ['id','owner','doctors']
+        fields = ['id','name', 'address','doctor_count','doctors_preview','icon','owner','specialization', 'description','reservation_open','privacy','active','license_number','license_expiry_date','created_at', 'updated_at']
+        write_only_fields= ['id','owner']
+
+# Doctors of one clinic, with their join date
+class ClinicDoctorSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    doctor = DoctorSerializer(read_only=True)
+
+    class Meta:
+        model = ClinicDoctor
+        fields = ['doctor', 'joined_at']
 
 
-class ReservationSerializer(serializers.ModelSerializer):
+class ReservationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     patient = PatientSerializer(read_only=True)
 
     class Meta:
@@ -48,7 +74,7 @@ class ReservationSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 # Review Serializer
-class ReviewSerializer(serializers.ModelSerializer):
+class ReviewSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = ['clinic', 'rating', 'review_text']
@@ -79,8 +105,9 @@ class ReviewSerializer(serializers.ModelSerializer):
 #         return attrs
 
 # Post Serializer
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     doctor = DoctorSerializer(read_only=True)
+    video_file = SignedFileField(required=False, allow_null=True)
     likes_count = serializers.IntegerField(read_only=True)
     comments_count = serializers.IntegerField(read_only=True)
 
@@ -100,8 +127,31 @@ class PostSerializer(serializers.ModelSerializer):
         validated_data['doctor'] = user.doctor
         return super().create(validated_data)
 
+# Chunked video upload session; the chunks themselves are sent as raw request bodies
+class VideoUploadSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    total_chunks = serializers.IntegerField(read_only=True)
+    received_chunks = serializers.SerializerMethodField()
+
+    class Meta:
+        model = VideoUpload
+        fields = ['id', 'post', 'filename', 'size', 'chunk_size', 'total_chunks', 'received_chunks', 'status', 'created_at', 'completed_at']
+        read_only_fields = ['id', 'chunk_size', 'status', 'created_at', 'completed_at']
+
+    def get_received_chunks(self, obj):
+        return sorted(obj.chunks.values_list('index', flat=True))
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.VIDEO_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Size must be between 1 and {settings.VIDEO_UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+    def validate_post(self, value):
+        if value is not None and value.doctor_id != self.context['request'].user.id:
+            raise serializers.ValidationError("You can only upload videos to your own posts.")
+        return value
+
 # Comment Serializer
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Comment
         fields = ['post',  'comment_text', 'parent_comment']
@@ -109,33 +159,33 @@ class CommentSerializer(serializers.ModelSerializer):
         
 
 # Like Serializer
-class LikeSerializer(serializers.ModelSerializer):
+class LikeSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     class Meta:
         model = Like
         fields = ['id', 'post','user', 'created_at', 'updated_at']
 
 # Category Serializer
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'description']
 
 # Subscription Serializer
-class SubscriptionSerializer(serializers.ModelSerializer):
+class SubscriptionSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Subscription
         fields = [ 'category', 'status', 'payment']
         read_only_fields = ['id','user', 'created_at', 'updated_at']
 
 # PaymentMethod Serializer
-class PaymentMethodSerializer(serializers.ModelSerializer):
+class PaymentMethodSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = PaymentMethod
         fields = ['id', 'method_name']
 
 # Payment Serializer
-class PaymentSerializer(serializers.ModelSerializer):
+class PaymentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     subscription = SubscriptionSerializer()
     reservation = ReservationSerializer()
     method = PaymentMethodSerializer()
@@ -151,13 +201,14 @@ class PaymentSerializer(serializers.ModelSerializer):
         return attrs
 
 # Notification Serializer
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ['id', 'user', 'message', 'is_read', 'created_at']
+        read_only_fields = ['id', 'user', 'created_at']
 
 # EventSchedule Serializer
-class EventScheduleSerializer(serializers.ModelSerializer):
+class EventScheduleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = EventSchedule
         fields = ['id', 'clinic', 'doctor', 'event_name', 'start_time', 'end_time', 'description']
@@ -168,7 +219,7 @@ class EventScheduleSerializer(serializers.ModelSerializer):
         return attrs
 
 # AdvertisingCampaign Serializer
-class AdvertisingCampaignSerializer(serializers.ModelSerializer):
+class AdvertisingCampaignSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = AdvertisingCampaign
         fields = ['id', 'clinic', 'campaign_name', 'start_date', 'end_date', 'budget', 'status']
@@ -179,7 +230,23 @@ class AdvertisingCampaignSerializer(serializers.ModelSerializer):
         return attrs
 
 # UsersAudit Serializer
-class UsersAuditSerializer(serializers.ModelSerializer):
+class UsersAuditSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = UsersAudit
         fields = ['id', 'user', 'changed_data', 'changed_at']
+
+# Archive Serializers
+class ArchivedReservationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedReservation
+        fields = ['id', 'patient_id', 'clinic_id', 'doctor_id', 'reservation_date', 'created_at', 'archived_at', 'data']
+
+class ArchivedNotificationSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedNotification
+        fields = ['id', 'user_id', 'created_at', 'archived_at', 'data']
+
+class ArchivedPaymentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedPayment
+        fields = ['id', 'user_id', 'reservation_id', 'created_at', 'archived_at', 'data']
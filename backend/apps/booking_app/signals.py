@@ -0,0 +1,95 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from apps.authentication.models import User, UserProfile, Doctor, Specialization
+from apps.booking_app.models import Notification, Reservation, Clinic, ClinicDoctor, Payment, Review
+from apps.booking_app.analytics import mark_stale, mark_reservation_stale
+from apps.booking_app.clinic_cache import bump_clinic_cache_version
+from apps.booking_app.notifications import adjust_unread_count, invalidate_unread_count
+from apps.booking_app.realtime import (
+    publish_to_user, notification_payload, reservation_status_payload, reservation_recipients
+)
+
+# Keep the cached unread counter in step with new and removed notifications
+@receiver(post_save, sender=Notification)
+def update_unread_count_on_save(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        transaction.on_commit(lambda: adjust_unread_count(instance.user_id, 1))
+
+@receiver(post_delete, sender=Notification)
+def update_unread_count_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_unread_count(instance.user_id))
+
+# Push new notifications to the user's open connections
+@receiver(post_save, sender=Notification)
+def publish_notification(sender, instance, created, **kwargs):
+    if created:
+        publish_to_user(instance.user_id, notification_payload(instance))
+
+# Push reservation status transitions (including new bookings) to everyone involved
+@receiver(post_save, sender=Reservation)
+def publish_reservation_status(sender, instance, created, **kwargs):
+    previous_status = None if created else getattr(instance, '_loaded_status', None)
+    if not created and previous_status == instance.status:
+        return
+    instance._loaded_status = instance.status
+    payload = reservation_status_payload(instance, previous_status)
+    for user_id in reservation_recipients(instance):
+        publish_to_user(user_id, payload)
+
+# Retire cached clinic responses whenever a clinic, its doctor list or a specialization changes
+@receiver(post_save, sender=Clinic)
+@receiver(post_delete, sender=Clinic)
+@receiver(post_save, sender=ClinicDoctor)
+@receiver(post_delete, sender=ClinicDoctor)
+@receiver(post_save, sender=Specialization)
+@receiver(post_delete, sender=Specialization)
+def invalidate_clinic_cache(sender, **kwargs):
+    transaction.on_commit(bump_clinic_cache_version)
+
+def _in_clinic_payload(user_id):
+    """True if cached clinic responses show this user, as an owner or one of the doctors."""
+    return (
+        Clinic.objects.filter(owner_id=user_id).exists()
+        or ClinicDoctor.objects.filter(doctor_id=user_id).exists()
+    )
+
+# Owners and doctors are rendered inside clinic responses too. Deleting them
+# cascades to Clinic/ClinicDoctor rows, which are handled above.
+@receiver(post_save, sender=User)
+def invalidate_clinic_cache_for_user(sender, instance, **kwargs):
+    if instance.role in ('clinic', 'doctor') and _in_clinic_payload(instance.pk):
+        transaction.on_commit(bump_clinic_cache_version)
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_save, sender=Doctor)
+def invalidate_clinic_cache_for_profile(sender, instance, **kwargs):
+    if _in_clinic_payload(instance.user_id):
+        transaction.on_commit(bump_clinic_cache_version)
+
+# Rows leaving a rollup bucket do not show up by updated_at; queue those buckets.
+# Reservations use pre_delete: their payments are detached before post_delete.
+@receiver(pre_delete, sender=Reservation)
+def mark_deleted_reservation_stale(sender, instance, **kwargs):
+    mark_reservation_stale(instance, instance.clinic_id, instance.doctor_id)
+
+@receiver(post_save, sender=Reservation)
+def mark_moved_reservation_stale(sender, instance, created, **kwargs):
+    loaded = None if created else getattr(instance, '_loaded_owners', None)
+    owners = (instance.clinic_id, instance.doctor_id)
+    if loaded is None or loaded == owners:
+        return
+    instance._loaded_owners = owners
+    # Its payments are not updated, so their buckets on both sides are queued too
+    mark_reservation_stale(instance, *loaded)
+    mark_reservation_stale(instance, *owners)
+
+@receiver(post_delete, sender=Payment)
+def mark_deleted_payment_stale(sender, instance, **kwargs):
+    owners = Reservation.objects.filter(pk=instance.related_object_id).values_list('clinic_id', 'doctor_id').first()
+    if owners is not None:
+        mark_stale(*owners, [instance.created_at])
+
+@receiver(post_delete, sender=Review)
+def mark_deleted_review_stale(sender, instance, **kwargs):
+    mark_stale(instance.clinic_id, None, [instance.created_at])
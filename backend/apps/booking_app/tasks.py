@@ -14,7 +14,7 @@ TWILIO_FROM_NUMBER = settings.TWILIO_FROM_NUMBER
 
 twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
 
-@shared_task(bind=True, max_retries=3)
+@shared_task(bind=True, max_retries=3, ignore_result=True)
 def send_sms_notification(self, user_id, message):
     from .models import User
     import logging
@@ -40,7 +40,8 @@ def send_sms_notification(self, user_id, message):
 
 
 
-@shared_task(bind=True, max_retries=3)
+# Acknowledged only after it ran, so a worker lost mid-task hands the event back to the queue
+@shared_task(bind=True, max_retries=3, ignore_result=True, acks_late=True, reject_on_worker_lost=True)
 def process_payment_webhook(self, event_data):
     import logging
     logger = logging.getLogger(__name__)
@@ -64,7 +65,7 @@ def process_payment_webhook(self, event_data):
         self.retry(exc=e, countdown=60)
 
 
-@shared_task
+@shared_task(ignore_result=True)
 def send_email_notification(user_email, subject, message):
     send_mail(
         subject,
@@ -73,3 +74,52 @@ def send_email_notification(user_email, subject, message):
         [user_email],
         fail_silently=False,
     )
+
+
+@shared_task(ignore_result=True)
+def archive_old_records(max_batches=None):
+    import logging
+    from apps.booking_app.archival import archive_records
+    logger = logging.getLogger(__name__)
+    results = archive_records(max_batches=max_batches)
+    logger.info(f"Archival run finished: {results}")
+    return results
+
+
+@shared_task(ignore_result=True)
+def update_analytics_rollups(full=False):
+    import logging
+    from apps.booking_app.analytics import update_rollups
+    logger = logging.getLogger(__name__)
+    results = update_rollups(full=full)
+    logger.info(f"Analytics rollup run finished: {results}")
+    return results
+
+
+@shared_task(bind=True, max_retries=3, ignore_result=True)
+def assemble_video_upload(self, upload_id):
+    import logging
+    from apps.booking_app.models import VideoUpload, VideoUploadStatus
+    from apps.booking_app.video_uploads import assemble_upload
+    logger = logging.getLogger(__name__)
+    try:
+        upload = assemble_upload(upload_id)
+    except OSError as e:
+        if self.request.retries >= self.max_retries:
+            VideoUpload.objects.filter(pk=upload_id).update(status=VideoUploadStatus.FAILED)
+            logger.error(f"Giving up assembling video upload {upload_id}: {str(e)}")
+            return
+        logger.error(f"Error assembling video upload {upload_id}: {str(e)}")
+        raise self.retry(exc=e, countdown=60)
+    if upload is not None:
+        logger.info(f"Assembled video upload {upload_id} into {upload.file_name}.")
+
+
+@shared_task(ignore_result=True)
+def expire_video_uploads():
+    import logging
+    from apps.booking_app.video_uploads import expire_uploads
+    logger = logging.getLogger(__name__)
+    count = expire_uploads()
+    logger.info(f"Discarded {count} expired video uploads.")
+    return count
@@ -0,0 +1,198 @@
+# backend/booking_app/tests/test_fast_serializers.py
+#
+# Parity of core.fast_serializers with DRF: for every compiled serializer the
+# output must equal ``serializer_class(instances, many=True).data`` exactly,
+# key order included, for the same rows and request.
+
+import datetime
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework import serializers
+
+from apps.authentication.models import User, UserProfile, Doctor, Specialization
+from apps.authentication.serializers import DoctorSerializer
+from apps.booking_app.models import Clinic, ClinicDoctor, Post, Reservation, Notification, VideoUpload
+from apps.booking_app.serializers import (
+    ClinicSerializer, PostSerializer, ReservationSerializer, NotificationSerializer, VideoUploadSerializer
+)
+from apps.booking_app.views import with_doctor_summary
+from core.dynamic_fields import eager_load, selection_params
+from core.fast_serializers import compile_serializer, find_mismatches, get_compiled, serialize
+
+
+class ShoutField(serializers.CharField):
+    """A custom field without fast_representation."""
+
+
+def as_json(data):
+    # Dumping both sides compares nested values and key order in one go
+    return json.dumps(data, cls=DjangoJSONEncoder)
+
+
+class FastSerializerParityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        specialization = Specialization.objects.create(name='Physiotherapy')
+        owner = User.objects.create_user(email='owner@example.com', role='clinic', first_name='Olga', last_name='Owner')
+        cls.clinic = Clinic.objects.create(
+            name='Full Clinic', owner=owner, specialization=specialization, address='1 Main Street',
+            icon='clinic_icons/full.png',
+            icon_derivatives={
+                'source': 'clinic_icons/full.png',
+                'sizes': {
+                    size: {
+                        'webp': f'clinic_icons/derivatives/full_{size}.webp',
+                        'jpeg': f'clinic_icons/derivatives/full_{size}.jpg',
+                    }
+                    for size in ('thumb', 'medium')
+                },
+            },
+        )
+        # Null specialization, no icon, no doctors
+        other_owner = User.objects.create_user(email='other@example.com', role='clinic')
+        cls.bare_clinic = Clinic.objects.create(name='Bare Clinic', owner=other_owner)
+
+        cls.doctor = Doctor.objects.create(
+            user=User.objects.create_user(email='doc@example.com', role='doctor', first_name='Dana', last_name='Doc'),
+            specialization=specialization, license_number='L-1',
+        )
+        # No specialization, and a purged user's missing profile
+        cls.purged_doctor = Doctor.objects.create(user=User.objects.create_user(email='gone@example.com', role='doctor'))
+        UserProfile.objects.filter(user=cls.purged_doctor.user).delete()
+        for doctor in (cls.doctor, cls.purged_doctor):
+            ClinicDoctor.objects.create(clinic=cls.clinic, doctor=doctor)
+
+        patient_user = User.objects.create_user(email='patient@example.com', first_name='Pat')
+        purged_patient_user = User.objects.create_user(email='purged@example.com')
+        UserProfile.objects.filter(user=purged_patient_user).delete()
+        date, time = datetime.date(2030, 1, 2), datetime.time(9, 30)
+        Reservation.objects.create(patient=patient_user.patient, clinic=cls.clinic, doctor=cls.doctor,
+                                   reservation_date=date, reservation_time=time)
+        # Null doctor, and a patient without profile
+        Reservation.objects.create(patient=purged_patient_user.patient, clinic=cls.bare_clinic,
+                                   reservation_date=date, reservation_time=time)
+        # Null clinic and null patient
+        Reservation.objects.create(doctor=cls.doctor, reservation_date=date, reservation_time=time)
+
+        Post.objects.create(doctor=cls.doctor, title='With video', video_file='videos/clip.mp4', content='Stretch.')
+        Post.objects.create(doctor=cls.purged_doctor, title='Without video')
+
+        Notification.objects.create(user=patient_user, message='Approved')
+        Notification.objects.create(user=patient_user, message='Read one', is_read=True)
+
+        VideoUpload.objects.create(doctor=cls.doctor, filename='clip.mp4', size=10, chunk_size=5, file_name='videos/x.mp4')
+
+    def request(self, **params):
+        return RequestFactory().get('/api/', params)
+
+    def assertParity(self, serializer_class, instances, request=None):
+        request = request or self.request()
+        instances = list(instances)
+        self.assertTrue(instances, "parity needs rows to compare")
+        represent = compile_serializer(serializer_class, *selection_params(request))
+        self.assertIsNotNone(represent, f"{serializer_class.__name__} should compile")
+        expected = serializer_class(instances, many=True, context={'request': request}).data
+        self.assertEqual(as_json([represent(instance, request) for instance in instances]), as_json(expected))
+        self.assertEqual(find_mismatches(serializer_class, instances, request), [])
+
+    def clinics(self, request):
+        serializer = ClinicSerializer(context={'request': request})
+        queryset = with_doctor_summary(Clinic.objects.order_by('name'), serializer)
+        return eager_load(queryset, serializer)
+
+    def posts(self):
+        return (
+            Post.objects.order_by('title')
+            .select_related('doctor__user__userprofile', 'doctor__specialization')
+            .annotate(likes_count=Count('like', distinct=True), comments_count=Count('comment', distinct=True))
+        )
+
+    def test_clinics(self):
+        request = self.request()
+        self.assertParity(ClinicSerializer, self.clinics(request), request)
+
+    def test_clinic_icon_derivatives_follow_the_request(self):
+        variants = (
+            ({}, 'full_medium.webp'),
+            ({'image_size': 'thumb'}, 'full_thumb.webp'),
+            ({'image_size': 'original'}, 'full.png'),
+            ({'image_format': 'jpeg'}, 'full_medium.jpg'),
+        )
+        for params, filename in variants:
+            with self.subTest(params=params):
+                request = self.request(**params)
+                self.assertParity(ClinicSerializer, self.clinics(request), request)
+                clinic = self.clinics(request).get(pk=self.clinic.pk)
+                self.assertTrue(compile_serializer(ClinicSerializer)(clinic, request)['icon'].endswith(filename))
+
+    def test_clinic_field_selections(self):
+        selections = (
+            {'fields': 'id,name,owner.email'},
+            {'fields': 'id,owner,specialization.name,doctors_preview.first_name'},
+            # Collapsed relations render primary keys
+            {'expand': ''},
+            {'expand': 'owner', 'fields': 'id,owner,specialization,doctors_preview'},
+            {'expand': 'doctors_preview', 'fields': 'doctors_preview,doctor_count'},
+        )
+        for params in selections:
+            with self.subTest(params=params):
+                request = self.request(**params)
+                self.assertParity(ClinicSerializer, self.clinics(request), request)
+
+    def test_doctors(self):
+        doctors = Doctor.objects.select_related('user__userprofile', 'specialization').order_by('user__email')
+        self.assertParity(DoctorSerializer, doctors)
+        self.assertParity(DoctorSerializer, doctors, self.request(expand='user', fields='user.profile,specialization'))
+
+    def test_posts(self):
+        self.assertParity(PostSerializer, self.posts())
+        self.assertParity(PostSerializer, self.posts(), self.request(fields='id,video_file,doctor.user.email'))
+        self.assertParity(PostSerializer, self.posts(), self.request(expand=''))
+
+    def test_post_video_is_signed(self):
+        request = self.request()
+        post = self.posts().get(title='With video')
+        url = compile_serializer(PostSerializer)(post, request)['video_file']
+        self.assertIn('signature=', url)
+        self.assertTrue(url.startswith('http://testserver/'))
+
+    def test_reservations(self):
+        reservations = Reservation.objects.select_related('patient__user__userprofile').order_by('created_at')
+        self.assertParity(ReservationSerializer, reservations)
+        self.assertParity(ReservationSerializer, reservations, self.request(expand=''))
+        self.assertParity(ReservationSerializer, reservations, self.request(fields='id,patient.user.profile,doctor'))
+
+    def test_notifications(self):
+        notifications = Notification.objects.order_by('created_at')
+        self.assertParity(NotificationSerializer, notifications)
+        self.assertParity(NotificationSerializer, notifications, self.request(fields='id,is_read'))
+
+    @override_settings(FAST_SERIALIZATION_ENABLED=True)
+    def test_uncompilable_serializers_fall_back_to_drf(self):
+        class CustomRepresentationSerializer(NotificationSerializer):
+            def to_representation(self, instance):
+                return {'message': instance.message.upper()}
+
+        class CustomFieldSerializer(NotificationSerializer):
+            message = ShoutField()
+
+        request = self.request()
+        cases = (
+            (VideoUploadSerializer, VideoUpload.objects.all()),
+            (CustomRepresentationSerializer, Notification.objects.order_by('created_at')),
+            (CustomFieldSerializer, Notification.objects.order_by('created_at')),
+        )
+        for serializer_class, queryset in cases:
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertIsNone(compile_serializer(serializer_class))
+                self.assertIsNone(get_compiled(serializer_class, request))
+                instances = list(queryset)
+                expected = serializer_class(instances, many=True, context={'request': request}).data
+                self.assertEqual(as_json(serialize(serializer_class, instances, request)), as_json(expected))
+
+    @override_settings(FAST_SERIALIZATION_ENABLED=False)
+    def test_disabled_serves_drf(self):
+        self.assertIsNone(get_compiled(NotificationSerializer, self.request()))
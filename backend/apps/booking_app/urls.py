@@ -3,13 +3,15 @@
 from django.urls import path, include
 from rest_framework import routers
 
+from apps.booking_app import async_views
 from apps.booking_app.views import (
-    CreateStripePaymentIntentView, PatientViewSet, DoctorViewSet,
-    ClinicViewSet, ReservationViewSet, ReviewViewSet, PostViewSet,
+    CreateStripePaymentIntentView, ClinicOnboardingImportView, ClinicDashboardView, PatientViewSet, DoctorViewSet,
+    ClinicViewSet, ClinicDoctorViewSet, ReservationViewSet, ReviewViewSet, PostViewSet, VideoUploadViewSet,
      CommentViewSet, LikeViewSet, CategoryViewSet,
     SubscriptionViewSet, PaymentMethodViewSet, PaymentViewSet,
     NotificationViewSet, EventScheduleViewSet, AdvertisingCampaignViewSet,
-    UsersAuditViewSet, stripe_webhook
+    UsersAuditViewSet, ArchivedReservationViewSet, ArchivedNotificationViewSet,
+    ArchivedPaymentViewSet, stripe_webhook
 )
 
 router = routers.DefaultRouter()
@@ -19,6 +21,7 @@ router.register(r'clinics', ClinicViewSet)
 router.register(r'reservations', ReservationViewSet)
 router.register(r'reviews', ReviewViewSet)
 router.register(r'posts', PostViewSet)
+router.register(r'video-uploads', VideoUploadViewSet)
 # router.register(r'videos', VideoViewSet)
 router.register(r'comments', CommentViewSet)
 router.register(r'likes', LikeViewSet)
@@ -30,9 +33,21 @@ router.register(r'notifications', NotificationViewSet)
 router.register(r'event-schedules', EventScheduleViewSet)
 router.register(r'advertising-campaigns', AdvertisingCampaignViewSet)
 router.register(r'users-audit', UsersAuditViewSet)
+router.register(r'archive/reservations', ArchivedReservationViewSet)
+router.register(r'archive/notifications', ArchivedNotificationViewSet)
+router.register(r'archive/payments', ArchivedPaymentViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('clinics/<uuid:clinic_id>/doctors/', ClinicDoctorViewSet.as_view({'get': 'list'}), name='clinic-doctors'),
     path('webhooks/stripe/', stripe_webhook, name='stripe_webhook'),
     path('payments/create-stripe-intent/', CreateStripePaymentIntentView.as_view(), name='create-stripe-intent'),
+    path('onboarding/import/', ClinicOnboardingImportView.as_view(), name='clinic-onboarding-import'),
+    path('dashboard/clinics/<uuid:clinic_id>/', ClinicDashboardView.as_view(), name='clinic-dashboard'),
+    # Async read paths, for ASGI deployments
+    path('async/clinics/', async_views.clinic_list, name='async-clinic-list'),
+    path('async/clinics/<uuid:clinic_id>/', async_views.clinic_detail, name='async-clinic-detail'),
+    path('async/doctors/', async_views.doctor_list, name='async-doctor-list'),
+    path('async/notifications/', async_views.notification_list, name='async-notification-list'),
+    path('async/reservations/', async_views.reservation_list, name='async-reservation-list'),
 ]
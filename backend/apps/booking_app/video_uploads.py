@@ -0,0 +1,311 @@
+# backend/booking_app/video_uploads.py
+#
+# Resumable, chunked uploads of post videos:
+#
+#   POST /video-uploads/                        {"filename", "size", "post"?} -> id, chunk_size, total_chunks
+#   PUT  /video-uploads/<id>/chunks/<index>/    raw chunk bytes, optional "Upload-Checksum: sha256 <base64>"
+#   GET  /video-uploads/<id>/                   received_chunks, to resume after a failure
+#   POST /video-uploads/<id>/complete/          {"post"?} -> attaches the video to the post
+#
+# Chunks are independent, so they can be sent in parallel and in any order, and
+# each one is streamed from the request into storage without being buffered.
+# On storages with local paths every chunk is written at its offset in the
+# final, preallocated file, so there is nothing to assemble on completion.
+# Other storages keep one object per chunk, and a worker joins them. A chunk
+# only counts as received once its bytes are written and verified; a resent
+# chunk is unrecorded before it is written again.
+
+import base64
+import binascii
+import hashlib
+import io
+import logging
+import os
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils.timezone import now
+
+from apps.booking_app.models import Post, VideoUpload, VideoUploadChunk, VideoUploadStatus
+
+logger = logging.getLogger(__name__)
+
+READ_BLOCK_SIZE = 64 * 1024
+CHECKSUM_ALGORITHMS = ('sha256', 'sha1', 'md5')
+# Status tus uses for a chunk whose checksum does not match
+CHECKSUM_MISMATCH_STATUS = 460
+
+
+class VideoUploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def video_storage():
+    return Post._meta.get_field('video_file').storage
+
+
+def local_path(storage, name):
+    """Filesystem path of ``name``, or None for storages without local paths."""
+    try:
+        return storage.path(name)
+    except NotImplementedError:
+        return None
+
+
+def parts_directory(upload):
+    return f'videos/parts/{upload.id}'
+
+
+def part_name(upload, index):
+    # Unique per attempt, so a rejected attempt never replaces a verified chunk
+    return f'{parts_directory(upload)}/{index:06d}.{uuid.uuid4().hex}'
+
+
+def delete_parts(storage, upload):
+    """Delete every chunk object of ``upload``, including those of abandoned attempts."""
+    try:
+        _, names = storage.listdir(parts_directory(upload))
+    except (FileNotFoundError, NotImplementedError):
+        names = []
+    for name in names:
+        storage.delete(f'{parts_directory(upload)}/{name}')
+
+
+def start_upload(doctor, filename, size, post=None):
+    extension = os.path.splitext(filename)[1].lower()[:10]
+    upload = VideoUpload(
+        doctor=doctor,
+        post=post,
+        filename=filename,
+        size=size,
+        chunk_size=settings.VIDEO_UPLOAD_CHUNK_SIZE,
+    )
+    upload.file_name = f'videos/{upload.id}{extension}'
+    path = local_path(video_storage(), upload.file_name)
+    if path is not None:
+        # Sparse file of the final size; chunks fill it in place
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as target:
+            target.truncate(size)
+    upload.save()
+    return upload
+
+
+def parse_checksum(header):
+    """(algorithm, digest bytes) from an "Upload-Checksum: <algorithm> <base64>" header, or None."""
+    if not header:
+        return None
+    try:
+        algorithm, encoded = header.split(None, 1)
+        digest = base64.b64decode(encoded.strip(), validate=True)
+    except (ValueError, binascii.Error):
+        raise VideoUploadError("Upload-Checksum must be '<algorithm> <base64 digest>'.")
+    if algorithm.lower() not in CHECKSUM_ALGORITHMS:
+        raise VideoUploadError(f"Unsupported checksum algorithm {algorithm}.")
+    return algorithm.lower(), digest
+
+
+class ChunkReader:
+    """File-like view of exactly ``length`` bytes of the request body, hashed as they are read."""
+
+    def __init__(self, stream, length, algorithm):
+        self.stream = stream
+        self.size = length
+        self.remaining = length
+        self.sha256 = hashlib.sha256()
+        self.client_hash = hashlib.new(algorithm) if algorithm != 'sha256' else None
+
+    # Storages must not try to rewind the request body
+    closed = False
+
+    def seekable(self):
+        return False
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(size) if size else b''
+        if size and not data:
+            raise VideoUploadError("The chunk ended before Content-Length bytes were received.")
+        self.remaining -= len(data)
+        self.sha256.update(data)
+        if self.client_hash is not None:
+            self.client_hash.update(data)
+        return data
+
+    def digest(self):
+        return (self.client_hash or self.sha256).digest()
+
+
+def write_chunk(upload, index, stream, length, checksum=None):
+    """Stream one chunk into storage and record it; returns its recorded checksum."""
+    if upload.status != VideoUploadStatus.UPLOADING:
+        raise VideoUploadError(f"Upload is {upload.status}.", status=409)
+    if index >= upload.total_chunks:
+        raise VideoUploadError(f"Chunk index must be below {upload.total_chunks}.")
+    if length != upload.chunk_length(index):
+        raise VideoUploadError(f"Chunk {index} must be {upload.chunk_length(index)} bytes, got {length}.")
+
+    # A chunk sent again is no longer received until the new bytes are verified
+    previous = VideoUploadChunk.objects.filter(upload=upload, index=index).first()
+    if previous is not None:
+        VideoUploadChunk.objects.filter(pk=previous.pk).delete()
+
+    algorithm, expected = checksum or ('sha256', None)
+    reader = ChunkReader(stream, length, algorithm)
+    storage = video_storage()
+    path = local_path(storage, upload.file_name)
+    name = ''
+    try:
+        if path is not None:
+            # The chunk's own byte range; nothing else writes there
+            with open(path, 'r+b') as target:
+                target.seek(index * upload.chunk_size)
+                for block in iter(lambda: reader.read(READ_BLOCK_SIZE), b''):
+                    target.write(block)
+        else:
+            name = part_name(upload, index)
+            name = storage.save(name, File(reader, name=name))
+        if expected is not None and reader.digest() != expected:
+            # Nothing is recorded; the client sends the chunk again
+            raise VideoUploadError(f"Checksum mismatch for chunk {index}.", status=CHECKSUM_MISMATCH_STATUS)
+    except Exception:
+        if name:
+            storage.delete(name)
+        raise
+
+    recorded = f'sha256:{reader.sha256.hexdigest()}'
+    VideoUploadChunk.objects.update_or_create(
+        upload=upload, index=index, defaults={'checksum': recorded, 'name': name}
+    )
+    if previous is not None and previous.name and previous.name != name:
+        storage.delete(previous.name)
+    return recorded
+
+
+def complete_upload(upload, post=None):
+    """
+    Finish ``upload`` once every chunk has arrived and attach the video to
+    ``post`` (or the post given when the upload started). Local files are
+    attached right away; chunks kept as separate objects are joined by a
+    worker first.
+    """
+    from apps.booking_app.tasks import assemble_video_upload
+    from apps.queueing.enqueue import enqueue
+
+    if upload.status == VideoUploadStatus.COMPLETE:
+        return upload
+    if upload.status != VideoUploadStatus.UPLOADING:
+        raise VideoUploadError(f"Upload is {upload.status}.", status=409)
+    post = post or upload.post
+    if post is None:
+        raise VideoUploadError("A post is required to attach the video to.")
+    received = upload.chunks.count()
+    if received != upload.total_chunks:
+        raise VideoUploadError(f"{upload.total_chunks - received} chunks are still missing.", status=409)
+
+    with transaction.atomic():
+        upload = VideoUpload.objects.select_for_update().get(pk=upload.pk)
+        if upload.status != VideoUploadStatus.UPLOADING:
+            return upload
+        upload.post = post
+        if local_path(video_storage(), upload.file_name) is not None:
+            attach_video(upload)
+        else:
+            upload.status = VideoUploadStatus.ASSEMBLING
+            upload.save(update_fields=['post', 'status', 'updated_at'])
+            enqueue(assemble_video_upload.s(str(upload.id)))
+    return upload
+
+
+def attach_video(upload):
+    """Point the upload's post at the assembled file and mark the upload complete."""
+    post = Post.objects.select_for_update().get(pk=upload.post_id)
+    previous = post.video_file.name
+    post.video_file.name = upload.file_name
+    post.save(update_fields=['video_file', 'updated_at'])
+    upload.status = VideoUploadStatus.COMPLETE
+    upload.completed_at = now()
+    upload.save(update_fields=['post', 'status', 'completed_at', 'updated_at'])
+    upload.chunks.all().delete()
+    if previous and previous != upload.file_name:
+        storage = post.video_file.storage
+        transaction.on_commit(lambda: storage.delete(previous))
+
+
+class JoinedParts(io.RawIOBase):
+    """Read-only stream over the chunk objects of an upload, in order."""
+
+    def __init__(self, storage, names):
+        self.storage = storage
+        self.names = iter(names)
+        self.current = None
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while True:
+            if self.current is None:
+                name = next(self.names, None)
+                if name is None:
+                    return 0
+                self.current = self.storage.open(name, 'rb')
+            data = self.current.read(len(buffer))
+            if data:
+                buffer[:len(data)] = data
+                return len(data)
+            self.current.close()
+            self.current = None
+
+
+def assemble_upload(upload_id):
+    """Join the chunk objects of an upload into its final file and attach it (worker side)."""
+    upload = VideoUpload.objects.filter(pk=upload_id, status=VideoUploadStatus.ASSEMBLING).first()
+    if upload is None:
+        return None
+    storage = video_storage()
+    names = list(upload.chunks.order_by('index').values_list('name', flat=True))
+    if len(names) != upload.total_chunks or not all(names):
+        logger.error(f"Video upload {upload.id} is missing chunks, marking it failed.")
+        VideoUpload.objects.filter(pk=upload.pk).update(status=VideoUploadStatus.FAILED)
+        return None
+    stream = io.BufferedReader(JoinedParts(storage, names), buffer_size=READ_BLOCK_SIZE)
+    content = File(stream, name=upload.file_name)
+    content.size = upload.size
+    upload.file_name = storage.save(upload.file_name, content)
+
+    with transaction.atomic():
+        attach_video(upload)
+    delete_parts(storage, upload)
+    return upload
+
+
+def discard_upload(upload):
+    storage = video_storage()
+    if local_path(storage, upload.file_name) is not None:
+        storage.delete(upload.file_name)
+    else:
+        delete_parts(storage, upload)
+    upload.delete()
+
+
+def expire_uploads():
+    """Delete unfinished uploads older than VIDEO_UPLOAD_EXPIRY_HOURS together with their data."""
+    cutoff = now() - timedelta(hours=settings.VIDEO_UPLOAD_EXPIRY_HOURS)
+    expired = VideoUpload.objects.filter(
+        created_at__lt=cutoff, status__in=[VideoUploadStatus.UPLOADING, VideoUploadStatus.FAILED]
+    )
+    count = 0
+    for upload in expired.iterator():
+        try:
+            discard_upload(upload)
+            count += 1
+        except OSError as e:
+            logger.warning(f"Could not discard video upload {upload.id}: {str(e)}")
+    return count
@@ -1,14 +1,17 @@
-from rest_framework import viewsets, permissions, serializers
+from rest_framework import mixins, viewsets, permissions, serializers, status
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.gis.geos import Point
 from django.contrib.gis.db.models.functions import Distance
 from django.http import JsonResponse
 from django.conf import settings
+from django.utils.timezone import now
+from datetime import timedelta
 import stripe
 from rest_framework.permissions import BasePermission
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
-from django.db.models import Count
+from django.db import transaction
+from django.db.models import Count, Prefetch
 
 # Local imports
 from apps.authentication.models import Doctor, Patient
@@ -16,26 +19,41 @@ from apps.authentication.serializers import (
     DoctorSerializer, PatientSerializer
 )
 from apps.booking_app.models import (
-    Clinic,
-    Reservation, Review, Post,
+    Clinic, ClinicDoctor,
+    Reservation, ReservationStatus, Review, Post,
     Comment, Like, Category, Subscription, PaymentMethod,
     Payment, Notification, EventSchedule, AdvertisingCampaign,
-    UsersAudit
+    UsersAudit, ArchivedReservation, ArchivedNotification, ArchivedPayment,
+    VideoUpload, VideoUploadStatus
 )
 from apps.booking_app.serializers import (
-    ClinicSerializer, ReservationSerializer, ReviewSerializer, PostSerializer,
+    ClinicSerializer, ClinicDoctorSerializer, ReservationSerializer, ReviewSerializer, PostSerializer,
      CommentSerializer, LikeSerializer, CategorySerializer,
     SubscriptionSerializer, PaymentMethodSerializer, PaymentSerializer,
     NotificationSerializer, EventScheduleSerializer, AdvertisingCampaignSerializer,
-    UsersAuditSerializer
+    UsersAuditSerializer, ArchivedReservationSerializer, ArchivedNotificationSerializer,
+    ArchivedPaymentSerializer, VideoUploadSerializer
 )
 
-from apps.booking_app.tasks import process_payment_webhook
-from apps.booking_app.tasks import send_sms_notification, send_email_notification,process_payment_webhook
+from apps.booking_app.exports import (
+    export_response, parse_date_range, RESERVATION_EXPORT_FIELDS, PAYMENT_EXPORT_FIELDS
+)
+from apps.booking_app.onboarding import import_onboarding_file, OnboardingFileError
+from apps.booking_app.video_uploads import (
+    VideoUploadError, start_upload, parse_checksum, write_chunk, complete_upload
+)
+from apps.booking_app.analytics import clinic_dashboard
+from apps.booking_app.notifications import get_unread_count, invalidate_unread_count, mark_as_read
+from apps.booking_app.tasks import send_sms_notification, send_email_notification, process_payment_webhook
+from apps.queueing.enqueue import enqueue
+from core.dynamic_fields import EagerLoadingMixin
+from core.fast_serializers import FastListMixin
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import PageNumberPagination, CursorPagination
+from rest_framework.exceptions import NotFound
 from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.parsers import MultiPartParser
 
 stripe.api_key = settings.STRIPE_SECRET_KEY
 
@@ -44,6 +62,28 @@ class GlPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+class ClinicDoctorPagination(CursorPagination):
+    # Keyset pagination: pages stay cheap however many doctors a clinic has
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('joined_at', 'id')
+
+
+def with_doctor_summary(queryset, serializer):
+    """Annotate the doctor count and prefetch the doctor preview when ``serializer`` renders them."""
+    fields = serializer.fields
+    if 'doctor_count' in fields:
+        queryset = queryset.annotate(doctor_count=Count('clinicdoctor', distinct=True))
+    if 'doctors_preview' in fields:
+        preview = (
+            ClinicDoctor.objects
+            .select_related('doctor__user', 'doctor__specialization')
+            .order_by('joined_at', 'id')[:settings.CLINIC_DOCTOR_PREVIEW_SIZE]
+        )
+        queryset = queryset.prefetch_related(Prefetch('clinicdoctor_set', queryset=preview, to_attr='doctor_preview'))
+    return queryset
+
 class IsOwner(BasePermission):
     def has_object_permission(self, request, view, obj):
         return obj.user == request.user
@@ -61,7 +101,7 @@ class IsPatient(BasePermission):
         return request.user.is_authenticated and request.user.role == 'patient'
 
 # Patient ViewSet
-class PatientViewSet(viewsets.ModelViewSet):
+class PatientViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Patient.objects.none()
     serializer_class = PatientSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwner]
@@ -88,7 +128,7 @@ class PatientViewSet(viewsets.ModelViewSet):
 
 
 # Doctor ViewSet
-class DoctorViewSet(viewsets.ModelViewSet):
+class DoctorViewSet(EagerLoadingMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Doctor.objects.all()
     serializer_class = DoctorSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -103,7 +143,7 @@ class DoctorViewSet(viewsets.ModelViewSet):
 
 
 # Clinic ViewSet
-class ClinicViewSet(viewsets.ModelViewSet):
+class ClinicViewSet(EagerLoadingMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Clinic.objects.all()
     serializer_class = ClinicSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -122,6 +162,9 @@ class ClinicViewSet(viewsets.ModelViewSet):
     #         # If no user location, just return active clinics ordered by name
     #         return Clinic.objects.filter(active=True).order_by('name')
 
+    def get_queryset(self):
+        return with_doctor_summary(super().get_queryset(), self.get_serializer())
+
     def perform_create(self, serializer):
         # Ensure a user can own only one clinic
         if Clinic.objects.filter(owner=self.request.user).exists():
@@ -130,8 +173,37 @@ class ClinicViewSet(viewsets.ModelViewSet):
         serializer.save(owner=self.request.user)
 
 
+# Doctors of one clinic (/clinics/<id>/doctors/), oldest members first
+class ClinicDoctorViewSet(EagerLoadingMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = ClinicDoctor.objects.none()
+    serializer_class = ClinicDoctorSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ClinicDoctorPagination
+    filter_backends = [OrderingFilter]
+    ordering_fields = ['joined_at']
+    ordering = ['joined_at', 'id']
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if not Clinic.objects.filter(id=self.kwargs['clinic_id']).exists():
+            raise NotFound('No Clinic matches the given query.')
+
+    def get_queryset(self):
+        queryset = ClinicDoctor.objects.filter(clinic_id=self.kwargs['clinic_id'])
+        reservation_open = self.request.query_params.get('reservation_open')
+        if reservation_open in ('1', 'true'):
+            queryset = queryset.filter(doctor__reservation_open=True)
+        elif reservation_open in ('0', 'false'):
+            queryset = queryset.filter(doctor__reservation_open=False)
+        specialization = self.request.query_params.get('specialization')
+        if specialization:
+            specialization = serializers.UUIDField().run_validation(specialization)
+            queryset = queryset.filter(doctor__specialization_id=specialization)
+        return queryset
+
+
 # Reservation ViewSet
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(EagerLoadingMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Reservation.objects.all()
     serializer_class = ReservationSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -139,7 +211,7 @@ class ReservationViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        if hasattr(user, 'clinicowner'):
+        if user.role == 'clinic':
             return Reservation.objects.filter(clinic__owner=user)
         elif hasattr(user, 'doctor'):
             return Reservation.objects.filter(doctor__user=user)
@@ -154,33 +226,33 @@ class ReservationViewSet(viewsets.ModelViewSet):
         serializer.save(patient=user.patient)
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated, IsClinicOwner])
+    @transaction.atomic
     def approve(self, request, pk=None):
         reservation = self.get_object()
         if reservation.status == ReservationStatus.APPROVED:
             return Response({'error': 'Reservation already approved'}, status=400)
 
-        reservation.status = ReservationStatus.APPROVED
-        reservation.save()
-
-        # Assign a doctor
+        # Find a doctor first: returning 400 below does not roll the atomic block back
         assigned_doctor = reservation.clinic.doctors.filter(reservation_open=True).first()
         if not assigned_doctor:
             return Response({'error': 'No available doctors'}, status=400)
 
+        reservation.status = ReservationStatus.APPROVED
         reservation.doctor = assigned_doctor
         reservation.save()
 
         # Send notifications asynchronously
-        send_sms_notification.delay(reservation.patient.user.id, 'Your reservation has been approved.')
-        send_email_notification.delay(
+        enqueue(send_sms_notification.s(reservation.patient.user.id, 'Your reservation has been approved.'))
+        enqueue(send_email_notification.s(
             reservation.patient.user.email,
             'Reservation Approved',
             'Your reservation has been approved.'
-        )
+        ))
         return Response({'status': 'Reservation approved', 'doctor': DoctorSerializer(assigned_doctor).data})
 
 
     @action(detail=True, methods=['post'], permission_classes=[permissions.IsAuthenticated, IsClinicOwner])
+    @transaction.atomic
     def reject(self, request, pk=None):
         reservation = self.get_object()
         reservation.status = ReservationStatus.REJECTED
@@ -188,14 +260,24 @@ class ReservationViewSet(viewsets.ModelViewSet):
         reservation.save()
 
         # Send notifications asynchronously
-        send_sms_notification.delay(reservation.patient.user.id, 'Your reservation has been rejected.')
-        send_email_notification.delay(
+        enqueue(send_sms_notification.s(reservation.patient.user.id, 'Your reservation has been rejected.'))
+        enqueue(send_email_notification.s(
             reservation.patient.user.email,
             'Reservation Rejected',
             f'Your reservation has been rejected. Reason: {reservation.reason_for_cancellation}'
-        )
+        ))
         return Response({'status': 'Reservation rejected'})
 
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        date_from, date_to = parse_date_range(request.query_params)
+        queryset = self.get_queryset().order_by('reservation_date', 'reservation_time')
+        if date_from:
+            queryset = queryset.filter(reservation_date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(reservation_date__lte=date_to)
+        return export_response(queryset, RESERVATION_EXPORT_FIELDS, 'reservations', request.query_params)
+
 # Review ViewSet
 class ReviewViewSet(viewsets.ModelViewSet):
     queryset = Review.objects.all()
@@ -203,7 +285,7 @@ class ReviewViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
 # Post ViewSet
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(EagerLoadingMixin, FastListMixin, viewsets.ModelViewSet):
     queryset = Post.objects.all().annotate(
         likes_count=Count('like', distinct=True),
         comments_count=Count('comment', distinct=True)
@@ -226,6 +308,49 @@ class PostViewSet(viewsets.ModelViewSet):
             raise serializers.ValidationError("Only doctors can create posts.")
         serializer.save(doctor=user.doctor)
     
+# Resumable chunked video uploads (see booking_app/video_uploads.py)
+class VideoUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    queryset = VideoUpload.objects.none()
+    serializer_class = VideoUploadSerializer
+    permission_classes = [IsDoctor]
+
+    def get_queryset(self):
+        return VideoUpload.objects.filter(doctor_id=self.request.user.id)
+
+    def perform_create(self, serializer):
+        if not hasattr(self.request.user, 'doctor'):
+            raise serializers.ValidationError("Only doctors can upload videos.")
+        data = serializer.validated_data
+        serializer.instance = start_upload(self.request.user.doctor, data['filename'], data['size'], data.get('post'))
+
+    @action(detail=True, methods=['put'], url_path=r'chunks/(?P<index>\d+)')
+    def chunk(self, request, pk=None, index=None):
+        upload = self.get_object()
+        try:
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+            # The body is read straight from the connection, never through request.data
+            checksum = write_chunk(
+                upload, int(index), request.stream, length, parse_checksum(request.headers.get('Upload-Checksum'))
+            )
+        except VideoUploadError as e:
+            return Response({'detail': str(e)}, status=e.status)
+        return Response({'index': int(index), 'checksum': checksum})
+
+    @action(detail=True, methods=['post'])
+    def complete(self, request, pk=None):
+        upload = self.get_object()
+        post = None
+        if request.data.get('post'):
+            post = Post.objects.filter(pk=request.data['post'], doctor_id=request.user.id).first()
+            if post is None:
+                return Response({'detail': 'Post not found.'}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            upload = complete_upload(upload, post)
+        except VideoUploadError as e:
+            return Response({'detail': str(e)}, status=e.status)
+        code = status.HTTP_202_ACCEPTED if upload.status == VideoUploadStatus.ASSEMBLING else status.HTTP_200_OK
+        return Response(self.get_serializer(upload).data, status=code)
+
 # Video ViewSet
 # class VideoViewSet(viewsets.ModelViewSet):
 #     queryset = Video.objects.all()
@@ -245,8 +370,11 @@ class CommentViewSet(viewsets.ModelViewSet):
         post_id = self.request.query_params.get('post_id')
         return Comment.objects.filter(post_id=post_id) if post_id else Comment.objects.none()
 
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
 # Like ViewSet
-class LikeViewSet(viewsets.ModelViewSet):
+class LikeViewSet(EagerLoadingMixin, viewsets.ModelViewSet):
     queryset = Like.objects.none()
     serializer_class = LikeSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -292,11 +420,59 @@ class PaymentViewSet(viewsets.ModelViewSet):
     serializer_class = PaymentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-# Notification ViewSet
-class NotificationViewSet(viewsets.ModelViewSet):
-    queryset = Notification.objects.all()
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        # Clinic owners export payments for their clinics' reservations, everyone else their own
+        user = request.user
+        if user.role == 'clinic':
+            queryset = Payment.objects.filter(related_object__clinic__owner=user)
+        else:
+            queryset = Payment.objects.filter(user=user)
+        date_from, date_to = parse_date_range(request.query_params)
+        if date_from:
+            queryset = queryset.filter(created_at__date__gte=date_from)
+        if date_to:
+            queryset = queryset.filter(created_at__date__lte=date_to)
+        return export_response(queryset.order_by('created_at'), PAYMENT_EXPORT_FIELDS, 'payments', request.query_params)
+
+# Notification ViewSet (per-user inbox)
+class NotificationViewSet(FastListMixin, viewsets.ModelViewSet):
+    queryset = Notification.objects.none()
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = GlPagination
+    query_budget = {'list': 4, 'unread_count': 3, 'mark_read': 4, 'default': 6}
+
+    def get_queryset(self):
+        queryset = Notification.objects.filter(user=self.request.user)
+        if self.request.query_params.get('unread') in ('1', 'true'):
+            queryset = queryset.filter(is_read=False)
+        return queryset.order_by('-created_at')
+
+    def perform_create(self, serializer):
+        # Notifications are only created for yourself here; the counter follows the post_save signal
+        serializer.save(user=self.request.user)
+
+    def perform_update(self, serializer):
+        serializer.save()
+        invalidate_unread_count(self.request.user.id)
+
+    def perform_destroy(self, instance):
+        instance.delete()
+        invalidate_unread_count(self.request.user.id)
+
+    @action(detail=False, methods=['get'], url_path='unread-count')
+    def unread_count(self, request):
+        return Response({'unread_count': get_unread_count(request.user.id)})
+
+    @action(detail=False, methods=['post'], url_path='mark-read')
+    def mark_read(self, request):
+        # Without "ids" every unread notification of the user is marked as read
+        ids = request.data.get('ids')
+        if ids is not None:
+            ids = serializers.ListField(child=serializers.UUIDField()).run_validation(ids)
+        updated = mark_as_read(request.user, ids)
+        return Response({'updated': updated, 'unread_count': get_unread_count(request.user.id)})
 
 # EventSchedule ViewSet
 class EventScheduleViewSet(viewsets.ModelViewSet):
@@ -316,6 +492,42 @@ class UsersAuditViewSet(viewsets.ReadOnlyModelViewSet):
     serializer_class = UsersAuditSerializer
     permission_classes = [permissions.IsAdminUser]
 
+# Archive ViewSets (read-only history of rows moved out of the hot tables)
+class ArchivedReservationViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = ArchivedReservation.objects.none()
+    serializer_class = ArchivedReservationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = GlPagination
+
+    def get_queryset(self):
+        user = self.request.user
+        if user.role == 'clinic':
+            clinic_ids = Clinic.objects.filter(owner=user).values('id')
+            queryset = ArchivedReservation.objects.filter(clinic_id__in=clinic_ids)
+        elif user.role == 'doctor':
+            queryset = ArchivedReservation.objects.filter(doctor_id=user.id)
+        else:
+            queryset = ArchivedReservation.objects.filter(patient_id=user.id)
+        return queryset.order_by('-created_at')
+
+class ArchivedNotificationViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = ArchivedNotification.objects.none()
+    serializer_class = ArchivedNotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = GlPagination
+
+    def get_queryset(self):
+        return ArchivedNotification.objects.filter(user_id=self.request.user.id).order_by('-created_at')
+
+class ArchivedPaymentViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = ArchivedPayment.objects.none()
+    serializer_class = ArchivedPaymentSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = GlPagination
+
+    def get_queryset(self):
+        return ArchivedPayment.objects.filter(user_id=self.request.user.id).order_by('-created_at')
+
 
 @csrf_exempt
 def stripe_webhook(request):
@@ -330,9 +542,9 @@ def stripe_webhook(request):
         event = stripe.Webhook.construct_event(payload, sig_header, endpoint_secret)
 
         if event['type'] == 'payment_intent.succeeded':
-            process_payment_webhook.delay(event['data']['object'])
+            enqueue(process_payment_webhook.s(event['data']['object']), outbox=True)
         elif event['type'] == 'payment_intent.payment_failed':
-            process_payment_webhook.delay(event['data']['object'])
+            enqueue(process_payment_webhook.s(event['data']['object']), outbox=True)
 
         return JsonResponse({'status': 'success'})
     except stripe.error.SignatureVerificationError:
@@ -360,4 +572,42 @@ class CreateStripePaymentIntentView(APIView):
 
             return Response({"client_secret": payment_intent['client_secret']})
         except Exception as e:
-            return Response({"error": str(e)}, status=400)
\ No newline at end of file
+            return Response({"error": str(e)}, status=400)
+
+
+# Bulk clinic/doctor onboarding from a CSV or XLSX file
+class ClinicOnboardingImportView(APIView):
+    permission_classes = [IsAuthenticated, IsClinicOwner]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": "Upload the onboarding sheet as 'file'."}, status=400)
+        dry_run = request.data.get('dry_run') in ('1', 'true')
+        try:
+            report = import_onboarding_file(upload, request.user, dry_run=dry_run)
+        except OnboardingFileError as e:
+            return Response({"error": str(e)}, status=400)
+        return Response(report, status=200 if dry_run or not report['errors'] else 207)
+
+
+# Clinic owner dashboard, served from the daily rollup tables
+class ClinicDashboardView(APIView):
+    permission_classes = [IsAuthenticated, IsClinicOwner]
+
+    def get(self, request, clinic_id, *args, **kwargs):
+        clinic = Clinic.objects.filter(id=clinic_id, owner=request.user).first()
+        if clinic is None:
+            return Response({"error": "Clinic not found."}, status=404)
+
+        date_from, date_to = parse_date_range(request.query_params)
+        date_to = date_to or now().date()
+        date_from = date_from or date_to - timedelta(days=settings.ANALYTICS_DASHBOARD_DEFAULT_DAYS - 1)
+        if date_from > date_to:
+            return Response({"error": "date_from must not be after date_to."}, status=400)
+        if (date_to - date_from).days >= settings.ANALYTICS_DASHBOARD_MAX_DAYS:
+            return Response(
+                {"error": f"The range can span at most {settings.ANALYTICS_DASHBOARD_MAX_DAYS} days."}, status=400
+            )
+        return Response(clinic_dashboard(clinic, date_from, date_to))
@@ -1,12 +1,55 @@
-import googlemaps
-from django.conf import settings
-
 class GeolocationService:
+    # Synchronous lookup for scripts and the shell; saves are geocoded in the
+    # background by apps.geocoding. Goes through the same cache and provider.
     @staticmethod
     def fetch_coordinates(address):
-        gmaps = googlemaps.Client(key=settings.GOOGLE_MAPS_API_KEY)
-        geocode_result = gmaps.geocode(address)
-        if geocode_result:
-            location = geocode_result[0]['geometry']['location']
-            return f"{location['lat']},{location['lng']}"
+        from apps.geocoding.service import geocode
+        coordinates = geocode(address)
+        if coordinates:
+            return f"{coordinates[0]},{coordinates[1]}"
         raise ValueError("Geolocation not found")
+
+
+class AddressTrackingMixin:
+    """Remembers the stored ``address`` so a save can tell whether it changed (see apps.geocoding)."""
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_address = instance.__dict__.get('address')
+        return instance
+
+
+def copy_instances(model, instances, using='default', batch_size=5000, keep_timestamps=False):
+    """
+    Insert unsaved model instances with COPY FROM STDIN on psycopg 3 and fall
+    back to bulk_create elsewhere. Like bulk_create, this skips save() and
+    signals. With ``keep_timestamps`` already-set auto_now/auto_now_add values
+    are written as they are (COPY path only), which seed data relies on.
+    """
+    from django.db import connections
+    from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+    connection = connections[using]
+    if connection.vendor != 'postgresql' or not is_psycopg3:
+        model._default_manager.using(using).bulk_create(instances, batch_size=batch_size)
+        return
+
+    fields = [field for field in model._meta.concrete_fields if field is not model._meta.auto_field]
+    quote_name = connection.ops.quote_name
+    sql = (
+        f"COPY {quote_name(model._meta.db_table)} "
+        f"({', '.join(quote_name(field.column) for field in fields)}) FROM STDIN"
+    )
+
+    def prepare(field, instance):
+        if keep_timestamps and (getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)):
+            value = getattr(instance, field.attname)
+            if value is not None:
+                return field.get_db_prep_save(value, connection)
+        return field.get_db_prep_save(field.pre_save(instance, True), connection)
+
+    with connection.cursor() as cursor:
+        with cursor.cursor.copy(sql) as copy:
+            for instance in instances:
+                copy.write_row([prepare(field, instance) for field in fields])
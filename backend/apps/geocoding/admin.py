@@ -0,0 +1,16 @@
+from django.contrib import admin
+from apps.geocoding.models import GeocodeCache, GeocodeRequest
+
+
+@admin.register(GeocodeCache)
+class GeocodeCacheAdmin(admin.ModelAdmin):
+    list_display = ['address', 'latitude', 'longitude', 'provider', 'fetched_at', 'expires_at']
+    search_fields = ['normalized_address']
+    ordering = ['-fetched_at']
+
+
+@admin.register(GeocodeRequest)
+class GeocodeRequestAdmin(admin.ModelAdmin):
+    list_display = ['model', 'object_id', 'address', 'attempts', 'updated_at']
+    list_filter = ['model']
+    ordering = ['updated_at']
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class GeocodingConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.geocoding'
+
+    def ready(self):
+        import apps.geocoding.signals
@@ -0,0 +1,39 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from apps.geocoding.service import GEOCODED_MODELS, request_geocoding, schedule_batch, process_pending
+
+
+class Command(BaseCommand):
+    help = "Queue geocoding for rows that have an address but no coordinates."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true', help="Geocode in this process instead of the worker.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows read per query.")
+
+    def handle(self, *args, **options):
+        if not settings.GEOCODING_ENABLED:
+            raise CommandError("Geocoding is disabled; set GOOGLE_MAPS_API_KEY or GEOCODING_ENABLED.")
+        for model_label in GEOCODED_MODELS:
+            model = apps.get_model(model_label)
+            coordinate_field = 'geolocation' if model_label == 'booking_app.Branch' else 'latitude'
+            rows = (
+                model._default_manager
+                .filter(Q(**{f'{coordinate_field}__isnull': True}), address__gt='')
+                .only('pk', 'address')
+            )
+            count = 0
+            for instance in rows.iterator(chunk_size=options['batch_size']):
+                request_geocoding(instance, schedule=False)
+                count += 1
+            self.stdout.write(f"Queued {count} {model_label} rows.")
+
+        if options['sync']:
+            total = 0
+            while handled := process_pending():
+                total += handled
+            self.stdout.write(f"Geocoded {total} rows.")
+        else:
+            schedule_batch()
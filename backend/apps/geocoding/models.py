@@ -0,0 +1,56 @@
+from django.db import models
+
+
+# ---------------------------------------------
+# Geocoding cache and pending lookups
+# ---------------------------------------------
+class GeocodeCache(models.Model):
+    # One row per normalized address; a row without coordinates records that
+    # the provider found nothing, so the address is not looked up again until
+    # it expires.
+    normalized_address = models.CharField(max_length=512, unique=True)
+    address = models.CharField(max_length=512)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    provider = models.CharField(max_length=50)
+    fetched_at = models.DateTimeField(auto_now=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['expires_at'], name='idx_geocode_cache_expires_at'),
+        ]
+        verbose_name = "Geocode Cache Entry"
+        verbose_name_plural = "Geocode Cache"
+
+    @property
+    def found(self):
+        return self.latitude is not None and self.longitude is not None
+
+    def __str__(self):
+        return f"{self.address} -> {self.latitude},{self.longitude}"
+
+
+class GeocodeRequest(models.Model):
+    # Latest address of a row waiting for coordinates; saving the row again
+    # before the worker gets to it just replaces the address.
+    model = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=64)
+    address = models.CharField(max_length=512)
+    normalized_address = models.CharField(max_length=512)
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['model', 'object_id'], name='unique_geocode_request'),
+        ]
+        indexes = [
+            models.Index(fields=['updated_at'], name='idx_geocode_requests_updated'),
+        ]
+        verbose_name = "Geocode Request"
+        verbose_name_plural = "Geocode Requests"
+
+    def __str__(self):
+        return f"{self.model} {self.object_id}: {self.address}"
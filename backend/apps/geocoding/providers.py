@@ -0,0 +1,63 @@
+# backend/geocoding/providers.py
+#
+# Geocoding providers. GEOCODING_PROVIDER names the class to use; a provider
+# returns (latitude, longitude) for an address, None when the address cannot
+# be found, and raises GeocodingError for failures worth retrying (network,
+# quota).
+
+import functools
+import hashlib
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class GeocodingError(Exception):
+    pass
+
+
+class GoogleMapsProvider:
+    name = 'google'
+
+    def __init__(self):
+        import googlemaps
+        # One client per process: it keeps the HTTP session and enforces the query rate itself
+        self.client = googlemaps.Client(
+            key=settings.GOOGLE_MAPS_API_KEY,
+            queries_per_second=settings.GEOCODING_RATE_LIMIT,
+            retry_over_query_limit=True,
+            timeout=settings.GEOCODING_TIMEOUT,
+        )
+
+    def geocode(self, address):
+        import googlemaps
+        try:
+            results = self.client.geocode(address)
+        except (googlemaps.exceptions.TransportError, googlemaps.exceptions.Timeout) as e:
+            raise GeocodingError(str(e)) from e
+        except googlemaps.exceptions.ApiError as e:
+            if e.status == 'ZERO_RESULTS':
+                return None
+            raise GeocodingError(str(e)) from e
+        if not results:
+            return None
+        location = results[0]['geometry']['location']
+        return location['lat'], location['lng']
+
+
+class FakeProvider:
+    """Deterministic coordinates derived from the address, for tests and local development."""
+    name = 'fake'
+
+    def geocode(self, address):
+        if not address.strip():
+            return None
+        digest = hashlib.sha256(address.encode()).digest()
+        latitude = int.from_bytes(digest[:4], 'big') / 2 ** 32 * 180 - 90
+        longitude = int.from_bytes(digest[4:8], 'big') / 2 ** 32 * 360 - 180
+        return round(latitude, 6), round(longitude, 6)
+
+
+@functools.lru_cache(maxsize=None)
+def get_provider():
+    return import_string(settings.GEOCODING_PROVIDER)()
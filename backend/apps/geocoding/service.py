@@ -0,0 +1,204 @@
+# backend/geocoding/service.py
+#
+# Addresses are geocoded off the request path. Saving a geocoded model with a
+# new address records a GeocodeRequest and schedules a batch run. The worker
+# resolves each distinct normalized address once, from the cache table or
+# the provider, at no more than GEOCODING_RATE_LIMIT lookups a second. It
+# then writes the coordinates back with UPDATE, so no save signals fire
+# again. A row whose address changed in the meantime is left for its newer
+# request.
+
+import logging
+import re
+import time
+import unicodedata
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils.timezone import now
+
+from apps.geocoding.models import GeocodeCache, GeocodeRequest
+from apps.geocoding.providers import GeocodingError, get_provider
+
+logger = logging.getLogger(__name__)
+
+SCHEDULE_KEY = 'geocoding:scheduled'
+
+
+def _lat_lng(coordinates):
+    latitude, longitude = coordinates or (None, None)
+    return {'latitude': latitude, 'longitude': longitude}
+
+
+def _geolocation(coordinates):
+    return {'geolocation': {'lat': coordinates[0], 'lng': coordinates[1]} if coordinates else None}
+
+
+# Model label -> fields to write for (latitude, longitude), or None when not found
+GEOCODED_MODELS = {
+    'booking_app.Clinic': _lat_lng,
+    'booking_app.Branch': _geolocation,
+    'authentication.UserProfile': _lat_lng,
+}
+
+
+def normalize_address(address):
+    """Cache key for ``address``: case, spacing and punctuation differences do not matter."""
+    address = unicodedata.normalize('NFKC', address or '').lower()
+    address = re.sub(r'\s*([,;])\s*', ', ', address)
+    address = re.sub(r'\s+', ' ', address)
+    return address.strip(' ,.')
+
+
+def cached_coordinates(normalized):
+    """(found, coordinates) from the cache table; found is False when there is no fresh entry."""
+    entry = GeocodeCache.objects.filter(normalized_address=normalized, expires_at__gt=now()).first()
+    if entry is None:
+        return False, None
+    return True, (entry.latitude, entry.longitude) if entry.found else None
+
+
+def store_coordinates(normalized, address, coordinates, provider):
+    if coordinates:
+        ttl = timedelta(days=settings.GEOCODING_CACHE_TTL_DAYS)
+    else:
+        ttl = timedelta(hours=settings.GEOCODING_NEGATIVE_TTL_HOURS)
+    GeocodeCache.objects.update_or_create(
+        normalized_address=normalized,
+        defaults={
+            'address': address[:512],
+            'latitude': coordinates[0] if coordinates else None,
+            'longitude': coordinates[1] if coordinates else None,
+            'provider': provider.name,
+            'expires_at': now() + ttl,
+        },
+    )
+
+
+def geocode(address):
+    """(latitude, longitude) of ``address`` or None, through the cache table."""
+    normalized = normalize_address(address)
+    if not normalized or not settings.GEOCODING_ENABLED:
+        return None
+    found, coordinates = cached_coordinates(normalized)
+    if found:
+        return coordinates
+    provider = get_provider()
+    coordinates = provider.geocode(address)
+    store_coordinates(normalized, address, coordinates, provider)
+    return coordinates
+
+
+def schedule_batch():
+    """Queue one batch run a few seconds from now, unless one is already queued."""
+    from apps.geocoding.tasks import geocode_pending
+    from apps.queueing.enqueue import enqueue
+    delay = settings.GEOCODING_BATCH_DELAY
+    if cache.add(SCHEDULE_KEY, 1, delay):
+        enqueue(geocode_pending.si().set(countdown=delay))
+
+
+def request_geocoding(instance, schedule=True):
+    """Record that ``instance`` needs coordinates for its current address and schedule a batch."""
+    GeocodeRequest.objects.update_or_create(
+        model=instance._meta.label,
+        object_id=str(instance.pk),
+        defaults={
+            'address': instance.address or '',
+            'normalized_address': normalize_address(instance.address),
+            'attempts': 0,
+        },
+    )
+    if schedule:
+        transaction.on_commit(schedule_batch)
+
+
+def request_geocoding_bulk(instances):
+    """
+    request_geocoding for rows inserted with bulk_create, which sends no
+    post_save: one upsert for all rows with an address, then one batch.
+    """
+    requests = [
+        GeocodeRequest(
+            model=instance._meta.label,
+            object_id=str(instance.pk),
+            address=instance.address,
+            normalized_address=normalize_address(instance.address),
+            attempts=0,
+        )
+        for instance in instances if instance.address
+    ]
+    if not requests:
+        return
+    GeocodeRequest.objects.bulk_create(
+        requests,
+        update_conflicts=True,
+        unique_fields=['model', 'object_id'],
+        update_fields=['address', 'normalized_address', 'attempts', 'updated_at'],
+    )
+    transaction.on_commit(schedule_batch)
+
+
+def apply_coordinates(request, coordinates):
+    """Write coordinates to the request's row if its address is still the one geocoded."""
+    model = apps.get_model(request.model)
+    values = GEOCODED_MODELS[request.model](coordinates)
+    same_address = Q(address=request.address) if request.address else Q(address='') | Q(address__isnull=True)
+    return model._default_manager.filter(same_address, pk=request.object_id).update(**values)
+
+
+def process_pending(batch_size=None):
+    """
+    Geocode up to ``batch_size`` pending requests and return how many were
+    handled. Nothing is locked while the provider is called, so saves are
+    never held up; provider failures leave requests for the next run.
+    """
+    if not settings.GEOCODING_ENABLED:
+        return 0
+    requests = list(GeocodeRequest.objects.order_by('updated_at')[:batch_size or settings.GEOCODING_BATCH_SIZE])
+    by_address = {}
+    for request in requests:
+        by_address.setdefault(request.normalized_address, []).append(request)
+
+    provider = get_provider()
+    interval = 1.0 / settings.GEOCODING_RATE_LIMIT
+    last_call = 0.0
+    handled, clinics_updated = [], False
+    for normalized, pending in by_address.items():
+        found, coordinates = cached_coordinates(normalized) if normalized else (True, None)
+        if not found:
+            # Stay under the provider's rate limit across the whole batch
+            wait = last_call + interval - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            last_call = time.monotonic()
+            try:
+                coordinates = provider.geocode(pending[0].address)
+            except GeocodingError as e:
+                logger.warning(f"Geocoding failed for '{pending[0].address}': {str(e)}")
+                GeocodeRequest.objects.filter(pk__in=[request.pk for request in pending]).update(
+                    attempts=F('attempts') + 1
+                )
+                continue
+            store_coordinates(normalized, pending[0].address, coordinates, provider)
+        for request in pending:
+            if apply_coordinates(request, coordinates) and request.model == 'booking_app.Clinic':
+                clinics_updated = True
+        handled.extend(pending)
+
+    # Requests saved again since they were read keep waiting for their new address
+    for request in handled:
+        GeocodeRequest.objects.filter(pk=request.pk, updated_at=request.updated_at).delete()
+    GeocodeRequest.objects.filter(attempts__gte=settings.GEOCODING_MAX_ATTEMPTS).delete()
+    if clinics_updated:
+        from apps.booking_app.clinic_cache import bump_clinic_cache_version
+        bump_clinic_cache_version()
+    return len(handled)
+
+
+def purge_expired_cache():
+    return GeocodeCache.objects.filter(expires_at__lte=now()).delete()[0]
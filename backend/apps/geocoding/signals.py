@@ -0,0 +1,27 @@
+# backend/geocoding/signals.py
+
+from django.conf import settings
+from django.db.models.signals import post_save
+
+from apps.geocoding.service import GEOCODED_MODELS, request_geocoding
+
+_UNSET = object()
+
+
+def queue_geocoding(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or not settings.GEOCODING_ENABLED:
+        return
+    if update_fields is not None and 'address' not in update_fields:
+        return
+    previous = getattr(instance, '_loaded_address', _UNSET)
+    if created or previous is _UNSET:
+        changed = bool(instance.address)
+    else:
+        changed = (instance.address or '') != (previous or '')
+    instance._loaded_address = instance.address
+    if changed:
+        request_geocoding(instance)
+
+
+for model_label in GEOCODED_MODELS:
+    post_save.connect(queue_geocoding, sender=model_label, dispatch_uid=f'geocoding_{model_label}')
@@ -0,0 +1,28 @@
+# backend/geocoding/tasks.py
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def geocode_pending():
+    import logging
+    from django.conf import settings
+    from apps.geocoding.service import process_pending
+    logger = logging.getLogger(__name__)
+    handled = process_pending()
+    if handled:
+        logger.info(f"Geocoded {handled} pending addresses.")
+    if handled >= settings.GEOCODING_BATCH_SIZE:
+        # More may be waiting; keep going without waiting for the next beat
+        geocode_pending.delay()
+    return handled
+
+
+@shared_task(ignore_result=True)
+def purge_geocode_cache():
+    import logging
+    from apps.geocoding.service import purge_expired_cache
+    logger = logging.getLogger(__name__)
+    purged = purge_expired_cache()
+    logger.info(f"Purged {purged} expired geocode cache entries.")
+    return purged
@@ -0,0 +1,172 @@
+# backend/images/derivatives.py
+#
+# Fixed-size WebP and JPEG derivatives of uploaded images. Each image field
+# listed in DERIVATIVE_SPECS has a sibling "<field>_derivatives" JSONField
+# holding the storage names of its derivatives and the original they were made
+# from:
+#
+#   {"source": "avatars/me.png",
+#    "sizes": {"thumb": {"webp": "avatars/derivatives/me_thumb.webp", "jpeg": "..."}, ...}}
+#
+# Everything goes through the field's storage, so it works on the local
+# FileSystemStorage as well as any remote backend.
+
+import io
+import logging
+import os
+
+from django.apps import apps
+from django.db.models import Q
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+logger = logging.getLogger(__name__)
+
+# Square crops for avatars and icons; license scans are only scaled down
+SQUARE_SIZES = {
+    'thumb': {'size': (128, 128), 'crop': True},
+    'medium': {'size': (512, 512), 'crop': True},
+}
+DOCUMENT_SIZES = {
+    'thumb': {'size': (320, 320), 'crop': False},
+    'medium': {'size': (1280, 1280), 'crop': False},
+}
+DERIVATIVE_SPECS = {
+    ('authentication.UserProfile', 'avatar'): SQUARE_SIZES,
+    ('booking_app.Clinic', 'icon'): SQUARE_SIZES,
+    ('booking_app.Clinic', 'license_image'): DOCUMENT_SIZES,
+    ('authentication.Doctor', 'license_image'): DOCUMENT_SIZES,
+}
+FORMATS = {
+    'webp': {'format': 'WEBP', 'extension': 'webp', 'options': {'quality': 80, 'method': 4}},
+    'jpeg': {'format': 'JPEG', 'extension': 'jpg', 'options': {'quality': 82, 'optimize': True, 'progressive': True}},
+}
+
+LIST_SIZE = 'thumb'
+DETAIL_SIZE = 'medium'
+DEFAULT_FORMAT = 'webp'
+
+
+def derivatives_field(field_name):
+    return f'{field_name}_derivatives'
+
+
+def fields_for(model):
+    return [field for (label, field) in DERIVATIVE_SPECS if label == model._meta.label]
+
+
+def needs_derivatives(instance, field_name):
+    """True when the stored derivatives do not belong to the current file."""
+    file = getattr(instance, field_name)
+    derivatives = getattr(instance, derivatives_field(field_name)) or {}
+    if (file.name or '') == (derivatives.get('source') or ''):
+        return False
+    # The shared default image (e.g. the default avatar) is served as it is
+    return not (file.name and file.name == instance._meta.get_field(field_name).get_default())
+
+
+def _resize(image, size, crop):
+    if crop:
+        return ImageOps.fit(image, size, Image.LANCZOS)
+    resized = image.copy()
+    resized.thumbnail(size, Image.LANCZOS)
+    return resized
+
+
+def _encode(image, image_format):
+    spec = FORMATS[image_format]
+    has_alpha = image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+    if image_format == 'jpeg' and has_alpha:
+        # JPEG has no alpha channel; flatten onto white
+        image = image.convert('RGBA')
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    elif image.mode not in ('RGB', 'RGBA') or (image_format == 'jpeg' and image.mode != 'RGB'):
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+
+    # Nothing from the upload's metadata (EXIF, GPS, XMP, comments) is written out
+    image.info = {}
+    buffer = io.BytesIO()
+    image.save(buffer, spec['format'], **spec['options'])
+    return buffer.getvalue()
+
+
+def render_derivatives(file, sizes):
+    """Encoded derivatives of ``file`` as {size: {format: bytes}}."""
+    with file.open('rb') as source:
+        image = Image.open(source)
+        if image.format == 'JPEG':
+            # Let the decoder downscale large JPEGs while reading
+            largest = max(spec['size'] for spec in sizes.values())
+            image.draft('RGB', largest)
+        image.load()
+    # Apply the EXIF orientation before the metadata is dropped
+    image = ImageOps.exif_transpose(image)
+
+    return {
+        size: {image_format: _encode(_resize(image, spec['size'], spec['crop']), image_format) for image_format in FORMATS}
+        for size, spec in sizes.items()
+    }
+
+
+def _delete_files(storage, derivatives):
+    for variants in (derivatives or {}).get('sizes', {}).values():
+        for name in variants.values():
+            try:
+                storage.delete(name)
+            except OSError as e:
+                logger.warning(f"Could not delete image derivative {name}: {str(e)}")
+
+
+def update_derivatives(model_label, pk, field_name):
+    """
+    Bring the derivatives of one image field up to date with its current file.
+    Unreadable images are recorded as failed so they are not retried; storage
+    errors propagate so the caller can retry.
+    """
+    model = apps.get_model(model_label)
+    instance = model._default_manager.filter(pk=pk).first()
+    if instance is None or not needs_derivatives(instance, field_name):
+        return None
+
+    file = getattr(instance, field_name)
+    previous = getattr(instance, derivatives_field(field_name)) or {}
+    derivatives = {'source': file.name or ''}
+    if file.name:
+        try:
+            rendered = render_derivatives(file, DERIVATIVE_SPECS[(model_label, field_name)])
+        except (UnidentifiedImageError, Image.DecompressionBombError, SyntaxError) as e:
+            logger.warning(f"Could not process {model_label}.{field_name} of {pk} ({file.name}): {str(e)}")
+            derivatives['failed'] = True
+        else:
+            directory, filename = os.path.split(file.name)
+            stem = os.path.splitext(filename)[0]
+            derivatives['sizes'] = {
+                size: {
+                    image_format: file.storage.save(
+                        os.path.join(directory, 'derivatives', f"{stem}_{size}.{FORMATS[image_format]['extension']}"),
+                        io.BytesIO(content),
+                    )
+                    for image_format, content in variants.items()
+                }
+                for size, variants in rendered.items()
+            }
+
+    # Only record them if the file did not change again in the meantime
+    unchanged = Q(**{field_name: file.name}) if file.name else Q(**{field_name: ''}) | Q(**{f'{field_name}__isnull': True})
+    updated = model._default_manager.filter(unchanged, pk=pk).update(**{derivatives_field(field_name): derivatives})
+    if updated:
+        _delete_files(file.storage, previous)
+    else:
+        _delete_files(file.storage, derivatives)
+    return derivatives
+
+
+def pick_derivative(instance, field_name, size, image_format):
+    """Storage name to serve for ``size``/``image_format``; the original until derivatives exist."""
+    file = getattr(instance, field_name)
+    derivatives = getattr(instance, derivatives_field(field_name), None) or {}
+    if size == 'original' or derivatives.get('source') != file.name:
+        return file.name
+    variants = derivatives.get('sizes', {}).get(size) or {}
+    return variants.get(image_format) or variants.get('jpeg') or file.name
@@ -0,0 +1,55 @@
+# backend/images/fields.py
+
+from rest_framework import serializers
+
+from apps.images.derivatives import FORMATS, LIST_SIZE, DETAIL_SIZE, DEFAULT_FORMAT, pick_derivative
+
+IMAGE_SIZE_PARAM = 'image_size'
+IMAGE_FORMAT_PARAM = 'image_format'
+
+
+def requested_variant(request):
+    """
+    (size, format) to serve for this request: the list size on list endpoints
+    and the detail size elsewhere, in WebP, unless ?image_size= (a size name
+    or "original") or ?image_format=jpeg ask for something else.
+    """
+    if request is None:
+        return DETAIL_SIZE, DEFAULT_FORMAT
+    variant = getattr(request, '_image_variant', None)
+    if variant is not None:
+        return variant
+
+    view = (getattr(request, 'parser_context', None) or {}).get('view')
+    if getattr(view, 'action', None) is not None:
+        is_list = view.action == 'list'
+    else:
+        match = getattr(request, 'resolver_match', None)
+        is_list = match is not None and (match.url_name or '').endswith('-list')
+    params = getattr(request, 'query_params', request.GET)
+    image_format = params.get(IMAGE_FORMAT_PARAM)
+    variant = (
+        params.get(IMAGE_SIZE_PARAM) or (LIST_SIZE if is_list else DETAIL_SIZE),
+        image_format if image_format in FORMATS else DEFAULT_FORMAT,
+    )
+    request._image_variant = variant
+    return variant
+
+
+class DerivativeImageField(serializers.ImageField):
+    """
+    ImageField whose URL points at the derivative that suits the request (see
+    ``requested_variant``), or at the original until derivatives have been
+    generated. Uploads work as with ImageField.
+    """
+
+    def to_representation(self, value):
+        return self.fast_representation(value, self.context.get('request'))
+
+    # Also used directly by core.fast_serializers, which passes the request in
+    def fast_representation(self, value, request):
+        if not value:
+            return None
+        name = pick_derivative(value.instance, value.field.name, *requested_variant(request))
+        url = value.storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
@@ -0,0 +1,33 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from apps.images.derivatives import DERIVATIVE_SPECS, needs_derivatives, update_derivatives
+from apps.images.tasks import generate_image_derivatives
+
+
+class Command(BaseCommand):
+    help = "Generate missing or outdated image derivatives for existing uploads."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sync', action='store_true', help="Process in this process instead of queueing tasks.")
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows read per query.")
+
+    def handle(self, *args, **options):
+        for model_label, field_name in DERIVATIVE_SPECS:
+            model = apps.get_model(model_label)
+            rows = (
+                model._default_manager
+                .exclude(**{f'{field_name}__isnull': True}).exclude(**{field_name: ''})
+                .only('pk', field_name, f'{field_name}_derivatives')
+            )
+            count = 0
+            for instance in rows.iterator(chunk_size=options['batch_size']):
+                if not needs_derivatives(instance, field_name):
+                    continue
+                if options['sync']:
+                    update_derivatives(model_label, instance.pk, field_name)
+                else:
+                    generate_image_derivatives.delay(model_label, str(instance.pk), field_name)
+                count += 1
+            action = 'Processed' if options['sync'] else 'Queued'
+            self.stdout.write(f"{action} {count} {model_label}.{field_name} images.")
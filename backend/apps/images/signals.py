@@ -0,0 +1,23 @@
+# backend/images/signals.py
+
+from django.conf import settings
+from django.db.models.signals import post_save
+
+from apps.images.derivatives import DERIVATIVE_SPECS, fields_for, needs_derivatives
+from apps.queueing.enqueue import enqueue
+
+
+def queue_image_derivatives(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Runs after commit (enqueue), so the worker sees the saved file
+    if raw or not settings.IMAGE_DERIVATIVES_ENABLED:
+        return
+    from apps.images.tasks import generate_image_derivatives
+    for field_name in fields_for(sender):
+        if update_fields is not None and field_name not in update_fields:
+            continue
+        if needs_derivatives(instance, field_name):
+            enqueue(generate_image_derivatives.s(sender._meta.label, str(instance.pk), field_name))
+
+
+for model_label in {label for label, _ in DERIVATIVE_SPECS}:
+    post_save.connect(queue_image_derivatives, sender=model_label, dispatch_uid=f'image_derivatives_{model_label}')
@@ -0,0 +1,21 @@
+# backend/images/tasks.py
+
+from celery import shared_task
+
+
+@shared_task(bind=True, max_retries=3, ignore_result=True)
+def generate_image_derivatives(self, model_label, pk, field_name):
+    import logging
+    from apps.images.derivatives import update_derivatives
+    logger = logging.getLogger(__name__)
+    try:
+        derivatives = update_derivatives(model_label, pk, field_name)
+    except OSError as e:
+        # Storage errors; images that cannot be decoded are recorded as failed instead
+        logger.error(f"Error generating derivatives for {model_label}.{field_name} of {pk}: {str(e)}")
+        raise self.retry(exc=e, countdown=60)
+    if derivatives is not None:
+        from apps.booking_app.clinic_cache import bump_clinic_cache_version
+        # Cached clinic payloads embed icons and owner avatars
+        bump_clinic_cache_version()
+        logger.info(f"Generated derivatives for {model_label}.{field_name} of {pk}.")
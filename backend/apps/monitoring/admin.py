@@ -0,0 +1,17 @@
+from django.contrib import admin
+from apps.monitoring.models import ProfileCapture
+
+
+@admin.register(ProfileCapture)
+class ProfileCaptureAdmin(admin.ModelAdmin):
+    list_display = ['captured_at', 'method', 'path', 'view', 'action', 'status_code', 'duration_ms', 'query_count', 'reason']
+    list_filter = ['reason', 'view', 'method']
+    search_fields = ['path', 'view']
+    ordering = ['-captured_at']
+    readonly_fields = [field.name for field in ProfileCapture._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
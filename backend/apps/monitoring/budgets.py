@@ -0,0 +1,32 @@
+# backend/monitoring/budgets.py
+
+import logging
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def get_query_budget(view_class, action):
+    """
+    Viewsets declare ``query_budget`` either as an int for every action or as a
+    dict keyed by action name, with an optional ``'default'`` entry.
+    """
+    budget = getattr(view_class, 'query_budget', None)
+    if isinstance(budget, dict):
+        return budget.get(action, budget.get('default'))
+    return budget
+
+
+def check_query_budget(view_class, action, query_count):
+    budget = get_query_budget(view_class, action)
+    if budget is None or query_count <= budget:
+        return
+    message = f"{view_class.__name__}.{action} ran {query_count} queries, over its budget of {budget}."
+    if settings.QUERY_BUDGET_RAISE:
+        raise QueryBudgetExceeded(message)
+    logger.warning(message)
@@ -0,0 +1,68 @@
+# backend/monitoring/db.py
+
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+from apps.monitoring.metrics import (
+    DB_POOL_CONNECTIONS, DB_POOL_WAITING, DB_POOL_CHECKOUTS, DB_POOL_WAIT_TIME, DB_POOL_ERRORS
+)
+
+
+class QueryRecorder:
+    """
+    ``execute_wrapper`` that counts and times every SQL statement. With
+    ``capture`` it also keeps the statements themselves.
+    """
+
+    def __init__(self, capture=False):
+        self.capture = capture
+        self.count = 0
+        self.duration = 0.0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if self.capture:
+                self.queries.append({
+                    'sql': sql,
+                    'duration': elapsed,
+                    'alias': context['connection'].alias,
+                    'many': many,
+                })
+
+
+@contextmanager
+def record_queries(capture=False):
+    recorder = QueryRecorder(capture=capture)
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+def record_pool_stats():
+    """
+    Publish the state of this process's connection pools. ``pop_stats`` resets
+    the pool counters, so each call adds only what happened since the last one.
+    """
+    from core.db_pool import open_pools
+
+    for alias, pool in open_pools().items():
+        stats = pool.pop_stats()
+        available = stats.get('pool_available', 0)
+        DB_POOL_CONNECTIONS.labels(alias=alias, state='idle').set(available)
+        DB_POOL_CONNECTIONS.labels(alias=alias, state='in_use').set(stats.get('pool_size', 0) - available)
+        DB_POOL_WAITING.labels(alias=alias).set(stats.get('requests_waiting', 0))
+        DB_POOL_CHECKOUTS.labels(alias=alias).inc(stats.get('requests_num', 0))
+        DB_POOL_WAIT_TIME.labels(alias=alias).inc(stats.get('requests_wait_ms', 0) / 1000)
+        for kind in ('requests_errors', 'returns_bad', 'connections_lost'):
+            if stats.get(kind):
+                DB_POOL_ERRORS.labels(alias=alias, kind=kind).inc(stats[kind])
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.fixtures import ensure_fixtures
+from benchmarks.runner import run_benchmark, compare_with_baseline, load_baseline, save_baseline
+from benchmarks.scenarios import SCENARIOS
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+
+
+class Command(BaseCommand):
+    help = "Run the booking API load-test scenarios and compare them with a stored baseline."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=30, help="Seconds to run.")
+        parser.add_argument('--concurrency', type=int, default=4, help="Simulated concurrent clients.")
+        parser.add_argument('--iterations', type=int, help="Stop each client after this many scenarios.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), help="Run only this scenario.")
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="Baseline JSON file.")
+        parser.add_argument('--threshold', type=float, default=0.15, help="Allowed relative regression.")
+        parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline.")
+        parser.add_argument('--output', help="Also write the summary JSON here.")
+
+    def handle(self, *args, **options):
+        fixtures = ensure_fixtures()
+        summary = run_benchmark(
+            fixtures,
+            duration=options['duration'],
+            concurrency=options['concurrency'],
+            iterations=options['iterations'],
+            seed=options['seed'],
+            scenarios=options['scenario'],
+        )
+        self.print_summary(summary)
+
+        if options['output']:
+            save_baseline(options['output'], summary)
+        if options['save_baseline']:
+            save_baseline(options['baseline'], summary)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+            return
+
+        if not Path(options['baseline']).exists():
+            self.stdout.write(self.style.WARNING("No baseline found, skipping comparison."))
+            return
+        regressions = compare_with_baseline(summary, load_baseline(options['baseline']), options['threshold'])
+        if regressions:
+            raise CommandError("Performance regressions:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline."))
+
+    def print_summary(self, summary):
+        header = f"{'endpoint':32} {'reqs':>7} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'queries':>8}"
+        self.stdout.write(header)
+        for name, row in summary['endpoints'].items():
+            self.stdout.write(
+                f"{name:32} {row['requests']:>7} {row['errors']:>5} {row['throughput']:>8.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['queries_per_request']:>8.1f}"
+            )
+        self.stdout.write(f"total: {summary['requests']} requests in {summary['elapsed']:.1f}s ({summary['throughput']:.1f} req/s)")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.connections import run_connection_benchmark
+
+
+class Command(BaseCommand):
+    help = "Compare per-request connection cost with and without the connection pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=500, help="Checkouts per thread.")
+        parser.add_argument('--concurrency', type=int, default=1, help="Concurrent threads.")
+        parser.add_argument('--database', default='default', help="Alias whose settings are benchmarked.")
+
+    def handle(self, *args, **options):
+        summary = run_connection_benchmark(
+            iterations=options['iterations'],
+            concurrency=options['concurrency'],
+            source=options['database'],
+        )
+        self.stdout.write(f"{'mode':10} {'reqs':>7} {'req/s':>9} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for mode, row in summary.items():
+            self.stdout.write(
+                f"{mode:10} {row['requests']:>7} {row['throughput']:>9.1f} "
+                f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f}"
+            )
+        direct, pooled = summary['direct']['p50_ms'], summary['pooled']['p50_ms']
+        if pooled:
+            self.stdout.write(f"p50 speedup with pooling: {direct / pooled:.1f}x")
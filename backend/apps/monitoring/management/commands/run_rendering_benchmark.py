@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.fixtures import ensure_fixtures
+from benchmarks.rendering import run_rendering_benchmark
+
+
+class Command(BaseCommand):
+    help = "Check that the orjson renderer matches DRF's output and compare JSON render/parse times."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50, help="Timed runs per payload (best is reported).")
+        parser.add_argument('--limit', type=int, default=100, help="Rows in the list payloads.")
+
+    def handle(self, *args, **options):
+        try:
+            summary = run_rendering_benchmark(ensure_fixtures(), repeat=options['repeat'], limit=options['limit'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"{'payload':18} {'KB':>8} {'render json':>12} {'render orjson':>14} {'parse json':>11} {'parse orjson':>13}"
+        )
+        for name, row in summary.items():
+            self.stdout.write(
+                f"{name:18} {row['bytes'] / 1024:>8.1f} {row['render_stdlib_ms']:>10.2f}ms {row['render_orjson_ms']:>12.2f}ms "
+                f"{row['parse_stdlib_ms']:>9.2f}ms {row['parse_orjson_ms']:>11.2f}ms"
+            )
+        self.stdout.write("orjson output matched the stdlib renderer byte for byte.")
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.fixtures import ensure_fixtures
+from benchmarks.serialization import run_serialization_benchmark
+
+
+class Command(BaseCommand):
+    help = "Check that compiled serializers match DRF output and compare per-item serialization time."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20, help="Timed runs per serializer (best is reported).")
+        parser.add_argument('--limit', type=int, default=100, help="Rows serialized per run.")
+        parser.add_argument('--serializer', action='append', help="Only this serializer (clinics, doctors, ...).")
+
+    def handle(self, *args, **options):
+        try:
+            summary = run_serialization_benchmark(
+                ensure_fixtures(), repeat=options['repeat'], limit=options['limit'], names=options['serializer']
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(f"{'serializer':14} {'items':>6} {'drf µs':>9} {'fast µs':>9} {'speedup':>8}")
+        for name, row in summary.items():
+            self.stdout.write(
+                f"{name:14} {row['items']:>6} {row['drf_us']:>9.1f} {row['compiled_us']:>9.1f} {row['speedup']:>7.1f}x"
+            )
+        self.stdout.write("Compiled output matched DRF output for every row.")
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from benchmarks.fixtures import ensure_fixtures
+from benchmarks.servers import ENDPOINTS, run_server_benchmark
+
+
+class Command(BaseCommand):
+    help = "Compare WSGI (sync viewsets) and ASGI (async views) throughput at high concurrency."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=20, help="Seconds to run each server.")
+        parser.add_argument('--concurrency', type=int, default=200, help="Concurrent client connections.")
+        parser.add_argument('--workers', type=int, default=4, help="Gunicorn workers for both servers.")
+        parser.add_argument('--endpoint', action='append', choices=list(ENDPOINTS), help="Only this endpoint.")
+        parser.add_argument('--port', type=int, default=8100, help="First of the two local ports to use.")
+
+    def handle(self, *args, **options):
+        summary = run_server_benchmark(
+            ensure_fixtures(),
+            duration=options['duration'],
+            concurrency=options['concurrency'],
+            workers=options['workers'],
+            endpoints=options['endpoint'],
+            base_port=options['port'],
+        )
+        self.stdout.write(f"{'mode':6} {'endpoint':16} {'reqs':>7} {'err':>5} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8}")
+        for mode, result in summary.items():
+            for name, row in result['endpoints'].items():
+                self.stdout.write(
+                    f"{mode:6} {name:16} {row['requests']:>7} {row['errors']:>5} {row['throughput']:>8.1f} "
+                    f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f}"
+                )
+            self.stdout.write(f"{mode:6} total: {result['requests']} requests, {result['throughput']:.1f} req/s")
+        if summary['wsgi']['throughput']:
+            self.stdout.write(f"ASGI/WSGI throughput: {summary['asgi']['throughput'] / summary['wsgi']['throughput']:.2f}x")
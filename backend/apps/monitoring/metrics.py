@@ -0,0 +1,82 @@
+# backend/monitoring/metrics.py
+#
+# Metric definitions shared by the web and Celery processes. When
+# PROMETHEUS_MULTIPROC_DIR is set every process writes its samples to that
+# directory and the /metrics view aggregates them.
+
+from prometheus_client import Counter, Gauge, Histogram
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+HTTP_REQUEST_LATENCY = Histogram(
+    'painfx_http_request_duration_seconds',
+    'HTTP request latency by view and action.',
+    ['view', 'action', 'method', 'status'],
+    buckets=LATENCY_BUCKETS,
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    'painfx_db_queries_per_request',
+    'Number of SQL queries executed per request.',
+    ['view', 'action'],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = Histogram(
+    'painfx_db_query_duration_seconds_per_request',
+    'Total time spent in SQL per request.',
+    ['view', 'action'],
+    buckets=LATENCY_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    'painfx_cache_requests_total',
+    'Cache lookups by cache and result (hit or miss).',
+    ['cache', 'result'],
+)
+CELERY_TASK_RUNTIME = Histogram(
+    'painfx_celery_task_duration_seconds',
+    'Celery task runtime.',
+    ['task', 'state'],
+    buckets=LATENCY_BUCKETS,
+)
+CELERY_TASK_QUEUE_WAIT = Histogram(
+    'painfx_celery_task_queue_wait_seconds',
+    'Time between publishing a task and a worker starting it.',
+    ['task'],
+    buckets=LATENCY_BUCKETS,
+)
+CELERY_TASK_RETRIES = Counter(
+    'painfx_celery_task_retries_total',
+    'Celery task retries.',
+    ['task'],
+)
+DB_POOL_CONNECTIONS = Gauge(
+    'painfx_db_pool_connections',
+    'Pooled database connections by state (in_use or idle).',
+    ['alias', 'state'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_WAITING = Gauge(
+    'painfx_db_pool_requests_waiting',
+    'Clients currently waiting for a pooled connection.',
+    ['alias'],
+    multiprocess_mode='livesum',
+)
+DB_POOL_CHECKOUTS = Counter(
+    'painfx_db_pool_checkouts_total',
+    'Connections handed out by the pool.',
+    ['alias'],
+)
+DB_POOL_WAIT_TIME = Counter(
+    'painfx_db_pool_wait_seconds_total',
+    'Time spent waiting for a pooled connection.',
+    ['alias'],
+)
+DB_POOL_ERRORS = Counter(
+    'painfx_db_pool_errors_total',
+    'Failed checkouts, connections returned broken and connections lost.',
+    ['alias', 'kind'],
+)
+
+
+def record_cache_access(cache_name, hit):
+    CACHE_REQUESTS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
@@ -0,0 +1,69 @@
+# backend/monitoring/middleware.py
+
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from apps.monitoring.budgets import check_query_budget
+from apps.monitoring.db import record_queries
+from apps.monitoring.metrics import HTTP_REQUEST_LATENCY, DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST
+
+
+def get_view_labels(view_func, method):
+    """
+    DRF stores the viewset class and the method -> action mapping on the view
+    function, so ``ClinicViewSet``/``list`` style labels come straight from it.
+    """
+    view_class = getattr(view_func, 'cls', None)
+    if view_class is None:
+        return getattr(view_func, '__name__', 'unknown'), method.lower()
+    actions = getattr(view_func, 'actions', None) or {}
+    return view_class.__name__, actions.get(method.lower(), method.lower())
+
+
+def get_request_labels(request):
+    # resolver_match is set once URL resolution succeeded; 404s stay "unresolved"
+    view_func = getattr(getattr(request, 'resolver_match', None), 'func', None)
+    if view_func is None:
+        return 'unresolved', request.method.lower()
+    return get_view_labels(view_func, request.method)
+
+
+class MetricsMiddleware:
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start, recorder)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        with record_queries() as recorder:
+            response = await self.get_response(request)
+        self.observe(request, response, time.perf_counter() - start, recorder)
+        return response
+
+    def observe(self, request, response, duration, recorder):
+        view, action = get_request_labels(request)
+        HTTP_REQUEST_LATENCY.labels(
+            view=view, action=action, method=request.method, status=response.status_code
+        ).observe(duration)
+        DB_QUERIES_PER_REQUEST.labels(view=view, action=action).observe(recorder.count)
+        DB_TIME_PER_REQUEST.labels(view=view, action=action).observe(recorder.duration)
+
+        view_class = getattr(getattr(request, 'resolver_match', None), 'func', None)
+        view_class = getattr(view_class, 'cls', None)
+        if view_class is not None:
+            check_query_budget(view_class, action, recorder.count)
@@ -0,0 +1,31 @@
+from django.db import models
+
+
+# ---------------------------------------------
+# Request Profiles
+# ---------------------------------------------
+class ProfileCapture(models.Model):
+    # Fixed number of slots reused round-robin, so the table is a bounded ring buffer
+    slot = models.PositiveIntegerField(primary_key=True)
+    captured_at = models.DateTimeField()
+    reason = models.CharField(max_length=10, choices=[("sampled", "Sampled"), ("requested", "Requested")])
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=2048)
+    view = models.CharField(max_length=255)
+    action = models.CharField(max_length=255)
+    status_code = models.PositiveSmallIntegerField()
+    user_id = models.UUIDField(null=True, blank=True)
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    query_time_ms = models.FloatField()
+    profile = models.TextField(blank=True)
+    queries = models.JSONField(default=list)
+    duplicate_queries = models.JSONField(default=list)
+
+    class Meta:
+        indexes = [models.Index(fields=['captured_at'])]
+        verbose_name = "Profile Capture"
+        verbose_name_plural = "Profile Captures"
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms, {self.query_count} queries)"
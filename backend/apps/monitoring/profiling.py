@@ -0,0 +1,178 @@
+# backend/monitoring/profiling.py
+
+import cProfile
+import hashlib
+import io
+import logging
+import pstats
+import random
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import now
+
+from apps.authentication.authentication import CustomJWTAuthentication
+from apps.monitoring.db import record_queries
+from apps.monitoring.middleware import get_request_labels
+from apps.monitoring.models import ProfileCapture
+
+logger = logging.getLogger(__name__)
+
+PROFILE_CURSOR_KEY = 'profiling:cursor'
+
+_IN_LIST_RE = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+def fingerprint_sql(sql):
+    """Collapse parameter lists and literals so repeated statements share a fingerprint."""
+    normalized = _LITERAL_RE.sub('?', _IN_LIST_RE.sub('(...)', sql))
+    return hashlib.md5(normalized.encode()).hexdigest()[:12], normalized
+
+
+def find_duplicate_queries(queries):
+    groups = {}
+    for query in queries:
+        key, normalized = fingerprint_sql(query['sql'])
+        group = groups.setdefault(key, {'fingerprint': key, 'sql': normalized, 'count': 0, 'total_ms': 0.0})
+        group['count'] += 1
+        group['total_ms'] += query['duration'] * 1000
+    duplicates = [group for group in groups.values() if group['count'] > 1]
+    return sorted(duplicates, key=lambda group: group['count'], reverse=True)
+
+
+def next_slot():
+    if cache.add(PROFILE_CURSOR_KEY, 0, timeout=None):
+        return 0
+    try:
+        return cache.incr(PROFILE_CURSOR_KEY) % settings.PROFILING_BUFFER_SIZE
+    except ValueError:
+        return 0
+
+
+class ProfilingMiddleware:
+    """
+    Profiles a sample of requests (or any request from a staff user that sends
+    the profiling header) and keeps slow ones in the ProfileCapture ring buffer.
+    Requests that are not sampled only pay for one random() call. Installed
+    first, so it runs before AuthenticationMiddleware: the staff check
+    authenticates the JWT itself.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        reason = self.get_reason(request)
+        if reason is None:
+            return self.get_response(request)
+
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with record_queries(capture=True) as recorder:
+            try:
+                profiler.enable()
+            except ValueError:
+                # Another profiler is already active in this thread
+                return self.get_response(request)
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.disable()
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if reason == 'requested' or duration_ms >= settings.PROFILING_SLOW_THRESHOLD_MS:
+            try:
+                self.store(request, response, reason, profiler, recorder, duration_ms)
+            except Exception as e:
+                logger.error(f"Error storing request profile: {str(e)}")
+        return response
+
+    async def __acall__(self, request):
+        reason = await self.aget_reason(request)
+        if reason is None:
+            return await self.get_response(request)
+
+        # The profiler sees every coroutine the event loop runs meanwhile, so
+        # async captures are noisier than sync ones
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        with record_queries(capture=True) as recorder:
+            try:
+                profiler.enable()
+            except ValueError:
+                return await self.get_response(request)
+            try:
+                response = await self.get_response(request)
+            finally:
+                profiler.disable()
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        if reason == 'requested' or duration_ms >= settings.PROFILING_SLOW_THRESHOLD_MS:
+            try:
+                await sync_to_async(self.store)(request, response, reason, profiler, recorder, duration_ms)
+            except Exception as e:
+                logger.error(f"Error storing request profile: {str(e)}")
+        return response
+
+    def get_reason(self, request):
+        if settings.PROFILING_HEADER in request.META and self.is_staff(request):
+            return 'requested'
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return 'sampled'
+        return None
+
+    async def aget_reason(self, request):
+        # Only the staff check touches the database, so only it leaves the event loop
+        if settings.PROFILING_HEADER in request.META and await sync_to_async(self.is_staff)(request):
+            return 'requested'
+        if settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE:
+            return 'sampled'
+        return None
+
+    def is_staff(self, request):
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            result = CustomJWTAuthentication().authenticate(request)
+            user = result[0] if result else None
+        return bool(user and user.is_staff)
+
+    def store(self, request, response, reason, profiler, recorder, duration_ms):
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(settings.PROFILING_TOP_FUNCTIONS)
+
+        view, action = get_request_labels(request)
+        user = getattr(request, 'user', None)
+        queries = recorder.queries
+        ProfileCapture.objects.update_or_create(
+            slot=next_slot(),
+            defaults={
+                'captured_at': now(),
+                'reason': reason,
+                'method': request.method,
+                'path': request.get_full_path()[:2048],
+                'view': view,
+                'action': action,
+                'status_code': response.status_code,
+                'user_id': user.id if user is not None and user.is_authenticated else None,
+                'duration_ms': duration_ms,
+                'query_count': recorder.count,
+                'query_time_ms': recorder.duration * 1000,
+                'profile': stream.getvalue(),
+                'queries': [
+                    {'sql': query['sql'], 'duration_ms': query['duration'] * 1000, 'alias': query['alias']}
+                    for query in queries[:settings.PROFILING_MAX_QUERIES]
+                ],
+                'duplicate_queries': find_duplicate_queries(queries),
+            },
+        )
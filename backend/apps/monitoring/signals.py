@@ -0,0 +1,84 @@
+# backend/monitoring/signals.py
+
+import logging
+import os
+import shutil
+import time
+
+from celery.signals import (
+    before_task_publish, task_prerun, task_postrun, task_retry, worker_init, worker_process_shutdown
+)
+from django.conf import settings
+from django.core.signals import request_finished
+from django.dispatch import receiver
+
+from apps.monitoring.db import record_pool_stats
+from apps.monitoring.metrics import CELERY_TASK_RUNTIME, CELERY_TASK_QUEUE_WAIT, CELERY_TASK_RETRIES
+
+logger = logging.getLogger(__name__)
+
+_task_started = {}
+
+
+@before_task_publish.connect
+def stamp_published_at(sender=None, headers=None, **kwargs):
+    if headers is not None:
+        headers.setdefault('published_at', time.time())
+
+
+@task_prerun.connect
+def start_task_timer(sender=None, task_id=None, task=None, **kwargs):
+    started = time.time()
+    _task_started[task_id] = time.perf_counter()
+    published_at = getattr(task.request, 'published_at', None)
+    if published_at:
+        CELERY_TASK_QUEUE_WAIT.labels(task=sender.name).observe(max(started - published_at, 0))
+
+
+@task_postrun.connect
+def stop_task_timer(sender=None, task_id=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        CELERY_TASK_RUNTIME.labels(task=sender.name, state=state or 'UNKNOWN').observe(
+            time.perf_counter() - started
+        )
+
+
+@task_postrun.connect
+@receiver(request_finished)
+def publish_pool_stats(**kwargs):
+    # Connected after Django's own request_finished handler, so the request's
+    # connection is already back in the pool when the gauges are read
+    record_pool_stats()
+
+
+@task_retry.connect
+def count_task_retry(sender=None, **kwargs):
+    CELERY_TASK_RETRIES.labels(task=sender.name).inc()
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    # Runs once in the worker's main process, before the pool forks
+    from prometheus_client import CollectorRegistry, start_http_server, multiprocess
+
+    multiproc_dir = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if multiproc_dir:
+        shutil.rmtree(multiproc_dir, ignore_errors=True)
+        os.makedirs(multiproc_dir, exist_ok=True)
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        from prometheus_client import REGISTRY as registry
+    try:
+        start_http_server(settings.CELERY_METRICS_PORT, registry=registry)
+        logger.info(f"Celery metrics exported on port {settings.CELERY_METRICS_PORT}.")
+    except OSError as e:
+        logger.error(f"Could not start Celery metrics server: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def mark_worker_process_dead(pid=None, **kwargs):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(pid or os.getpid())
@@ -0,0 +1,14 @@
+from django.contrib import admin
+from apps.queueing.models import TaskOutbox
+
+
+@admin.register(TaskOutbox)
+class TaskOutboxAdmin(admin.ModelAdmin):
+    list_display = ['task', 'created_at', 'published_at', 'attempts']
+    list_filter = ['task']
+    search_fields = ['task']
+    ordering = ['-created_at']
+    readonly_fields = [field.name for field in TaskOutbox._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
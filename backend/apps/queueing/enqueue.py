@@ -0,0 +1,125 @@
+# backend/queueing/enqueue.py
+
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+from django.utils.timezone import now
+
+from apps.queueing.models import TaskOutbox
+from core.celery import app
+
+logger = logging.getLogger(__name__)
+
+# (signature, outbox entry id) pairs committed inside the current batch
+_pending = ContextVar('pending_tasks', default=None)
+
+
+def enqueue(signature, outbox=None, using=DEFAULT_DB_ALIAS):
+    """
+    Publish ``signature`` (e.g. ``send_email_notification.s(...)``) once the
+    current transaction commits; nothing is sent if it rolls back. Inside a
+    request, publishing waits for the end of the request and goes out with
+    the request's other tasks. With ``outbox`` (default TASK_OUTBOX_ENABLED)
+    the task is also recorded in the same transaction, and the relay delivers
+    it if the process dies before publishing.
+    """
+    if outbox is None:
+        outbox = settings.TASK_OUTBOX_ENABLED
+    entry_id = None
+    if outbox:
+        entry_id = TaskOutbox.objects.using(using).create(
+            task=signature.task,
+            args=list(signature.args),
+            kwargs=dict(signature.kwargs),
+            options=dict(signature.options),
+        ).id
+    transaction.on_commit(lambda: _dispatch(signature, entry_id), using=using)
+
+
+def _dispatch(signature, entry_id):
+    pending = _pending.get()
+    if pending is not None:
+        pending.append((signature, entry_id))
+    else:
+        publish([(signature, entry_id)])
+
+
+def publish(entries):
+    """
+    Send ``(signature, outbox entry id)`` pairs over one broker connection
+    and mark their outbox entries published. Returns the number sent.
+    """
+    sent = []
+    try:
+        with app.producer_or_acquire() as producer:
+            for signature, entry_id in entries:
+                try:
+                    signature.apply_async(producer=producer)
+                except Exception as e:
+                    logger.error(f"Could not publish {signature.task}: {str(e)}")
+                    continue
+                sent.append(entry_id)
+    except Exception as e:
+        logger.error(f"Could not connect to the broker to publish {len(entries)} tasks: {str(e)}")
+
+    published_ids = [entry_id for entry_id in sent if entry_id]
+    if published_ids:
+        TaskOutbox.objects.filter(id__in=published_ids).update(published_at=now())
+    return len(sent)
+
+
+@contextmanager
+def collect_enqueues():
+    """Hold tasks committed inside the block in the yielded list instead of publishing them."""
+    pending = []
+    token = _pending.set(pending)
+    try:
+        yield pending
+    finally:
+        _pending.reset(token)
+
+
+@contextmanager
+def batch_enqueues():
+    """Hold tasks committed inside the block and publish them together on exit."""
+    with collect_enqueues() as pending:
+        try:
+            yield pending
+        finally:
+            if pending:
+                publish(pending)
+
+
+def relay_outbox(batch_size=None):
+    """
+    Publish outbox entries left unpublished for longer than
+    TASK_OUTBOX_RELAY_DELAY. Delivery is at least once: an entry published
+    right before a crash may be sent again, so outbox tasks must be idempotent.
+    """
+    batch_size = batch_size or settings.TASK_OUTBOX_BATCH_SIZE
+    cutoff = now() - timedelta(seconds=settings.TASK_OUTBOX_RELAY_DELAY)
+    relayed = 0
+    while True:
+        with transaction.atomic():
+            entries = list(
+                TaskOutbox.objects
+                .select_for_update(skip_locked=True)
+                .filter(published_at__isnull=True, created_at__lt=cutoff)
+                .order_by('created_at')[:batch_size]
+            )
+            if not entries:
+                break
+            TaskOutbox.objects.filter(id__in=[entry.id for entry in entries]).update(attempts=F('attempts') + 1)
+            sent = publish([(entry.signature(), entry.id) for entry in entries])
+        relayed += sent
+        if sent < len(entries) or len(entries) < batch_size:
+            break
+
+    retention = now() - timedelta(days=settings.TASK_OUTBOX_RETENTION_DAYS)
+    TaskOutbox.objects.filter(published_at__lt=retention).delete()
+    return relayed
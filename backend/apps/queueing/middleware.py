@@ -0,0 +1,31 @@
+# backend/queueing/middleware.py
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from apps.queueing.enqueue import batch_enqueues, collect_enqueues, publish
+
+
+class TaskBatchMiddleware:
+    """Publish every task the request enqueued in one batch once the view is done."""
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with batch_enqueues():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with collect_enqueues() as pending:
+            try:
+                return await self.get_response(request)
+            finally:
+                if pending:
+                    await sync_to_async(publish)(pending)
@@ -0,0 +1,37 @@
+import uuid
+
+from celery import signature
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+# ---------------------------------------------
+# Task Outbox
+# ---------------------------------------------
+class TaskOutbox(models.Model):
+    # Written in the same transaction as the data a task depends on; the relay
+    # publishes anything the request itself did not get to publish.
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    kwargs = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    options = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['created_at'], name='idx_task_outbox_pending', condition=models.Q(published_at__isnull=True)
+            ),
+            models.Index(fields=['published_at'], name='idx_task_outbox_published_at'),
+        ]
+        verbose_name = "Task Outbox Entry"
+        verbose_name_plural = "Task Outbox"
+
+    def __str__(self):
+        return f"{self.task} ({'published' if self.published_at else 'pending'})"
+
+    def signature(self):
+        return signature(self.task, args=self.args, kwargs=self.kwargs, options=self.options)
@@ -0,0 +1,14 @@
+# backend/queueing/tasks.py
+
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def relay_task_outbox():
+    import logging
+    from apps.queueing.enqueue import relay_outbox
+    logger = logging.getLogger(__name__)
+    relayed = relay_outbox()
+    if relayed:
+        logger.info(f"Relayed {relayed} tasks from the outbox.")
+    return relayed
@@ -0,0 +1,27 @@
+"""
+Benchmark suite for the booking API.
+
+Requests are driven in-process through Django's test client against the
+configured Postgres and Redis, e.g. the docker-compose services:
+
+    docker compose up -d db redis
+    python manage.py run_benchmarks --duration 60 --concurrency 8
+    python manage.py run_benchmarks --save-baseline
+    python manage.py run_benchmarks --baseline benchmarks/baseline.json --threshold 0.15
+
+Connection setup cost, pooled against a fresh connection per request:
+
+    python manage.py run_connection_benchmark --iterations 500 --concurrency 4
+
+WSGI against ASGI (real gunicorn servers on local ports, aiohttp clients):
+
+    python manage.py run_server_benchmark --concurrency 200 --workers 4
+
+Per-item serialization time, DRF against compiled serializers (with a parity check):
+
+    python manage.py run_serialization_benchmark --limit 100
+
+JSON render/parse time, stdlib against orjson (with a byte-for-byte format check):
+
+    python manage.py run_rendering_benchmark --limit 100
+"""
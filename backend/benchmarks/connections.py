@@ -0,0 +1,82 @@
+# backend/benchmarks/connections.py
+#
+# Measures what one request pays for its database connection: a checkout,
+# a trivial query and the close Django performs when the request finishes.
+# "direct" opens a new Postgres connection every time, "pooled" borrows one
+# from a psycopg pool.
+
+import threading
+import time
+
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from benchmarks.runner import percentile
+
+BENCHMARK_POOL = {'min_size': 1, 'max_size': 4, 'timeout': 10.0}
+
+
+def _register_alias(alias, source, pool):
+    settings_dict = dict(connections.settings[source])
+    options = {key: value for key, value in settings_dict.get('OPTIONS', {}).items() if key != 'pool'}
+    if pool:
+        options['pool'] = settings_dict.get('OPTIONS', {}).get('pool') or BENCHMARK_POOL
+    # The source settings are already normalised, so the copy can be registered as is
+    settings_dict.update(OPTIONS=options, CONN_MAX_AGE=0)
+    connections.settings[alias] = settings_dict
+
+
+def _drop_alias(alias):
+    connection = connections[alias]
+    connection.close()
+    if connection.pool:
+        connection.close_pool()
+    del connections[alias]
+    del connections.settings[alias]
+
+
+def _worker(alias, iterations, samples, lock):
+    local = []
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            connection = connections[alias]
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            connection.close()
+            local.append(time.perf_counter() - start)
+    finally:
+        connections[alias].close()
+    with lock:
+        samples.extend(local)
+
+
+def run_connection_benchmark(iterations=500, concurrency=1, source=DEFAULT_DB_ALIAS):
+    summary = {}
+    for mode, pool in (('direct', False), ('pooled', True)):
+        alias = f'benchmark_{mode}'
+        _register_alias(alias, source, pool)
+        samples, lock = [], threading.Lock()
+        try:
+            # Warm up once so pool start-up is not part of the measurement
+            _worker(alias, 1, [], lock)
+            threads = [
+                threading.Thread(target=_worker, args=(alias, iterations, samples, lock))
+                for _ in range(concurrency)
+            ]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - start
+        finally:
+            _drop_alias(alias)
+        summary[mode] = {
+            'requests': len(samples),
+            'throughput': len(samples) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(samples, 0.50) * 1000,
+            'p95_ms': percentile(samples, 0.95) * 1000,
+            'p99_ms': percentile(samples, 0.99) * 1000,
+        }
+    return summary
@@ -0,0 +1,67 @@
+# backend/benchmarks/fixtures.py
+
+import datetime
+
+from apps.authentication.models import User, Doctor, Specialization
+from apps.booking_app.models import Clinic, ClinicDoctor, Post, Notification
+
+BENCH_PASSWORD = 'bench-password'
+BENCH_DOMAIN = 'bench.painfx.local'
+
+
+def _user(email, role, **extra):
+    user = User.objects.filter(email=email).first()
+    if user is None:
+        user = User.objects.create_user(email=email, password=BENCH_PASSWORD, role=role, **extra)
+    return user
+
+
+def ensure_fixtures(clinics=5, doctors_per_clinic=4, patients=20, posts_per_doctor=3):
+    """
+    Create (once) a small, fixed data set the scenarios can act on. For
+    realistic volumes load the database with ``seed_painfx`` first.
+    """
+    specialization, _ = Specialization.objects.get_or_create(name='Physiotherapy')
+    clinic_ids = []
+    doctor_ids = []
+    owner_ids = []
+
+    for clinic_index in range(clinics):
+        owner = _user(f'owner{clinic_index}@{BENCH_DOMAIN}', 'clinic', first_name='Owner', last_name=str(clinic_index))
+        clinic = Clinic.objects.filter(owner=owner).first()
+        if clinic is None:
+            clinic = Clinic.objects.create(
+                name=f'Bench Clinic {clinic_index}', owner=owner, specialization=specialization,
+                active=True, reservation_open=True, address=f'{clinic_index} Bench Street',
+            )
+        clinic_ids.append(clinic.id)
+        owner_ids.append(owner.id)
+
+        for doctor_index in range(doctors_per_clinic):
+            user = _user(
+                f'doctor{clinic_index}-{doctor_index}@{BENCH_DOMAIN}', 'doctor',
+                first_name='Doctor', last_name=f'{clinic_index}-{doctor_index}',
+            )
+            doctor, _ = Doctor.objects.get_or_create(user=user, defaults={'specialization': specialization})
+            ClinicDoctor.objects.get_or_create(clinic=clinic, doctor=doctor)
+            doctor_ids.append(doctor.pk)
+            for post_index in range(posts_per_doctor - Post.objects.filter(doctor=doctor).count()):
+                Post.objects.create(doctor=doctor, title=f'Bench post {post_index}', content='Stretching routine.')
+
+    patient_ids = []
+    for patient_index in range(patients):
+        patient = _user(f'patient{patient_index}@{BENCH_DOMAIN}', 'patient', first_name='Patient', last_name=str(patient_index))
+        patient_ids.append(patient.id)
+        if not Notification.objects.filter(user=patient).exists():
+            Notification.objects.bulk_create(
+                Notification(user=patient, message=f'Welcome message {index}') for index in range(5)
+            )
+
+    return {
+        'clinic_ids': clinic_ids,
+        'owner_ids': owner_ids,
+        'doctor_ids': doctor_ids,
+        'patient_ids': patient_ids,
+        'post_ids': list(Post.objects.filter(doctor_id__in=doctor_ids).values_list('id', flat=True)),
+        'reservation_date': (datetime.date.today() + datetime.timedelta(days=7)).isoformat(),
+    }
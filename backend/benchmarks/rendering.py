@@ -0,0 +1,107 @@
+# backend/benchmarks/rendering.py
+#
+# JSON rendering and parsing cost, DRF's stdlib-based renderer/parser against
+# the orjson ones in core.renderers and core.parsers. Output must be
+# byte-for-byte identical: a set of edge-case values plus every benchmarked
+# payload are compared before anything is timed.
+
+import datetime
+import decimal
+import io
+import time
+import uuid
+from datetime import timedelta
+
+from django.test import RequestFactory
+from django.utils.timezone import now
+from django.utils.translation import gettext_lazy
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.booking_app.analytics import clinic_dashboard
+from apps.booking_app.models import Clinic, Reservation
+from apps.booking_app.serializers import ClinicSerializer, ReservationSerializer
+from apps.booking_app.views import with_doctor_summary
+from core.dynamic_fields import eager_load
+from core.fast_serializers import serialize
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+FORMAT_SAMPLES = {
+    'uuid': uuid.UUID('7d3e5c1a-9a4b-4a8e-8f7e-3c2d1b0a9f8e'),
+    'naive_datetime': datetime.datetime(2024, 5, 17, 9, 30, 0, 123456),
+    'utc_datetime': datetime.datetime(2024, 5, 17, 9, 30, tzinfo=datetime.timezone.utc),
+    'offset_datetime': datetime.datetime(2024, 5, 17, 9, 30, 15, tzinfo=datetime.timezone(timedelta(hours=2))),
+    'date': datetime.date(2024, 5, 17),
+    'time': datetime.time(9, 30, 15),
+    'decimal': decimal.Decimal('1249.50'),
+    'decimal_exponent': decimal.Decimal('1E+2'),
+    'timedelta': timedelta(minutes=90),
+    'lazy_text': gettext_lazy('Reservation approved'),
+    'int_keys': {1: 'one', 2: [1.5, None, True]},
+    'line_separators': 'first\u2028second\u2029third',
+    'unicode': 'Zürich — クリニック',
+}
+
+
+def check_format():
+    """Names of FORMAT_SAMPLES values (and the whole set) whose orjson rendering differs from DRF's."""
+    samples = dict(FORMAT_SAMPLES, all_samples=FORMAT_SAMPLES)
+    return [
+        name for name, value in samples.items()
+        if ORJSONRenderer().render({name: value}) != JSONRenderer().render({name: value})
+    ]
+
+
+def build_payloads(fixtures, limit=100):
+    request = RequestFactory().get('/api/clinics/')
+    clinic_serializer = ClinicSerializer()
+    clinics = list(eager_load(with_doctor_summary(Clinic.objects.all(), clinic_serializer), clinic_serializer)[:limit])
+    reservations = list(Reservation.objects.select_related('patient__user__userprofile')[:limit])
+    clinic = Clinic.objects.get(id=fixtures['clinic_ids'][0])
+    today = now().date()
+    return {
+        'clinic_list': {'count': len(clinics), 'next': None, 'previous': None,
+                        'results': serialize(ClinicSerializer, clinics, request)},
+        'clinic_list_drf': ClinicSerializer(clinics, many=True, context={'request': request}).data,
+        'reservation_list': {'count': len(reservations), 'next': None, 'previous': None,
+                             'results': serialize(ReservationSerializer, reservations, request)},
+        'clinic_dashboard': clinic_dashboard(clinic, today - timedelta(days=365), today),
+    }
+
+
+def _best(function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_rendering_benchmark(fixtures, repeat=50, limit=100):
+    """
+    Per payload: size and best-of-``repeat`` render and parse times in ms.
+    Raises ValueError if the orjson output differs from DRF's anywhere.
+    """
+    mismatches = check_format()
+    if mismatches:
+        raise ValueError(f"orjson output differs for: {', '.join(mismatches)}")
+
+    summary = {}
+    for name, data in build_payloads(fixtures, limit).items():
+        stdlib_bytes = JSONRenderer().render(data)
+        if ORJSONRenderer().render(data) != stdlib_bytes:
+            raise ValueError(f"orjson output differs for the {name} payload")
+        if ORJSONParser().parse(io.BytesIO(stdlib_bytes)) != JSONParser().parse(io.BytesIO(stdlib_bytes)):
+            raise ValueError(f"orjson parsing differs for the {name} payload")
+
+        summary[name] = {
+            'bytes': len(stdlib_bytes),
+            'render_stdlib_ms': _best(lambda: JSONRenderer().render(data), repeat) * 1000,
+            'render_orjson_ms': _best(lambda: ORJSONRenderer().render(data), repeat) * 1000,
+            'parse_stdlib_ms': _best(lambda: JSONParser().parse(io.BytesIO(stdlib_bytes)), repeat) * 1000,
+            'parse_orjson_ms': _best(lambda: ORJSONParser().parse(io.BytesIO(stdlib_bytes)), repeat) * 1000,
+        }
+    return summary
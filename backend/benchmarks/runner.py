@@ -0,0 +1,151 @@
+# backend/benchmarks/runner.py
+
+import json
+import math
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.db import connections
+from django.test import Client
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication.models import User
+from apps.monitoring.db import record_queries
+from benchmarks.scenarios import SCENARIOS
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def add(self, name, seconds, query_count, ok):
+        with self.lock:
+            self.samples[name].append(seconds)
+            self.queries[name].append(query_count)
+            if not ok:
+                self.errors[name] += 1
+
+    def summary(self, elapsed):
+        endpoints = {}
+        for name, samples in sorted(self.samples.items()):
+            queries = self.queries[name]
+            endpoints[name] = {
+                'requests': len(samples),
+                'errors': self.errors[name],
+                'throughput': len(samples) / elapsed if elapsed else 0.0,
+                'p50_ms': percentile(samples, 0.50) * 1000,
+                'p95_ms': percentile(samples, 0.95) * 1000,
+                'p99_ms': percentile(samples, 0.99) * 1000,
+                'queries_per_request': sum(queries) / len(queries),
+            }
+        total = sum(len(samples) for samples in self.samples.values())
+        return {
+            'elapsed': elapsed,
+            'requests': total,
+            'throughput': total / elapsed if elapsed else 0.0,
+            'endpoints': endpoints,
+        }
+
+
+class Session:
+    """One simulated client: its own test client, token cache and random stream."""
+
+    def __init__(self, fixtures, results, seed):
+        self.client = Client()
+        self.fixtures = fixtures
+        self.results = results
+        self.rng = random.Random(seed)
+        self.tokens = {}
+
+    def pick(self, key):
+        return self.rng.choice(self.fixtures[key])
+
+    def auth_header(self, user_id):
+        if user_id not in self.tokens:
+            self.tokens[user_id] = f'Bearer {AccessToken.for_user(User.objects.get(id=user_id))}'
+        return {'HTTP_AUTHORIZATION': self.tokens[user_id]}
+
+    def request(self, name, method, path, user_id, data=None):
+        headers = self.auth_header(user_id)
+        kwargs = {'data': data, 'content_type': 'application/json'} if data is not None else {}
+        start = time.perf_counter()
+        with record_queries() as recorder:
+            response = getattr(self.client, method)(path, **kwargs, **headers)
+        self.results.add(name, time.perf_counter() - start, recorder.count, response.status_code < 400)
+        return response
+
+
+def _worker(fixtures, results, seed, deadline, iterations, scenarios):
+    session = Session(fixtures, results, seed)
+    names = list(scenarios)
+    weights = [scenarios[name][1] for name in names]
+    done = 0
+    try:
+        while time.monotonic() < deadline and (iterations is None or done < iterations):
+            scenario = scenarios[session.rng.choices(names, weights)[0]][0]
+            scenario(session)
+            done += 1
+    finally:
+        connections.close_all()
+
+
+def run_benchmark(fixtures, duration=30, concurrency=4, iterations=None, seed=0, scenarios=None):
+    scenarios = {name: SCENARIOS[name] for name in scenarios} if scenarios else SCENARIOS
+    results = Results()
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(target=_worker, args=(fixtures, results, seed + index, deadline, iterations, scenarios))
+        for index in range(concurrency)
+    ]
+    # The test client talks to "testserver"; metrics middleware and profiler stay enabled
+    with override_settings(ALLOWED_HOSTS=['*']):
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+    return results.summary(elapsed)
+
+
+def compare_with_baseline(summary, baseline, threshold):
+    """Return a list of human readable regressions against a stored baseline."""
+    regressions = []
+    for name, current in summary['endpoints'].items():
+        previous = baseline.get('endpoints', {}).get(name)
+        if not previous:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request'):
+            limit = previous[metric] * (1 + threshold)
+            if current[metric] > limit and current[metric] - previous[metric] > 0.5:
+                regressions.append(
+                    f"{name} {metric}: {current[metric]:.2f} > {previous[metric]:.2f} (+{threshold:.0%} allowed)"
+                )
+    baseline_throughput = baseline.get('throughput')
+    if baseline_throughput and summary['throughput'] < baseline_throughput * (1 - threshold):
+        regressions.append(f"throughput: {summary['throughput']:.1f} < {baseline_throughput:.1f} req/s")
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, summary):
+    with open(path, 'w') as f:
+        json.dump(summary, f, indent=2, sort_keys=True)
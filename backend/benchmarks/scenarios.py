@@ -0,0 +1,58 @@
+# backend/benchmarks/scenarios.py
+#
+# Each scenario is one user journey; ``run_benchmark`` picks them by weight
+# to reproduce the production traffic mix.
+
+
+def browse_clinics(session):
+    patient = session.pick('patient_ids')
+    session.request('clinics.list', 'get', '/api/clinics/', patient)
+    clinic_id = session.pick('clinic_ids')
+    session.request('clinics.retrieve', 'get', f'/api/clinics/{clinic_id}/', patient)
+
+
+def book_and_approve(session):
+    index = session.rng.randrange(len(session.fixtures['clinic_ids']))
+    clinic_id = session.fixtures['clinic_ids'][index]
+    owner = session.fixtures['owner_ids'][index]
+    response = session.request('reservations.create', 'post', '/api/reservations/', session.pick('patient_ids'), {
+        'clinic': str(clinic_id),
+        'reservation_date': session.fixtures['reservation_date'],
+        'reservation_time': f'{session.rng.randint(8, 17):02d}:00',
+    })
+    if response.status_code == 201:
+        reservation_id = response.json()['id']
+        session.request('reservations.approve', 'post', f'/api/reservations/{reservation_id}/approve/', owner)
+
+
+def read_feed(session):
+    session.request('posts.list', 'get', '/api/posts/', session.pick('patient_ids'))
+
+
+def like_and_comment(session):
+    patient = session.pick('patient_ids')
+    post_id = session.pick('post_ids')
+    response = session.request('likes.create', 'post', '/api/likes/', patient, {'post': str(post_id)})
+    session.request('comments.create', 'post', '/api/comments/', patient, {
+        'post': str(post_id), 'comment_text': 'Thanks, this helped.',
+    })
+    if response.status_code == 201:
+        # Unlike again so the (post, user) pair can be liked on the next run
+        like_id = response.json()['id']
+        session.request('likes.destroy', 'delete', f'/api/likes/{like_id}/?post_id={post_id}', patient)
+
+
+def poll_notifications(session):
+    patient = session.pick('patient_ids')
+    session.request('notifications.unread_count', 'get', '/api/notifications/unread-count/', patient)
+    session.request('notifications.list', 'get', '/api/notifications/?unread=true', patient)
+
+
+# Relative weights of each journey in the default traffic profile
+SCENARIOS = {
+    'browse_clinics': (browse_clinics, 30),
+    'read_feed': (read_feed, 25),
+    'poll_notifications': (poll_notifications, 25),
+    'like_and_comment': (like_and_comment, 10),
+    'book_and_approve': (book_and_approve, 10),
+}
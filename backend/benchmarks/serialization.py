@@ -0,0 +1,89 @@
+# backend/benchmarks/serialization.py
+#
+# Per-item serialization cost of the list serializers, DRF against the
+# compiled serializers from core.fast_serializers. Rows are loaded once (with
+# the same eager loading as the viewsets) so only serialization is timed, and
+# both outputs are compared row by row before anything is measured.
+
+import time
+
+from django.db.models import Count
+from django.test import RequestFactory
+
+from apps.authentication.models import Doctor
+from apps.authentication.serializers import DoctorSerializer
+from apps.booking_app.models import Clinic, Post, Reservation, Notification
+from apps.booking_app.serializers import ClinicSerializer, PostSerializer, ReservationSerializer, NotificationSerializer
+from apps.booking_app.views import with_doctor_summary
+from core.dynamic_fields import eager_load
+from core.fast_serializers import compile_serializer, find_mismatches
+
+
+def _querysets(fixtures):
+    doctors = Doctor.objects.select_related('user__userprofile', 'specialization')
+    clinic_serializer = ClinicSerializer()
+    return {
+        'clinics': (
+            ClinicSerializer,
+            eager_load(with_doctor_summary(Clinic.objects.filter(id__in=fixtures['clinic_ids']), clinic_serializer), clinic_serializer),
+        ),
+        'doctors': (DoctorSerializer, doctors.filter(user_id__in=fixtures['doctor_ids'])),
+        'posts': (
+            PostSerializer,
+            Post.objects.filter(id__in=fixtures['post_ids'])
+            .select_related('doctor__user__userprofile', 'doctor__specialization')
+            .annotate(likes_count=Count('like', distinct=True), comments_count=Count('comment', distinct=True)),
+        ),
+        'reservations': (
+            ReservationSerializer,
+            Reservation.objects.filter(patient_id__in=fixtures['patient_ids']).select_related('patient__user__userprofile'),
+        ),
+        'notifications': (NotificationSerializer, Notification.objects.filter(user_id__in=fixtures['patient_ids'])),
+    }
+
+
+def _time_per_item(serialize, instances, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serialize(instances)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(instances)
+
+
+def run_serialization_benchmark(fixtures, repeat=20, limit=100, names=None):
+    """
+    Returns, per serializer, µs per item for DRF and the compiled serializer.
+    Raises ValueError when the two outputs differ for any row.
+    """
+    request = RequestFactory().get('/api/')
+    summary = {}
+    for name, (serializer_class, queryset) in _querysets(fixtures).items():
+        if names and name not in names:
+            continue
+        instances = list(queryset[:limit])
+        if not instances:
+            continue
+        represent = compile_serializer(serializer_class)
+        if represent is None:
+            raise ValueError(f"{serializer_class.__name__} cannot be compiled")
+        mismatches = find_mismatches(serializer_class, instances, request)
+        if mismatches:
+            index, compiled, drf = mismatches[0]
+            raise ValueError(
+                f"{serializer_class.__name__} output differs on {len(mismatches)} rows; "
+                f"row {index}: compiled={compiled!r} drf={drf!r}"
+            )
+
+        drf_time = _time_per_item(
+            lambda rows: serializer_class(rows, many=True, context={'request': request}).data, instances, repeat
+        )
+        compiled_time = _time_per_item(lambda rows: [represent(row, request) for row in rows], instances, repeat)
+        summary[name] = {
+            'items': len(instances),
+            'drf_us': drf_time * 1e6,
+            'compiled_us': compiled_time * 1e6,
+            'speedup': drf_time / compiled_time if compiled_time else 0.0,
+        }
+    return summary
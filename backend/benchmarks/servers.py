@@ -0,0 +1,137 @@
+# backend/benchmarks/servers.py
+#
+# WSGI against ASGI throughput at high concurrency. Each mode runs as a real
+# gunicorn server (sync workers or uvicorn workers, same worker count) in a
+# subprocess; aiohttp clients then hit the sync viewset endpoints on the WSGI
+# server and their async variants on the ASGI server.
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import aiohttp
+from django.conf import settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.authentication.models import User
+from benchmarks.runner import percentile
+
+# name -> (WSGI path, ASGI path)
+ENDPOINTS = {
+    'clinic_list': ('/api/clinics/', '/api/async/clinics/'),
+    'clinic_detail': ('/api/clinics/{clinic}/', '/api/async/clinics/{clinic}/'),
+    'doctor_list': ('/api/doctors/', '/api/async/doctors/'),
+    'notifications': ('/api/notifications/', '/api/async/notifications/'),
+    'reservations': ('/api/reservations/', '/api/async/reservations/'),
+}
+MODES = ('wsgi', 'asgi')
+APPLICATIONS = {'wsgi': 'core.wsgi:application', 'asgi': 'core.asgi:application'}
+
+
+def start_server(mode, port, workers):
+    # gunicorn.conf.py switches to uvicorn workers when SERVER_MODE=asgi
+    env = dict(os.environ, SERVER_MODE=mode, DATABASE_PROCESS_TYPE='asgi' if mode == 'asgi' else 'web')
+    command = [
+        sys.executable, '-m', 'gunicorn', APPLICATIONS[mode],
+        '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--log-level', 'warning',
+    ]
+    return subprocess.Popen(command, cwd=settings.BASE_DIR, env=env)
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+async def wait_until_ready(base_url, timeout=60):
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(base_url + '/') as response:
+                    if response.status < 500:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not start within {timeout}s.")
+
+
+async def _client(session, base_url, requests, deadline, samples, errors, offset):
+    index = offset
+    while time.monotonic() < deadline:
+        name, path = requests[index % len(requests)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            async with session.get(base_url + path) as response:
+                await response.read()
+                ok = response.status < 400
+        except aiohttp.ClientError:
+            ok = False
+        samples[name].append(time.perf_counter() - start)
+        if not ok:
+            errors[name] += 1
+
+
+async def drive(base_url, requests, headers, concurrency, duration):
+    samples, errors = defaultdict(list), defaultdict(int)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        # Short warm-up so connection pools and caches are populated in every worker
+        await asyncio.gather(*(
+            _client(session, base_url, requests, time.monotonic() + 2, defaultdict(list), defaultdict(int), index)
+            for index in range(concurrency)
+        ))
+        start = time.monotonic()
+        await asyncio.gather(*(
+            _client(session, base_url, requests, start + duration, samples, errors, index)
+            for index in range(concurrency)
+        ))
+        elapsed = time.monotonic() - start
+    return samples, errors, elapsed
+
+
+def summarize(samples, errors, elapsed):
+    endpoints = {
+        name: {
+            'requests': len(values),
+            'errors': errors[name],
+            'throughput': len(values) / elapsed,
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+        }
+        for name, values in sorted(samples.items())
+    }
+    total = sum(len(values) for values in samples.values())
+    return {'elapsed': elapsed, 'requests': total, 'throughput': total / elapsed, 'endpoints': endpoints}
+
+
+def run_server_benchmark(fixtures, duration=20, concurrency=200, workers=4, endpoints=None, base_port=8100):
+    user = User.objects.get(id=fixtures['patient_ids'][0])
+    headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+    names = endpoints or list(ENDPOINTS)
+
+    summary = {}
+    for column, mode in enumerate(MODES):
+        requests = [
+            (name, ENDPOINTS[name][column].format(clinic=fixtures['clinic_ids'][0]))
+            for name in names
+        ]
+        port = base_port + column
+        base_url = f'http://127.0.0.1:{port}'
+        process = start_server(mode, port, workers)
+        try:
+            asyncio.run(wait_until_ready(base_url))
+            samples, errors, elapsed = asyncio.run(drive(base_url, requests, headers, concurrency, duration))
+        finally:
+            stop_server(process)
+        summary[mode] = summarize(samples, errors, elapsed)
+    return summary
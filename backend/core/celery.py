@@ -1,5 +1,6 @@
 import os
 from celery import Celery
+from celery.signals import celeryd_after_setup, worker_init, worker_process_init
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
@@ -8,4 +9,24 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 
+@worker_init.connect
+def close_db_pools(**kwargs):
+    # The main process must not hand an open pool to the children it forks
+    from core.db_pool import close_pools
+    close_pools()
 
+
+@worker_process_init.connect
+def detach_db_pools(**kwargs):
+    from core.db_pool import detach_inherited_pools
+    detach_inherited_pools()
+
+
+@celeryd_after_setup.connect
+def consume_profile_queues(sender, instance, **kwargs):
+    # Without -Q the worker consumes the queues of its CELERY_WORKER_PROFILE;
+    # consume_from is the full queue table until -Q selects some
+    from django.conf import settings
+    queues = instance.app.amqp.queues
+    if queues.consume_from is queues:
+        queues.select(settings.CELERY_WORKER_PROFILES[settings.CELERY_WORKER_PROFILE]['queues'])
@@ -0,0 +1,33 @@
+# backend/core/db_pool.py
+#
+# Helpers for the psycopg connection pools Django opens per database alias.
+# A pool (its sockets and worker threads) must never cross a fork: parents
+# close theirs before forking and children drop whatever they inherited.
+
+from django.db import connections
+from django.db.backends.postgresql.base import DatabaseWrapper
+
+# Inherited pools are kept referenced so they are never garbage collected in
+# the child, which could otherwise reset connections the parent still owns.
+_inherited_pools = []
+
+
+def open_pools():
+    """Pools opened by this process, keyed by database alias."""
+    return dict(DatabaseWrapper._connection_pools)
+
+
+def close_pools():
+    """Return connections and close every pool this process opened."""
+    for alias in open_pools():
+        connection = connections[alias]
+        connection.close()
+        connection.close_pool()
+
+
+def detach_inherited_pools():
+    """Forget connections and pools inherited across a fork without touching them."""
+    for connection in connections.all(initialized_only=True):
+        connection.connection = None
+    _inherited_pools.extend(DatabaseWrapper._connection_pools.values())
+    DatabaseWrapper._connection_pools.clear()
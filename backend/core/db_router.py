@@ -0,0 +1,161 @@
+# backend/core/db_router.py
+
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+# Set for the duration of a read-only request (or a read_from_replica() block);
+# everything else reads from the primary.
+_replica_reads = ContextVar('replica_reads', default=False)
+
+# alias -> (checked_at, healthy); kept per process so a lag probe runs at most
+# once per DATABASE_REPLICA_LAG_CHECK_INTERVAL for each replica.
+_lag_checks = {}
+
+
+def get_replica_lag(alias):
+    """Replay lag of ``alias`` in seconds, or None when it cannot be read."""
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            return float(cursor.fetchone()[0] or 0)
+    except Exception as e:
+        logger.warning(f"Could not read replication lag on {alias}: {str(e)}")
+        return None
+
+
+def replica_is_healthy(alias):
+    checked_at, healthy = _lag_checks.get(alias, (None, False))
+    if checked_at is not None and time.monotonic() - checked_at < settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL:
+        return healthy
+    lag = get_replica_lag(alias)
+    healthy = lag is not None and lag <= settings.DATABASE_REPLICA_MAX_LAG
+    if not healthy:
+        logger.info(f"Replica {alias} is unavailable or behind (lag: {lag}); reading from the primary.")
+    _lag_checks[alias] = (time.monotonic(), healthy)
+    return healthy
+
+
+def choose_replica():
+    replicas = [alias for alias in settings.DATABASE_REPLICAS if replica_is_healthy(alias)]
+    return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def read_from_replica(enabled=True):
+    """Route reads inside the block to a healthy replica (or force the primary with ``enabled=False``)."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Writes always go to the primary. Reads go to a replica only while replica
+    reads are switched on for the current context and a replica is within the
+    allowed lag; otherwise they stay on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        if not settings.DATABASE_REPLICAS or not _replica_reads.get():
+            return DEFAULT_DB_ALIAS
+        return choose_replica()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        aliases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve safe-method requests from replicas, except for clients that wrote
+    recently: a successful write sets a short-lived cookie that keeps that
+    client's reads on the primary until the replicas have caught up. Views
+    opt out with ``replica_reads = False``.
+    """
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Keep the view hook on the event loop instead of a thread hop
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _replica_reads.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self.pin_after_write(request, response)
+
+    async def __acall__(self, request):
+        token = _replica_reads.set(False)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _replica_reads.reset(token)
+        return self.pin_after_write(request, response)
+
+    def pin_after_write(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_cookie(
+                settings.DATABASE_PIN_COOKIE,
+                '1',
+                max_age=settings.DATABASE_PIN_SECONDS,
+                secure=settings.AUTH_COOKIE_SECURE,
+                httponly=True,
+                samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.select_database(request, view_func)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.select_database(request, view_func)
+
+    def select_database(self, request, view_func):
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        if (
+            request.method in SAFE_METHODS
+            and settings.DATABASE_PIN_COOKIE not in request.COOKIES
+            and getattr(view_class, 'replica_reads', getattr(view_func, 'replica_reads', True))
+        ):
+            _replica_reads.set(True)
@@ -0,0 +1,150 @@
+# backend/core/dynamic_fields.py
+#
+# Sparse fieldsets and expansion for read requests:
+#
+#   ?fields=id,name,owner.email   only these fields; dotted paths reach into nested serializers
+#   ?expand=doctors,doctors.user  nested relations that are not listed are rendered as primary keys
+#
+# Without either parameter responses are unchanged. The selection only applies
+# to safe methods, so writes always see every field. Viewsets eager-load from
+# the selected serializer tree, so relations that are not rendered are neither
+# joined nor prefetched.
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_selection(value):
+    """'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}; None stays None."""
+    if value is None:
+        return None
+    tree = {}
+    for path in value.split(','):
+        node = tree
+        for name in filter(None, (part.strip() for part in path.split('.'))):
+            node = node.setdefault(name, {})
+    return tree
+
+
+def selection_params(request):
+    """Raw ``fields`` and ``expand`` query parameters of a read request, (None, None) otherwise."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, None
+    params = getattr(request, 'query_params', request.GET)
+    return params.get(FIELDS_PARAM), params.get(EXPAND_PARAM)
+
+
+class DynamicFieldsMixin:
+    """
+    Serializer mixin applying ``fields``/``expand`` selections. The root
+    serializer reads them from the request in its context (or from explicit
+    ``fields=``/``expand=`` arguments) and hands each nested serializer its
+    part of the selection.
+    """
+
+    def __init__(self, *args, fields=None, expand=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is None and expand is None:
+            fields, expand = selection_params(kwargs.get('context', {}).get('request'))
+        # An empty "fields" selects everything; an empty "expand" collapses every relation
+        self._selection = (parse_selection(fields) or None, parse_selection(expand))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self._selection
+        if only is not None:
+            fields = {name: field for name, field in fields.items() if name in only}
+
+        for name, field in list(fields.items()):
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if not isinstance(nested, serializers.BaseSerializer):
+                continue
+            sub_fields = only.get(name) if only else None
+            if expand is not None and name not in expand and not sub_fields and field.source != '*':
+                fields[name] = self.collapse(name, field)
+            elif isinstance(nested, DynamicFieldsMixin):
+                nested._selection = (sub_fields or None, expand.get(name, {}) if expand is not None else None)
+        return fields
+
+    @staticmethod
+    def collapse(name, field):
+        """Primary key field replacing an unexpanded nested serializer."""
+        kwargs = {'read_only': True}
+        if field.source not in (None, name):
+            kwargs['source'] = field.source
+        if isinstance(field, serializers.ListSerializer):
+            kwargs['many'] = True
+        return serializers.PrimaryKeyRelatedField(**kwargs)
+
+
+def _relation(model, attr):
+    try:
+        return model._meta.get_field(attr)
+    except FieldDoesNotExist:
+        # Reverse relations are reached through their accessor, e.g. "comment_set"
+        for relation in model._meta.related_objects:
+            if relation.get_accessor_name() == attr:
+                return relation
+    return None
+
+
+def eager_loading(serializer, model, prefix=''):
+    """select_related and prefetch_related lookups needed to render ``serializer`` for ``model`` rows."""
+    select, prefetch = [], []
+    for field in serializer._readable_fields:
+        if len(field.source_attrs) != 1:
+            continue
+        relation = _relation(model, field.source_attrs[0])
+        if relation is None or not relation.is_relation:
+            continue
+
+        path = prefix + field.source_attrs[0]
+        many = relation.many_to_many or relation.one_to_many
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        if not isinstance(nested, serializers.BaseSerializer):
+            # Primary keys only; forward foreign keys are on the row already
+            if many:
+                prefetch.append(path)
+            elif not relation.concrete:
+                select.append(path)
+            continue
+
+        if many:
+            child_select, child_prefetch = eager_loading(nested, relation.related_model)
+            queryset = relation.related_model._default_manager.all()
+            if child_select:
+                queryset = queryset.select_related(*child_select)
+            if child_prefetch:
+                queryset = queryset.prefetch_related(*child_prefetch)
+            prefetch.append(Prefetch(path, queryset=queryset))
+        else:
+            select.append(path)
+            child_select, child_prefetch = eager_loading(nested, relation.related_model, prefix=path + '__')
+            select.extend(child_select)
+            prefetch.extend(child_prefetch)
+    return select, prefetch
+
+
+def eager_load(queryset, serializer):
+    """``queryset`` with exactly the joins and prefetches ``serializer`` will use."""
+    select, prefetch = eager_loading(serializer, queryset.model)
+    if select:
+        queryset = queryset.select_related(*dict.fromkeys(select))
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+class EagerLoadingMixin:
+    """Viewset mixin eager-loading what the (selected) serializer renders on read requests."""
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request is not None and self.request.method in SAFE_METHODS:
+            queryset = eager_load(queryset, self.get_serializer())
+        return queryset
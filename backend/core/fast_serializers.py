@@ -0,0 +1,238 @@
+# backend/core/fast_serializers.py
+#
+# Compiled, read-only serialization for high-volume list endpoints. A DRF
+# serializer class is inspected once: every readable field becomes a small
+# function (attribute lookup plus conversion) and nested serializers are
+# compiled recursively, so serializing a row is a loop over plain functions
+# instead of DRF's per-field machinery. Output is identical to
+# ``serializer_class(instances, many=True).data``; serializers using anything
+# that cannot be compiled safely (method fields, hyperlinks, custom fields or a
+# custom ``to_representation``) are served by DRF as before. Custom fields can
+# opt in with a ``fast_representation(value, request)`` method.
+
+import functools
+import logging
+from operator import attrgetter
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db.models.manager import BaseManager
+from rest_framework import fields, relations, serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.dynamic_fields import DynamicFieldsMixin, selection_params
+
+logger = logging.getLogger(__name__)
+
+# Fields whose output depends on the serializer context or on the serializer
+# instance itself; a serializer using any of them is not compiled.
+UNSUPPORTED_FIELDS = (
+    fields.SerializerMethodField,
+    fields.HiddenField,
+    relations.HyperlinkedRelatedField,
+    relations.HyperlinkedIdentityField,
+)
+
+
+class NotCompilable(Exception):
+    pass
+
+
+def _getter(field, model):
+    """Attribute lookup for ``field``; DRF's own lookup handles every edge case the fast path skips."""
+    attrs = field.source_attrs
+    # Dotted sources and model methods (which DRF calls) take the regular path
+    if model is None or len(attrs) != 1 or callable(getattr(model, attrs[0], None)):
+        return field.get_attribute
+
+    fetch = attrgetter(attrs[0])
+    slow = field.get_attribute
+
+    def get(instance):
+        try:
+            return fetch(instance)
+        except (AttributeError, KeyError, ObjectDoesNotExist):
+            # Missing relations, dict rows, defaults and SkipField follow DRF exactly
+            return slow(instance)
+    return get
+
+
+def _primary_key_step(field, model, fallback):
+    # PrimaryKeyRelatedField renders the raw foreign key value; read it from the
+    # "<name>_id" attribute instead of building a PKOnlyObject per row.
+    try:
+        model_field = model._meta.get_field(field.source_attrs[0])
+    except FieldDoesNotExist:
+        return fallback
+    if not model_field.concrete or not model_field.is_relation:
+        return fallback
+
+    fetch = attrgetter(model_field.attname)
+
+    def step(instance, request):
+        try:
+            return fetch(instance)
+        except AttributeError:
+            return fallback(instance, request)
+    return step
+
+
+def _file_converter(field):
+    use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+
+    # Same as FileField.to_representation, with the request passed in instead of read from the context
+    def convert(value, request):
+        if not value:
+            return None
+        if not use_url:
+            return value.name
+        try:
+            url = value.url
+        except AttributeError:
+            return None
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+    return convert
+
+
+def _converter(field):
+    if hasattr(field, 'fast_representation'):
+        # Fields that need the request provide a (value, request) converter themselves
+        return field.fast_representation
+    if isinstance(field, serializers.ListSerializer):
+        if type(field).to_representation is not serializers.ListSerializer.to_representation:
+            raise NotCompilable(f"{type(field).__name__} overrides to_representation")
+        child = _compile(field.child)
+
+        def convert(value, request):
+            iterable = value.all() if isinstance(value, BaseManager) else value
+            return [child(item, request) for item in iterable]
+        return convert
+    if isinstance(field, serializers.BaseSerializer):
+        return _compile(field)
+    if isinstance(field, fields.FileField):
+        return _file_converter(field)
+
+    to_representation = type(field).to_representation
+    if to_representation is fields.CharField.to_representation:
+        return lambda value, request: str(value)
+    if to_representation is fields.IntegerField.to_representation:
+        return lambda value, request: int(value)
+    bound = field.to_representation
+    return lambda value, request: bound(value)
+
+
+def _step(field, model):
+    if isinstance(field, UNSUPPORTED_FIELDS):
+        raise NotCompilable(f"{type(field).__name__} needs the serializer context")
+    if (
+        not isinstance(field, serializers.BaseSerializer)
+        and not hasattr(field, 'fast_representation')
+        and not type(field).__module__.startswith('rest_framework.')
+    ):
+        raise NotCompilable(f"custom field {type(field).__name__}")
+
+    get = _getter(field, model)
+    convert = _converter(field)
+
+    def step(instance, request):
+        attribute = get(instance)
+        check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+        return None if check_for_none is None else convert(attribute, request)
+
+    if (
+        type(field) is relations.PrimaryKeyRelatedField
+        and field.pk_field is None
+        and model is not None
+        and len(field.source_attrs) == 1
+    ):
+        return _primary_key_step(field, model, step)
+    return step
+
+
+def _compile(serializer):
+    if type(serializer).to_representation is not serializers.Serializer.to_representation:
+        raise NotCompilable(f"{type(serializer).__name__} overrides to_representation")
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    steps = [(field.field_name, _step(field, model)) for field in serializer._readable_fields]
+
+    def represent(instance, request):
+        ret = {}
+        for name, step in steps:
+            try:
+                ret[name] = step(instance, request)
+            except SkipField:
+                continue
+        return ret
+    return represent
+
+
+@functools.lru_cache(maxsize=256)
+def compile_serializer(serializer_class, fields=None, expand=None):
+    """
+    Compiled ``(instance, request) -> dict`` function for ``serializer_class``
+    with the given ``fields``/``expand`` selection, or None if it cannot be
+    compiled.
+    """
+    kwargs = {'fields': fields, 'expand': expand} if issubclass(serializer_class, DynamicFieldsMixin) else {}
+    try:
+        return _compile(serializer_class(context={}, **kwargs))
+    except NotCompilable as e:
+        logger.info(f"{serializer_class.__name__} is serialized by DRF: {str(e)}")
+        return None
+
+
+def get_compiled(serializer_class, request=None):
+    """Compiled serializer for this request's field selection, or None when DRF has to serialize."""
+    if not settings.FAST_SERIALIZATION_ENABLED:
+        return None
+    return compile_serializer(serializer_class, *selection_params(request))
+
+
+def serialize(serializer_class, instances, request=None, many=True):
+    """
+    Serialize read-only output with the compiled serializer when there is one
+    (and FAST_SERIALIZATION_ENABLED is on), otherwise with DRF.
+    """
+    represent = get_compiled(serializer_class, request)
+    if represent is None:
+        return serializer_class(instances, many=many, context={'request': request}).data
+    if many:
+        return [represent(instance, request) for instance in instances]
+    return represent(instances, request)
+
+
+def find_mismatches(serializer_class, instances, request=None):
+    """Rows where compiled and DRF output differ, as (index, compiled, drf) tuples."""
+    represent = compile_serializer(serializer_class, *selection_params(request))
+    if represent is None:
+        return []
+    expected = serializer_class(instances, many=True, context={'request': request}).data
+    return [
+        (index, actual, dict(drf))
+        for index, (actual, drf) in enumerate(zip((represent(instance, request) for instance in instances), expected))
+        if actual != drf or list(actual) != list(drf)
+    ]
+
+
+class FastListMixin:
+    """
+    Serve the ``list`` action through the compiled serializer for the
+    request's field selection. Filtering, pagination and the response shape
+    are unchanged.
+    """
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.get_serializer_class()
+        if get_compiled(serializer_class, request) is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serialize(serializer_class, page, request))
+        return Response(serialize(serializer_class, queryset, request))
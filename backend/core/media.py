@@ -0,0 +1,158 @@
+# backend/core/media.py
+#
+# Media delivery. Django only decides whether a file may be read; the bytes
+# are sent by nginx. An allowed request gets an empty response whose
+# X-Accel-Redirect header points nginx at the internal location holding the
+# file, so sendfile, Range requests (video seeking) and slow clients never
+# occupy a Python worker. Storages without local files (S3) get a redirect to
+# the storage's own, expiring URL instead.
+#
+# Access is decided per path prefix (MEDIA_ACCESS_RULES):
+#
+#   public          anyone; nginx serves these directly and never asks Django
+#   authenticated   any signed-in user
+#   owner           the user the file belongs to (see OWNER_CHECKS), and staff
+#   staff           staff only; also the default for unlisted prefixes
+#
+# Clients that cannot send a token (<img>, <video>) use signed URLs: the media
+# URL plus "expires" and "signature" parameters, which grant read access to
+# that one file until they expire.
+
+import mimetypes
+import posixpath
+import time
+from urllib.parse import quote, urlencode
+
+from django.apps import apps
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db.models import Q
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_safe
+from django.views.static import serve
+from rest_framework import serializers
+
+from apps.authentication.authentication import CustomJWTAuthentication
+
+SIGNATURE_SALT = 'core.media'
+
+
+def _license_image_lookup(name):
+    lookup = Q(license_image=name)
+    directory, filename = posixpath.split(name)
+    if posixpath.basename(directory) == 'derivatives' and '_' in filename:
+        # "<dir>/derivatives/<stem>_<size>.<ext>" belongs to "<dir>/<stem>.<ext>"
+        stem = posixpath.splitext(filename)[0].rsplit('_', 1)[0]
+        lookup |= Q(license_image__startswith=f'{posixpath.dirname(directory)}/{stem}.')
+    return lookup
+
+
+def _owns_license_image(user, name):
+    lookup = _license_image_lookup(name)
+    Clinic = apps.get_model('booking_app', 'Clinic')
+    Doctor = apps.get_model('authentication', 'Doctor')
+    return Clinic.objects.filter(lookup, owner=user).exists() or Doctor.objects.filter(lookup, user=user).exists()
+
+
+# Path prefix -> check for the "owner" rule
+OWNER_CHECKS = {
+    'license_images/': _owns_license_image,
+}
+
+
+def access_rule(name):
+    for prefix, rule in settings.MEDIA_ACCESS_RULES:
+        if name.startswith(prefix):
+            return rule
+    return settings.MEDIA_DEFAULT_ACCESS
+
+
+def can_read(user, name):
+    rule = access_rule(name)
+    if rule == 'public':
+        return True
+    if user is None or not user.is_authenticated:
+        return False
+    if user.is_staff or rule == 'authenticated':
+        return True
+    if rule == 'owner':
+        check = next((check for prefix, check in OWNER_CHECKS.items() if name.startswith(prefix)), None)
+        return check is not None and check(user, name)
+    return False
+
+
+def _signature(name, expires):
+    return signing.Signer(salt=SIGNATURE_SALT).signature(f'{name}:{expires}')
+
+
+def signed_url(name, storage=None):
+    """
+    Expiring URL for ``name``. The expiry is rounded up to the next
+    MEDIA_SIGNED_URL_TTL boundary, so the URL (and the browser's cached copy)
+    stays the same for a while.
+    """
+    ttl = settings.MEDIA_SIGNED_URL_TTL
+    expires = (int(time.time()) // ttl + 2) * ttl
+    url = (storage or default_storage).url(name)
+    return f"{url}?{urlencode({'expires': expires, 'signature': _signature(name, expires)})}"
+
+
+def has_valid_signature(request, name):
+    expires, signature = request.GET.get('expires'), request.GET.get('signature')
+    if not expires or not signature or not expires.isdigit() or int(expires) < time.time():
+        return False
+    return constant_time_compare(signature, _signature(name, int(expires)))
+
+
+def _request_user(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+    result = CustomJWTAuthentication().authenticate(request)
+    return result[0] if result is not None else None
+
+
+def _local_path(storage, name):
+    try:
+        return storage.path(name)
+    except NotImplementedError:
+        return None
+
+
+@require_safe
+def serve_media(request, name):
+    name = posixpath.normpath(name).lstrip('/')
+    if name.startswith('..') or name == '.':
+        raise Http404
+
+    if not has_valid_signature(request, name) and not can_read(_request_user(request), name):
+        # Missing and forbidden files look the same
+        raise Http404
+
+    if _local_path(default_storage, name) is None:
+        return HttpResponseRedirect(default_storage.url(name))
+    if not settings.MEDIA_ACCEL_REDIRECT:
+        # Development server without nginx in front
+        return serve(request, name, document_root=settings.MEDIA_ROOT)
+
+    content_type, _ = mimetypes.guess_type(name)
+    response = HttpResponse(content_type=content_type or 'application/octet-stream')
+    response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX + quote(name)
+    response['Cache-Control'] = 'public, max-age=2592000' if access_rule(name) == 'public' else 'private, max-age=3600'
+    return response
+
+
+class SignedFileField(serializers.FileField):
+    """FileField rendered as a signed, expiring media URL."""
+
+    def to_representation(self, value):
+        return self.fast_representation(value, self.context.get('request'))
+
+    # Also used directly by core.fast_serializers
+    def fast_representation(self, value, request):
+        if not value:
+            return None
+        url = signed_url(value.name, value.storage)
+        return request.build_absolute_uri(url) if request is not None else url
@@ -0,0 +1,37 @@
+# backend/core/parsers.py
+
+import io
+import re
+
+import orjson
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+
+from core.renderers import ORJSONRenderer
+
+# orjson reads integers beyond 64 bits as floats instead of failing; any run of
+# 19+ digits (also inside strings, which only costs a stdlib parse) is left to json
+LONG_NUMBER_RE = re.compile(rb'[0-9]{19}')
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser on orjson. Bodies orjson cannot read exactly (other encodings,
+    integers beyond 64 bits, invalid JSON) are handed to the stdlib-based
+    parser, which also produces the usual ParseError messages.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        if LONG_NUMBER_RE.search(body):
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
@@ -0,0 +1,43 @@
+# backend/core/renderers.py
+
+import re
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+# Non-string dict keys are written as strings like the json module does; UTC
+# datetimes end in "Z" and dataclasses go through the DRF encoder, as before.
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z | orjson.OPT_PASSTHROUGH_DATACLASS
+# orjson writes float exponents as "1e16"/"1e-7" where json writes "1e+16"/"1e-07".
+# Also matches such text inside strings, which only costs a stdlib render.
+FLOAT_EXPONENT_RE = re.compile(rb'[0-9]e[-0-9]')
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on orjson. The output matches DRF's renderer: compact
+    separators, UTF-8, ISO 8601 datetimes, UUIDs as strings, and Decimals and
+    other non-native types converted by DRF's JSONEncoder. Indented output
+    (browsable API, ``indent=`` media type parameter), non-default
+    COMPACT_JSON/UNICODE_JSON settings, anything orjson rejects and floats
+    written with an exponent are rendered by the stdlib-based JSONRenderer.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or not self.compact or self.ensure_ascii:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if FLOAT_EXPONENT_RE.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping as JSONRenderer, so the output stays a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
@@ -1,7 +1,12 @@
 from pathlib import Path
+from datetime import timedelta
 import environ
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
+from celery.schedules import crontab
+from kombu import Queue
 import os
+import sys
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -53,18 +58,29 @@ INSTALLED_APPS = [
     'social_django',
     'django_celery_beat',
     'django_celery_results',
+    'channels',
 
     'apps.authentication',
     'apps.booking_app',
+    'apps.monitoring',
+    'apps.queueing',
+    'apps.images',
+    'apps.geocoding',
 ]
 
 MIDDLEWARE = [
+    # Outermost, so its staff check and ProfileCapture writes stay out of the
+    # per-request query metrics and budgets recorded by MetricsMiddleware
+    'apps.monitoring.profiling.ProfilingMiddleware',
+    'apps.monitoring.middleware.MetricsMiddleware',
+    'apps.queueing.middleware.TaskBatchMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.db_router.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -103,6 +119,72 @@ DATABASES = {
     }
 }
 
+# Connection pooling. Every process keeps its own pool, so the Postgres
+# connection budget is roughly processes x max_size; DATABASE_PROCESS_TYPE
+# picks the size for gunicorn workers, uvicorn workers and Celery children.
+DATABASE_PROCESS_TYPE = env('DATABASE_PROCESS_TYPE', default='web')
+DATABASE_POOL_SIZES = {
+    'web': (1, 4),
+    'asgi': (2, 10),
+    'celery': (0, 2),
+}
+if env.bool('DATABASE_POOL_ENABLED', default=True):
+    from psycopg_pool import ConnectionPool
+
+    pool_min_size, pool_max_size = DATABASE_POOL_SIZES.get(DATABASE_PROCESS_TYPE, DATABASE_POOL_SIZES['web'])
+    DATABASES['default']['OPTIONS'] = {
+        'pool': {
+            'min_size': env.int('DATABASE_POOL_MIN_SIZE', default=pool_min_size),
+            'max_size': env.int('DATABASE_POOL_MAX_SIZE', default=pool_max_size),
+            'timeout': env.float('DATABASE_POOL_TIMEOUT', default=10.0),
+            'max_idle': env.float('DATABASE_POOL_MAX_IDLE', default=300.0),
+            'max_lifetime': env.float('DATABASE_POOL_MAX_LIFETIME', default=1800.0),
+            # Verify each connection on checkout; broken ones are replaced transparently
+            'check': ConnectionPool.check_connection,
+        },
+    }
+
+# Read replicas: DATABASE_REPLICA_HOSTS=host[:port],... adds one alias per
+# replica with the primary's credentials. Pointing an entry at the primary
+# itself gives a second alias for trying the routing out locally.
+DATABASE_REPLICAS = []
+for index, replica in enumerate(env.list('DATABASE_REPLICA_HOSTS', default=[]), start=1):
+    host, _, port = replica.partition(':')
+    DATABASES[f'replica_{index}'] = {
+        **DATABASES['default'],
+        'HOST': host,
+        'PORT': port or DATABASES['default']['PORT'],
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['core.db_router.ReplicaRouter']
+DATABASE_REPLICA_MAX_LAG = env.float('DATABASE_REPLICA_MAX_LAG', default=2.0)
+DATABASE_REPLICA_LAG_CHECK_INTERVAL = env.float('DATABASE_REPLICA_LAG_CHECK_INTERVAL', default=1.0)
+# After a write the client's reads stay on the primary for this many seconds
+DATABASE_PIN_COOKIE = 'db_pin'
+DATABASE_PIN_SECONDS = env.int('DATABASE_PIN_SECONDS', default=10)
+
+# Cache configuration
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': env('REDIS_CACHE_URL', default='redis://localhost:6379/1'),
+        'KEY_PREFIX': 'painfx',
+    }
+}
+
+# Channel layer for websocket push (set CHANNEL_LAYER_BACKEND to
+# channels.layers.InMemoryChannelLayer to run without Redis)
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': env('CHANNEL_LAYER_BACKEND', default='channels_redis.pubsub.RedisPubSubChannelLayer'),
+        'CONFIG': {
+            'hosts': [env('CHANNEL_REDIS_URL', default='redis://localhost:6379/2')],
+        },
+    }
+}
+
 # Password validators
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -144,6 +226,28 @@ STRIPE_WEBHOOK_SECRET = env('STRIPE_WEBHOOK_SECRET', default='')
 # GOOGLE MAPS API KAY
 GOOGLE_MAPS_API_KEY = env('GOOGLE_MAPS_API_KEY', default='')
 
+# Background geocoding of addresses (apps.geocoding). Without a Google Maps key
+# it is off, except under DEBUG and in tests, which use FakeProvider:
+# deterministic coordinates without calling out. Enabling Google geocoding
+# without a key is a configuration error.
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+GEOCODING_FAKE_FALLBACK = bool(DEBUG or TESTING) and not GOOGLE_MAPS_API_KEY
+GEOCODING_ENABLED = env.bool('GEOCODING_ENABLED', default=bool(GOOGLE_MAPS_API_KEY) or GEOCODING_FAKE_FALLBACK)
+GEOCODING_PROVIDER = env(
+    'GEOCODING_PROVIDER',
+    default='apps.geocoding.providers.FakeProvider' if GEOCODING_FAKE_FALLBACK
+    else 'apps.geocoding.providers.GoogleMapsProvider',
+)
+if GEOCODING_ENABLED and GEOCODING_PROVIDER.endswith('.GoogleMapsProvider') and not GOOGLE_MAPS_API_KEY:
+    raise ImproperlyConfigured('GEOCODING_ENABLED is set but GOOGLE_MAPS_API_KEY is empty.')
+GEOCODING_RATE_LIMIT = env.int('GEOCODING_RATE_LIMIT', default=10)
+GEOCODING_TIMEOUT = 10
+GEOCODING_BATCH_SIZE = env.int('GEOCODING_BATCH_SIZE', default=100)
+GEOCODING_BATCH_DELAY = env.int('GEOCODING_BATCH_DELAY', default=10)
+GEOCODING_CACHE_TTL_DAYS = env.int('GEOCODING_CACHE_TTL_DAYS', default=90)
+GEOCODING_NEGATIVE_TTL_HOURS = env.int('GEOCODING_NEGATIVE_TTL_HOURS', default=24)
+GEOCODING_MAX_ATTEMPTS = 5
+
 # Twilio settings
 TWILIO_ACCOUNT_SID = env('TWILIO_ACCOUNT_SID', default='')
 TWILIO_AUTH_TOKEN =  env('TWILIO_AUTH_TOKEN', default='')
@@ -175,9 +279,45 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
-    ]
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# List endpoints serialize through compiled serializers (core.fast_serializers)
+FAST_SERIALIZATION_ENABLED = env.bool('FAST_SERIALIZATION_ENABLED', default=True)
+
+# Resized WebP/JPEG copies of uploaded images, generated by Celery (apps.images)
+IMAGE_DERIVATIVES_ENABLED = env.bool('IMAGE_DERIVATIVES_ENABLED', default=True)
+
+# Media delivery (core/media.py): Django checks access, nginx sends the file
+# from MEDIA_ACCEL_PREFIX. Without nginx (runserver) turn MEDIA_ACCEL_REDIRECT
+# off to have Django serve the files itself.
+MEDIA_ACCEL_REDIRECT = env.bool('MEDIA_ACCEL_REDIRECT', default=not DEBUG)
+MEDIA_ACCEL_PREFIX = '/protected-media/'
+MEDIA_SIGNED_URL_TTL = env.int('MEDIA_SIGNED_URL_TTL', default=60 * 60)
+# First matching prefix wins; public prefixes must match nginx's public media location
+MEDIA_ACCESS_RULES = [
+    ('avatars/', 'public'),
+    ('clinic_icons/', 'public'),
+    ('videos/parts/', 'staff'),
+    ('videos/', 'authenticated'),
+    ('license_images/', 'owner'),
+]
+MEDIA_DEFAULT_ACCESS = 'staff'
+
+# Resumable chunked video uploads (booking_app/video_uploads.py)
+VIDEO_UPLOAD_CHUNK_SIZE = env.int('VIDEO_UPLOAD_CHUNK_SIZE', default=8 * 1024 * 1024)
+VIDEO_UPLOAD_MAX_SIZE = env.int('VIDEO_UPLOAD_MAX_SIZE', default=4 * 1024 * 1024 * 1024)
+VIDEO_UPLOAD_EXPIRY_HOURS = env.int('VIDEO_UPLOAD_EXPIRY_HOURS', default=48)
+
 # Djoser settings
 DJOSER = {
     'PASSWORD_RESET_CONFIRM_URL': 'password-reset/{uid}/{token}',
@@ -221,6 +361,145 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
 broker_connection_retry_on_startup = True
+CELERY_METRICS_PORT = env.int('CELERY_METRICS_PORT', default=9808)
+CELERY_RESULT_EXPIRES = timedelta(days=1)
+
+# Task routing: payments, notifications, media and batch work each get their own
+# queue and worker pool, so a burst in one lane cannot delay another.
+# With the Redis transport a lower priority number is served first.
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_TASK_QUEUES = (
+    Queue('default', routing_key='default'),
+    Queue('payments', routing_key='payments'),
+    Queue('notifications', routing_key='notifications'),
+    Queue('media', routing_key='media'),
+    Queue('batch', routing_key='batch'),
+)
+CELERY_TASK_ROUTES = {
+    'apps.booking_app.tasks.process_payment_webhook': {'queue': 'payments', 'priority': 0},
+    'apps.booking_app.tasks.send_sms_notification': {'queue': 'notifications', 'priority': 3},
+    'apps.booking_app.tasks.send_email_notification': {'queue': 'notifications', 'priority': 6},
+    'apps.booking_app.tasks.archive_old_records': {'queue': 'batch', 'priority': 9},
+    'apps.booking_app.tasks.update_analytics_rollups': {'queue': 'batch', 'priority': 5},
+    'apps.images.tasks.generate_image_derivatives': {'queue': 'media', 'priority': 5},
+    'apps.booking_app.tasks.assemble_video_upload': {'queue': 'media', 'priority': 5},
+    'apps.booking_app.tasks.expire_video_uploads': {'queue': 'batch', 'priority': 9},
+    'apps.geocoding.tasks.geocode_pending': {'queue': 'batch', 'priority': 7},
+    'apps.geocoding.tasks.purge_geocode_cache': {'queue': 'batch', 'priority': 9},
+    'apps.authentication.tasks.purge_deleted_users': {'queue': 'batch', 'priority': 9},
+}
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+# Per-lane worker settings, picked with CELERY_WORKER_PROFILE. A worker started
+# without -Q consumes the profile's queues (see core/celery.py).
+CELERY_WORKER_PROFILES = {
+    'default': {'queues': ['default'], 'concurrency': 2, 'prefetch_multiplier': 4},
+    # Webhooks are short and must not sit behind a prefetched backlog
+    'payments': {'queues': ['payments'], 'concurrency': 4, 'prefetch_multiplier': 1},
+    # I/O-bound sends; a large prefetch keeps the pool busy during storms
+    'notifications': {'queues': ['notifications'], 'concurrency': 8, 'prefetch_multiplier': 8},
+    # Uploads waiting on thumbnails or assembly; kept off the batch lane so a
+    # nightly purge or archive cannot hold them up
+    'media': {'queues': ['media'], 'concurrency': 2, 'prefetch_multiplier': 1},
+    # Long-running jobs; one at a time, fetched only when a slot frees up
+    'batch': {'queues': ['batch'], 'concurrency': 1, 'prefetch_multiplier': 1},
+}
+CELERY_WORKER_PROFILE = env('CELERY_WORKER_PROFILE', default='default')
+if CELERY_WORKER_PROFILE not in CELERY_WORKER_PROFILES:
+    raise ImproperlyConfigured(
+        f"CELERY_WORKER_PROFILE must be one of {', '.join(CELERY_WORKER_PROFILES)}, not '{CELERY_WORKER_PROFILE}'."
+    )
+CELERY_WORKER_CONCURRENCY = CELERY_WORKER_PROFILES[CELERY_WORKER_PROFILE]['concurrency']
+CELERY_WORKER_PREFETCH_MULTIPLIER = CELERY_WORKER_PROFILES[CELERY_WORKER_PROFILE]['prefetch_multiplier']
+CELERY_BEAT_SCHEDULE = {
+    'archive-old-records': {
+        'task': 'apps.booking_app.tasks.archive_old_records',
+        'schedule': crontab(hour=3, minute=0),
+    },
+    'update-analytics-rollups': {
+        'task': 'apps.booking_app.tasks.update_analytics_rollups',
+        'schedule': crontab(minute='*/10'),
+    },
+    'relay-task-outbox': {
+        'task': 'apps.queueing.tasks.relay_task_outbox',
+        'schedule': 60.0,
+    },
+    'expire-video-uploads': {
+        'task': 'apps.booking_app.tasks.expire_video_uploads',
+        'schedule': crontab(minute=30),
+    },
+    'geocode-pending': {
+        'task': 'apps.geocoding.tasks.geocode_pending',
+        'schedule': crontab(minute='*/5'),
+    },
+    'purge-geocode-cache': {
+        'task': 'apps.geocoding.tasks.purge_geocode_cache',
+        'schedule': crontab(hour=4, minute=15),
+    },
+    'purge-deleted-users': {
+        'task': 'apps.authentication.tasks.purge_deleted_users',
+        'schedule': crontab(hour=3, minute=30),
+    },
+}
+
+# Task enqueueing: with the outbox enabled every enqueued task is also stored
+# in the request's transaction and the relay publishes whatever was missed
+TASK_OUTBOX_ENABLED = env.bool('TASK_OUTBOX_ENABLED', default=False)
+TASK_OUTBOX_RELAY_DELAY = env.int('TASK_OUTBOX_RELAY_DELAY', default=30)
+TASK_OUTBOX_BATCH_SIZE = 500
+TASK_OUTBOX_RETENTION_DAYS = env.int('TASK_OUTBOX_RETENTION_DAYS', default=7)
+
+# Archival / retention settings
+ARCHIVE_RETENTION_DAYS = {
+    'payment': env.int('ARCHIVE_PAYMENT_RETENTION_DAYS', default=730),
+    'reservation': env.int('ARCHIVE_RESERVATION_RETENTION_DAYS', default=365),
+    'notification': env.int('ARCHIVE_NOTIFICATION_RETENTION_DAYS', default=90),
+}
+ARCHIVE_BATCH_SIZE = env.int('ARCHIVE_BATCH_SIZE', default=1000)
+ARCHIVE_BATCH_PAUSE = env.float('ARCHIVE_BATCH_PAUSE', default=0.5)
+ARCHIVE_MAX_REPLICATION_LAG = env.float('ARCHIVE_MAX_REPLICATION_LAG', default=5.0)
+
+# Bulk user registration (authentication/services.py): passwords of batches of
+# PASSWORD_HASH_POOL_THRESHOLD or more are hashed in a process pool. A PBKDF2
+# hash takes ~0.5s of CPU, so requests are capped at BULK_USER_MAX_PASSWORDS
+# users with passwords to finish well inside the worker timeout.
+PASSWORD_HASH_WORKERS = env.int('PASSWORD_HASH_WORKERS', default=min(os.cpu_count() or 1, 8))
+PASSWORD_HASH_POOL_THRESHOLD = 50
+BULK_USER_MAX_BATCH = env.int('BULK_USER_MAX_BATCH', default=1000)
+BULK_USER_MAX_PASSWORDS = env.int('BULK_USER_MAX_PASSWORDS', default=25 * PASSWORD_HASH_WORKERS)
+
+# Soft-deleted users are purged after the grace period (authentication/purge.py);
+# batches are spaced out with the archival pause and lag settings
+USER_PURGE_GRACE_DAYS = env.int('USER_PURGE_GRACE_DAYS', default=30)
+USER_PURGE_BATCH_SIZE = env.int('USER_PURGE_BATCH_SIZE', default=200)
+
+# Request profiling and query budgets
+PROFILING_SAMPLE_RATE = env.float('PROFILING_SAMPLE_RATE', default=0.001)
+PROFILING_HEADER = 'HTTP_X_PROFILE_REQUEST'
+PROFILING_SLOW_THRESHOLD_MS = env.float('PROFILING_SLOW_THRESHOLD_MS', default=500)
+PROFILING_BUFFER_SIZE = env.int('PROFILING_BUFFER_SIZE', default=200)
+PROFILING_MAX_QUERIES = 500
+PROFILING_TOP_FUNCTIONS = 40
+QUERY_BUDGET_RAISE = env.bool('QUERY_BUDGET_RAISE', default=False)
+
+# Notification inbox settings
+NOTIFICATION_UNREAD_COUNT_TIMEOUT = env.int('NOTIFICATION_UNREAD_COUNT_TIMEOUT', default=60 * 60)
+
+# Doctors embedded in clinic responses; the rest are paged from /clinics/<id>/doctors/
+CLINIC_DOCTOR_PREVIEW_SIZE = 3
+
+# Async read endpoints: how long clinic list/detail responses stay cached
+ASYNC_CLINIC_CACHE_TIMEOUT = env.int('ASYNC_CLINIC_CACHE_TIMEOUT', default=60)
+
+# Analytics rollup settings
+ANALYTICS_ROLLUP_LAG = env.int('ANALYTICS_ROLLUP_LAG', default=60)
+ANALYTICS_ROLLUP_LOCK_TIMEOUT = env.int('ANALYTICS_ROLLUP_LOCK_TIMEOUT', default=30 * 60)
+ANALYTICS_DASHBOARD_DEFAULT_DAYS = 30
+ANALYTICS_DASHBOARD_MAX_DAYS = 366
 
 # Security settings for production
 if not DEVELOPMENTMODE:
@@ -0,0 +1,159 @@
+# backend/core/tests/test_json.py
+#
+# The orjson renderer and parser must be drop-in replacements: byte-identical
+# output to DRF's JSONRenderer, and the stdlib code paths (with their error
+# messages) wherever orjson cannot or must not be used.
+
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework import serializers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from apps.booking_app.models import Payment, AdvertisingCampaign
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+
+UTC_MINUS_5 = datetime.timezone(-datetime.timedelta(hours=5))
+
+
+class PaymentAmountSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Payment
+        fields = ['amount']
+
+
+class CampaignBudgetSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AdvertisingCampaign
+        fields = ['budget']
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def assertSameOutput(self, data, accepted_media_type=None):
+        self.assertEqual(
+            ORJSONRenderer().render(data, accepted_media_type),
+            JSONRenderer().render(data, accepted_media_type),
+        )
+
+    def test_matches_drf_byte_for_byte(self):
+        cases = {
+            'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'aware_utc': datetime.datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'aware_utc_whole_seconds': datetime.datetime(2024, 5, 1, 12, 30, tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2024, 5, 1, 12, 30, 15, 250),
+            'non_utc': datetime.datetime(2024, 5, 1, 12, 30, tzinfo=ZoneInfo('Asia/Kolkata')),
+            'fixed_offset': datetime.datetime(2024, 5, 1, 12, 30, tzinfo=UTC_MINUS_5),
+            'date': datetime.date(2024, 5, 1),
+            'time': datetime.time(9, 15, 30, 5),
+            'decimal': Decimal('1234.50'),
+            'lazy': gettext_lazy('Invalid page.'),
+            'separators': 'line\u2028and paragraph\u2029separators',
+            'unicode': 'Zoë, 東京, 🙂',
+            'big_int': 2 ** 70,
+            'negative_big_int': -(2 ** 64),
+            'non_str_keys': {1: 'one', 2.5: 'two and a half'},
+            'nested': [{'a': [1, 2.5, None, True]}, []],
+            'floats': [0.1, 12.5, -3.0, 1e16, 1.5e300, 1e-7, 0.00001],
+            'exponent_like_text': 'version 1e5',
+        }
+        for name, value in cases.items():
+            with self.subTest(name):
+                self.assertSameOutput({name: value})
+        self.assertSameOutput(cases)
+
+    def test_model_decimals(self):
+        payment = Payment(amount=Decimal('199.99'))
+        campaign = AdvertisingCampaign(budget=Decimal('1500.00'))
+        for data in (PaymentAmountSerializer(payment).data, CampaignBudgetSerializer(campaign).data):
+            with self.subTest(data=data):
+                self.assertSameOutput(data)
+        # Raw Decimals (COERCE_DECIMAL_TO_STRING off, or hand-built payloads) go through the DRF encoder
+        self.assertSameOutput({'amount': payment.amount, 'budget': campaign.budget})
+
+    def test_none_renders_empty(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_indent_uses_stdlib_renderer(self):
+        data = {'id': uuid.uuid4(), 'name': 'Clinic'}
+        with mock.patch('core.renderers.orjson.dumps') as dumps:
+            self.assertSameOutput(data, 'application/json; indent=4')
+            ret = ORJSONRenderer().render(data, renderer_context={'indent': 2})
+        dumps.assert_not_called()
+        self.assertEqual(ret, JSONRenderer().render(data, renderer_context={'indent': 2}))
+
+    def test_ensure_ascii_uses_stdlib_renderer(self):
+        class AsciiRenderer(ORJSONRenderer):
+            ensure_ascii = True
+
+        class AsciiJSONRenderer(JSONRenderer):
+            ensure_ascii = True
+
+        data = {'name': 'Zoë'}
+        with mock.patch('core.renderers.orjson.dumps') as dumps:
+            ret = AsciiRenderer().render(data)
+        dumps.assert_not_called()
+        self.assertEqual(ret, AsciiJSONRenderer().render(data))
+        self.assertEqual(ret, b'{"name":"Zo\\u00eb"}')
+
+    def test_non_compact_uses_stdlib_renderer(self):
+        class SpacedRenderer(ORJSONRenderer):
+            compact = False
+
+        class SpacedJSONRenderer(JSONRenderer):
+            compact = False
+
+        with mock.patch('core.renderers.orjson.dumps') as dumps:
+            ret = SpacedRenderer().render({'a': 1, 'b': [1, 2]})
+        dumps.assert_not_called()
+        self.assertEqual(ret, SpacedJSONRenderer().render({'a': 1, 'b': [1, 2]}))
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def parse(self, parser, body, encoding='utf-8'):
+        return parser.parse(io.BytesIO(body), 'application/json', {'encoding': encoding})
+
+    def assertSameResult(self, body, encoding='utf-8'):
+        self.assertEqual(self.parse(ORJSONParser(), body, encoding), self.parse(JSONParser(), body, encoding))
+
+    def assertSameError(self, body, encoding='utf-8'):
+        with self.assertRaises(ParseError) as expected:
+            self.parse(JSONParser(), body, encoding)
+        with self.assertRaises(ParseError) as actual:
+            self.parse(ORJSONParser(), body, encoding)
+        self.assertEqual(str(actual.exception.detail), str(expected.exception.detail))
+
+    def test_utf8(self):
+        self.assertSameResult('{"name": "Zoë", "ids": [1, 2], "ok": true, "none": null}'.encode())
+
+    def test_non_utf8_body_uses_stdlib_parser(self):
+        body = '{"name": "Zoë"}'.encode('latin-1')
+        with mock.patch('core.parsers.orjson.loads') as loads:
+            result = self.parse(ORJSONParser(), body, encoding='latin-1')
+        loads.assert_not_called()
+        self.assertEqual(result, {'name': 'Zoë'})
+        self.assertSameResult(body, encoding='latin-1')
+
+    def test_oversized_ints_fall_back(self):
+        body = b'{"n": 123456789012345678901234567890, "m": -18446744073709551617, "k": -9223372036854775809}'
+        self.assertSameResult(body)
+        data = self.parse(ORJSONParser(), body)
+        self.assertEqual(data['n'], 123456789012345678901234567890)
+        self.assertIsInstance(data['m'], int)
+        self.assertIsInstance(data['k'], int)
+
+    def test_invalid_json_has_drf_message(self):
+        for body in (b'{"a": ', b'{"a": 1,}', b'not json', b'{"a": NaN}', b''):
+            with self.subTest(body=body):
+                self.assertSameError(body)
+
+    def test_invalid_utf8_has_drf_message(self):
+        self.assertSameError(b'{"name": "\xff"}')
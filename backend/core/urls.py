@@ -7,6 +7,8 @@ from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 from django.http import HttpResponse
 
+from core.media import serve_media
+
 schema_view = get_schema_view(
     openapi.Info(
         title="API",
@@ -29,11 +31,13 @@ rest_api_urlpatterns = [
 urlpatterns = [
     path('', lambda request: HttpResponse('Welcome to PainFX!')),
     path('admin/', admin.site.urls),
+    path('', include('apps.monitoring.urls')),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    # Access checks for uploads; nginx sends the files (core/media.py)
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:name>", serve_media, name='media'),
 ] + rest_api_urlpatterns
 
-# Serve static and media files in development
+# Serve static files in development
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
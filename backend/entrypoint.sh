@@ -12,6 +12,15 @@ python manage.py migrate
 echo "Collecting static files..."
 python manage.py collectstatic --noinput
 
-# Start Gunicorn server
+# Prometheus multiprocess metrics directory, cleared on every start
+export PROMETHEUS_MULTIPROC_DIR=${PROMETHEUS_MULTIPROC_DIR:-/tmp/prometheus}
+rm -rf "$PROMETHEUS_MULTIPROC_DIR" && mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+
+# Start Gunicorn server; SERVER_MODE=asgi runs the ASGI app on uvicorn workers
+if [ "$SERVER_MODE" = "asgi" ]; then
+    export DATABASE_PROCESS_TYPE=asgi
+    echo "Starting Gunicorn server (ASGI)..."
+    exec gunicorn core.asgi:application --bind=0.0.0.0:8000 --workers=3 --timeout 120
+fi
 echo "Starting Gunicorn server..."
 exec gunicorn core.wsgi:application --bind=0.0.0.0:8000 --workers=3 --timeout 120
@@ -0,0 +1,31 @@
+# Gunicorn hooks; bind address and worker count are passed on the command line.
+import os
+
+# SERVER_MODE=asgi serves core.asgi:application through uvicorn workers
+if os.environ.get('SERVER_MODE') == 'asgi':
+    worker_class = 'uvicorn.workers.UvicornWorker'
+
+
+def _django_ready():
+    from django.apps import apps
+    return apps.ready
+
+
+def pre_fork(server, worker):
+    # Only matters with --preload, when the master has loaded Django itself
+    if _django_ready():
+        from core.db_pool import close_pools
+        close_pools()
+
+
+def post_fork(server, worker):
+    if _django_ready():
+        from core.db_pool import detach_inherited_pools
+        detach_inherited_pools()
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges from the shared metrics directory
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,2 +1,6 @@
 #!/bin/bash
-celery -A core worker --loglevel=info
+# CELERY_WORKER_PROFILE picks the lane (default, payments, notifications, media
+# or batch); its queues, concurrency and prefetch settings come from
+# CELERY_WORKER_PROFILES in core/settings.py.
+PROFILE=${CELERY_WORKER_PROFILE:-default}
+celery -A core worker -n "$PROFILE@%h" --loglevel=info